@@ -1,27 +1,30 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import os
-import pickle
+import json
+import time
+import logging
 import numpy as np
-import requests
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+from forecasting import forecast_entry, load_vault
+from forecast_table import ForecastTable
+from spatial_index import AreaIndex
+from kpi_index import KPIIndex, FILTER_FIELDS
+from dataset_cache import load_dataset
+from model_store import ModelStore
+from tree_engine import compile_model, probe_matrix, matches
+from coalescer import MicroBatcher
+from prediction_cache import PredictionCache, row_digests
+from metrics import Registry, timed
 
 # =========================
 # Paths
 # =========================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(BASE_DIR, 'models')
-
-def download_model(url, path):
-    if not os.path.exists(path):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        r = requests.get(url)
-        open(path, "wb").write(r.content)
-
-# Optional model download (can ignore if file already exists)
-download_model(
-    "HF_URL/dataset_1_XGBoost.pkl",
-    os.path.join(MODEL_DIR, "dataset_1_XGBoost.pkl")
-)
+DATASET_PATH = os.environ.get("DATASET_PATH", os.path.join(BASE_DIR, '..', '..', 'data', 'dataset.json'))
 
 # =========================
 # Flask app
@@ -29,72 +32,494 @@ download_model(
 app = Flask(__name__)
 CORS(app)
 
+# =========================
+# Logging & metrics
+# =========================
+# LOG_LEVEL=DEBUG logs every model vector; at the default INFO level the
+# vector is never formatted
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(format="%(message)s")
+log = logging.getLogger("churn_server")
+log.setLevel(LOG_LEVEL)
+
+metrics = Registry()
+REQUEST_SECONDS = metrics.histogram("churn_request_seconds", "Request latency by endpoint")
+REQUESTS_TOTAL = metrics.counter("churn_requests_total", "Requests by endpoint and HTTP status")
+STAGE_SECONDS = metrics.histogram(
+    "churn_stage_seconds",
+    "Time per /predict stage (parse, vectorize, predict_proba, label, predict, serialize) by model")
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    endpoint = request.endpoint or "unmatched"
+    start = g.get("request_start")
+    if start is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+    REQUESTS_TOTAL.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
 MODEL_MAP = {
     'xgb': 'dataset_1_XGBoost.pkl',
     'rf': 'random_forest_model.pkl'
 }
 
-loaded_models = {}
+# Where each artifact comes from when it is missing locally: a path, a file://
+# URL or an http(s) URL (e.g. MODEL_SOURCE_XGB=https://.../dataset_1_XGBoost.pkl),
+# plus an optional expected sha256 (MODEL_SHA256_XGB=...).
+MODEL_SOURCES = {k: os.environ.get(f"MODEL_SOURCE_{k.upper()}") for k in MODEL_MAP}
+MODEL_CHECKSUMS = {k: os.environ[f"MODEL_SHA256_{k.upper()}"] for k in MODEL_MAP
+                   if os.environ.get(f"MODEL_SHA256_{k.upper()}")}
+
+# threads each model may use per prediction (0 = library default); gunicorn.conf.py
+# sets it so workers x threads matches the core count
+MODEL_THREADS = int(os.environ.get("MODEL_THREADS", 0))
+
+model_store = ModelStore(MODEL_MAP, MODEL_DIR, MODEL_SOURCES, MODEL_CHECKSUMS, n_jobs=MODEL_THREADS or None)
+loaded_models = model_store.models
 
 def try_load_model(key):
-    if key in loaded_models:
-        return loaded_models[key]
+    return model_store.get(key)
 
-    filename = MODEL_MAP.get(key)
-    path = os.path.join(MODEL_DIR, filename)
+# Warm every model in the background (also under gunicorn, where __main__ never runs)
+if os.environ.get("PRELOAD_MODELS", "1") != "0":
+    model_store.preload()
 
-    with open(path, 'rb') as f:
-        model = pickle.load(f)
+# =========================
+# Inference engine
+# =========================
+# ENGINE_<KEY>=compiled serves that model from tree_engine.CompiledForest
+# (flattened NumPy trees) for requests of up to COMPILED_MAX_ROWS rows; larger
+# batches and every other model use the library's own predict_proba.
+MODEL_ENGINES = {k: os.environ.get(f"ENGINE_{k.upper()}", "native") for k in MODEL_MAP}
+COMPILED_MAX_ROWS = int(os.environ.get("COMPILED_MAX_ROWS", 256))
 
-    loaded_models[key] = model
+compiled_models = {}
+
+def get_compiled(key, model):
+    """Compiled twin of `model`, or None if it cannot be compiled faithfully."""
+    cached = compiled_models.get(key)
+    if cached is not None and cached[0] is model:
+        return cached[1]
+
+    engine = None
+    try:
+        engine = compile_model(model)
+        if not matches(model, engine, probe_matrix(engine)):
+            log.warning("Compiled engine for %s does not match the model; using native", key)
+            engine = None
+    except TypeError as e:
+        log.warning("Cannot compile model %s (%s); using native", key, e)
+    compiled_models[key] = (model, engine)
+    return engine
+
+def select_engine(key, model, n_rows):
+    if MODEL_ENGINES.get(key) == "compiled" and n_rows <= COMPILED_MAX_ROWS:
+        return get_compiled(key, model) or model
     return model
 
+# =========================
+# Batch helpers
+# =========================
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 1000))
+N_FEATURES = 25  # width of the model vector both models were trained on
+
+
+class BatchTooLarge(ValueError):
+    pass
+
+
+def build_feature_matrix(features):
+    """Turn the incoming `features` payload into an N x 25 matrix.
+
+    Accepts a single dict, a single flat vector, or a list of either. Raises
+    ValueError (a 400) for ragged rows or any width other than N_FEATURES.
+    """
+    if isinstance(features, (list, tuple)) and features and isinstance(features[0], (dict, list, tuple)):
+        rows = list(features)
+    else:
+        rows = [features]
+
+    if len(rows) > MAX_BATCH_SIZE:
+        raise BatchTooLarge(f"batch of {len(rows)} rows exceeds MAX_BATCH_SIZE={MAX_BATCH_SIZE}")
+
+    values = [list(r.values()) if isinstance(r, dict) else list(r) for r in rows]
+    try:
+        X = np.asarray(values, dtype=float)
+    except ValueError:
+        raise ValueError("all feature rows must have the same length of numbers") from None
+    if X.ndim != 2 or X.shape[1] != N_FEATURES:
+        raise ValueError(f"expected {N_FEATURES} features per row, got shape {list(X.shape)}")
+    return X
+
+
+def score_matrix(model, X, model_key=None):
+    """Score every row of X with one predict_proba pass.
+
+    Labels are derived from the probabilities (argmax over classes_), so the
+    ensemble is only walked once. Falls back to model.predict when the model
+    has no usable predict_proba.
+    """
+    proba = None
+    if hasattr(model, 'predict_proba'):
+        try:
+            with timed(STAGE_SECONDS, stage='predict_proba', model=model_key):
+                proba = np.asarray(model.predict_proba(X))
+        except Exception:
+            proba = None
+
+    if proba is not None:
+        with timed(STAGE_SECONDS, stage='label', model=model_key):
+            classes = getattr(model, 'classes_', None)
+            if classes is None:
+                classes = np.arange(proba.shape[1])
+            raw = np.asarray(classes)[proba.argmax(axis=1)]
+        return raw, proba
+
+    with timed(STAGE_SECONDS, stage='predict', model=model_key):
+        raw = np.asarray(model.predict(X))
+    if hasattr(model, 'predict_proba'):
+        proba = np.full((len(X), 2), 0.5)
+    return raw, proba
+
+
+def format_results(raw, proba):
+    results = []
+    for i, pred_raw in enumerate(raw):
+        # ⭐ threshold logic
+        pred = 1 if pred_raw > 20 else 0
+        results.append({
+            "prediction": float(pred),
+            "raw_prediction": float(pred_raw),
+            "proba": proba[i].tolist() if proba is not None else None
+        })
+    return results
+
+# =========================
+# Request coalescing
+# =========================
+# Opt-in: with COALESCE_WINDOW_MS > 0, concurrent small /predict requests for the
+# same model are merged into one matrix call. Each request waits at most the
+# window (plus scoring time) and a merged batch holds about COALESCE_MAX_BATCH rows.
+COALESCE_WINDOW_MS = float(os.environ.get("COALESCE_WINDOW_MS", 0))
+COALESCE_MAX_BATCH = int(os.environ.get("COALESCE_MAX_BATCH", 64))
+
+def score_for_key(model_key, X):
+    return score_matrix(select_engine(model_key, try_load_model(model_key), len(X)), X, model_key)
+
+coalescer = MicroBatcher(score_for_key, COALESCE_WINDOW_MS, COALESCE_MAX_BATCH) if COALESCE_WINDOW_MS > 0 else None
+
+def run_scoring(model_key, X):
+    if coalescer is not None and len(X) < COALESCE_MAX_BATCH:
+        # ⭐ merged with other requests arriving within the window
+        return coalescer.submit(model_key, X)
+    # ⭐ single predict_proba pass for the whole matrix
+    return score_for_key(model_key, X)
+
+# =========================
+# Prediction cache
+# =========================
+# Per-row results keyed by (model, model version, feature hash); LRU with an
+# optional TTL in seconds. PREDICTION_CACHE_SIZE=0 turns it off.
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", 0))
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL) if PREDICTION_CACHE_SIZE > 0 else None
+
+def score_request(model_key, X):
+    """Score X, serving rows seen before from the cache and scoring only the rest."""
+    if prediction_cache is None:
+        return run_scoring(model_key, X)
+
+    # version is read before the model is fetched, so a reload can never leave
+    # old-model results under the new version
+    version = model_store.version(model_key)
+    keys = [(model_key, version, d) for d in row_digests(X)]
+    cached = prediction_cache.get_many(keys)
+    miss = [i for i, c in enumerate(cached) if c is None]
+    if miss:
+        raw, proba = run_scoring(model_key, X[miss])
+        fresh = [(raw[j], None if proba is None else proba[j].copy()) for j in range(len(miss))]
+        prediction_cache.put_many([keys[i] for i in miss], fresh)
+        for i, value in zip(miss, fresh):
+            cached[i] = value
+
+    raw = np.asarray([c[0] for c in cached])
+    proba = None if cached[0][1] is None else np.asarray([c[1] for c in cached])
+    return raw, proba
+
+# =========================
+# Multi-model scoring
+# =========================
+# "models": [...] scores one payload with several models at once; the extra
+# models run on this pool (XGBoost and sklearn release the GIL while scoring).
+PREDICT_WORKERS = int(os.environ.get("PREDICT_WORKERS", os.cpu_count() or 4))
+
+predict_pool = ThreadPoolExecutor(max_workers=PREDICT_WORKERS, thread_name_prefix='predict')
+
+def score_models(model_keys, X):
+    """Score X with every model concurrently; returns {key: (raw, proba)}."""
+    futures = {k: predict_pool.submit(score_request, k, X) for k in model_keys[1:]}
+    scored = {model_keys[0]: score_request(model_keys[0], X)}  # first one on this thread
+    for k, fut in futures.items():
+        scored[k] = fut.result()
+    return {k: scored[k] for k in model_keys}
+
+
+def ensemble_scores(model_keys, scored):
+    """Average the models' probabilities; None if they cannot be combined."""
+    probas = [scored[k][1] for k in model_keys]
+    classes = [getattr(model_store.models.get(k), 'classes_', None) for k in model_keys]
+    if any(p is None for p in probas) or any(c is None for c in classes):
+        return None
+    if len({p.shape for p in probas}) != 1 or not all(np.array_equal(c, classes[0]) for c in classes):
+        return None
+
+    proba = np.mean(probas, axis=0)
+    return np.asarray(classes[0])[proba.argmax(axis=1)], proba
+
 # =========================
 # Prediction API
 # =========================
 @app.route('/predict', methods=['POST'])
 def predict():
-    data = request.get_json(force=True)
+    with timed(STAGE_SECONDS, stage='parse', model='all'):
+        data = request.get_json(force=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": 'body must be a JSON object with rows under "features"'}), 400
     features = data.get("features", {})
     model_key = data.get("model", "xgb")
+    model_keys = data.get("models")
+    model_label = ",".join(model_keys) if isinstance(model_keys, list) else model_key
 
-    model = try_load_model(model_key)
+    if model_keys is not None:
+        if (not isinstance(model_keys, list) or not model_keys
+                or not all(isinstance(k, str) and k in MODEL_MAP for k in model_keys)):
+            return jsonify({"error": f"models must be a non-empty list of {list(MODEL_MAP)}"}), 400
+        model_keys = list(dict.fromkeys(model_keys))
+        for k in model_keys:
+            try_load_model(k)
+    else:
+        if not isinstance(model_key, str) or model_key not in MODEL_MAP:
+            return jsonify({"error": f"model must be one of {list(MODEL_MAP)}"}), 400
+        try_load_model(model_key)
 
     try:
-       # ⭐ convert incoming 25-feature dict → list
-        feature_values = list(features.values())
+        # ⭐ one row (dict / flat vector) or a batch (list of either) → N x 25
+        with timed(STAGE_SECONDS, stage='vectorize', model=model_label):
+            X = build_feature_matrix(features)
+    except BatchTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"invalid features: {e}"}), 400
 
-# ⭐ reshape for sklearn
-        X = np.array(feature_values).reshape(1, -1)
+    try:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("MODEL VECTOR (25): %s", X)
 
-        print("MODEL VECTOR (25):", X)
-        print("MODEL VECTOR:", X)
+        if model_keys is not None:
+            # ⭐ parsed once, every model scored concurrently
+            scored = score_models(model_keys, X)
+            with timed(STAGE_SECONDS, stage='serialize', model=model_label):
+                response = {"models": {k: {"results": format_results(*scored[k])} for k in model_keys}}
+                if data.get("ensemble"):
+                    combined = ensemble_scores(model_keys, scored)
+                    response["ensemble"] = {"results": format_results(*combined) if combined else None}
+                return jsonify(response)
 
-        # ⭐ prediction
-        pred_raw = model.predict(X)[0]
+        raw, proba = score_request(model_key, X)
 
-        # ⭐ threshold logic
-        pred = 1 if pred_raw > 20 else 0
+        with timed(STAGE_SECONDS, stage='serialize', model=model_label):
+            return jsonify({"results": format_results(raw, proba)})
 
-        # ⭐ probability
-        proba = None
-        if hasattr(model, 'predict_proba'):
-            try:
-                proba = model.predict_proba(X)[0].tolist()
-            except:
-                proba = [0.5, 0.5]
+    except Exception:
+        log.exception("Prediction failed for model %s", model_label)
+        raise
 
-        result = {
-            "prediction": float(pred),
-            "raw_prediction": float(pred_raw),
-            "proba": proba
-        }
+# =========================
+# Forecast API
+# =========================
+# a single .pkl, or a sharded vault directory (see forecasting.save_sharded_vault)
+VAULT_PATH = os.environ.get("FORECAST_VAULT_PATH", os.path.join(BASE_DIR, "telecom_models_dictionary.pkl"))
+FORECAST_CACHE_SIZE = int(os.environ.get("FORECAST_CACHE_SIZE", 512))
+MAX_FORECAST_DAYS = 365
+# precomputed forecasts written by materialize_forecasts.py (optional)
+FORECAST_TABLE_PATH = os.environ.get("FORECAST_TABLE_PATH", os.path.join(BASE_DIR, "forecast_table"))
 
-        return jsonify({"results": [result]})
+forecast_vault = {}
+forecast_table = None
 
+def load_forecast_vault(path=VAULT_PATH):
+    """Load the SARIMAX vault once; the server still starts without it."""
+    global forecast_vault
+    try:
+        forecast_vault = load_vault(path)
+        log.info("Loaded %d forecast models from %s", len(forecast_vault), path)
     except Exception as e:
-        print("🔥 ERROR:", e)
-        raise
+        forecast_vault = {}
+        log.warning("Forecast vault not available at %s: %s", path, e)
+    cached_forecast.cache_clear()
+
+
+def load_forecast_table(path=FORECAST_TABLE_PATH):
+    """Open the materialized forecast table if one exists; /forecast falls
+    back to the vault for keys it does not cover."""
+    global forecast_table
+    try:
+        forecast_table = ForecastTable(path)
+        log.info("Loaded forecast table for %d keys from %s", len(forecast_table), path)
+    except FileNotFoundError:
+        forecast_table = None
+    except Exception as e:
+        forecast_table = None
+        log.warning("Forecast table not available at %s: %s", path, e)
+
+
+def table_forecast(model_key, days):
+    """Forecast sliced from the materialized table, or None when the table
+    lacks the key/days or is older than the vault entry."""
+    if forecast_table is None:
+        return None, None
+    forecast_table.refresh()
+    if model_key not in forecast_table:
+        return None, None
+    last_date = forecast_table.last_date(model_key)
+    if model_key in forecast_vault and vault_last_date(model_key) != last_date:
+        return None, None  # vault was updated after the table was built
+    return forecast_table.get(model_key, days), last_date
+
+
+def vault_last_date(model_key):
+    if hasattr(forecast_vault, 'last_date'):
+        return forecast_vault.last_date(model_key)  # sharded: no shard load on cache hits
+    return forecast_vault[model_key]['last_date']
+
+
+@lru_cache(maxsize=FORECAST_CACHE_SIZE)
+def cached_forecast(model_key, days, last_date):
+    # last_date is part of the cache key so a retrained entry is never served stale
+    return forecast_entry(forecast_vault[model_key], days, model_key)
+
+
+@app.route('/forecast', methods=['GET', 'POST'])
+def forecast():
+    data = request.get_json(silent=True) or request.args
+    if not hasattr(data, 'get'):
+        return jsonify({"error": "body must be a JSON object with city, operator and days"}), 400
+    city = data.get("city")
+    operator = data.get("operator")
+
+    try:
+        days = int(data.get("days", 60))
+    except (TypeError, ValueError):
+        return jsonify({"error": "days must be an integer"}), 400
+    if not 1 <= days <= MAX_FORECAST_DAYS:
+        return jsonify({"error": f"days must be between 1 and {MAX_FORECAST_DAYS}"}), 400
+
+    if not city or not operator:
+        return jsonify({"error": "city and operator are required"}), 400
+
+    if hasattr(forecast_vault, 'refresh'):
+        forecast_vault.refresh()  # picks up entries rewritten by update_vault.py
+
+    model_key = f"{city}_{operator}"
+    result, last_date = table_forecast(model_key, days)
+    if result is None:
+        if model_key not in forecast_vault:
+            return jsonify({"error": f"no forecast model for {model_key}"}), 404
+        last_date = vault_last_date(model_key)
+        result = cached_forecast(model_key, days, last_date)
+
+    return jsonify({
+        "city": city,
+        "operator": operator,
+        "days": days,
+        "last_date": last_date.strftime('%Y-%m-%d'),
+        **result
+    })
+
+load_forecast_vault()
+load_forecast_table()
+
+# =========================
+# Nearest area API
+# =========================
+MAX_NEAREST_K = 50
+
+area_index = AreaIndex([])
+
+def load_dataset_records(path=DATASET_PATH):
+    if not os.path.exists(path):
+        log.warning("Dataset not available at %s", path)
+        return []
+    try:
+        # columnar cache: JSON is only parsed again when dataset.json changes
+        return load_dataset(path).records()
+    except OSError as e:
+        log.warning("Columnar cache unavailable (%s); parsing %s directly", e, path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        log.warning("Dataset not available at %s: %s", path, e)
+        return []
+
+def build_area_index(records):
+    global area_index
+    area_index = AreaIndex.from_records(records)
+    log.info("Indexed %d record positions for nearest lookup", len(area_index))
+
+
+@app.route('/nearest', methods=['GET'])
+def nearest():
+    try:
+        lat = float(request.args["lat"])
+        lon = float(request.args["lon"])
+        k = int(request.args.get("k", 1))
+        radius_km = request.args.get("radius_km")
+        radius_km = float(radius_km) if radius_km is not None else None
+    except (KeyError, ValueError):
+        return jsonify({"error": "lat and lon are required numbers; k and radius_km must be numeric"}), 400
+
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return jsonify({"error": "lat/lon out of range"}), 400
+    k = max(1, min(k, MAX_NEAREST_K))
+
+    results = area_index.nearest(lat, lon, k=k, radius_km=radius_km, city=request.args.get("city"))
+    return jsonify({"results": results})
+
+# =========================
+# KPI API
+# =========================
+kpi_index = KPIIndex([])
+
+def build_kpi_index(records):
+    global kpi_index
+    kpi_index = KPIIndex(records)
+    log.info("Aggregated %d records into %d KPI cells", len(kpi_index), len(kpi_index.counts))
+
+
+@app.route('/kpis', methods=['GET'])
+def kpis():
+    # same filter names as DataProcessor.filters; missing or 'All' means no filter
+    filters = {name: request.args.get(name, 'All') for name in FILTER_FIELDS}
+    metric = request.args.get("metric", "score")
+
+    return jsonify({
+        "filters": filters,
+        "kpis": kpi_index.kpis(filters, metric),
+        "options": kpi_index.options(filters)
+    })
+
+dataset_records = load_dataset_records()
+build_area_index(dataset_records)
+build_kpi_index(dataset_records)
+del dataset_records
 
 # =========================
 # Health check
@@ -104,10 +529,52 @@ def get_models():
     available_models = list(MODEL_MAP.keys())
     return jsonify({"models": available_models})
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    # 200 once every MODEL_MAP entry is loaded, 503 while any is still warming up
+    ok = model_store.ready()
+    return jsonify({"ready": ok, "models": model_store.status()}), (200 if ok else 503)
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({
+        "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "coalescer": coalescer.stats() if coalescer is not None else None
+    })
+
+# =========================
+# Metrics
+# =========================
+def runtime_metrics():
+    out = []
+    if prediction_cache is not None:
+        st = prediction_cache.stats()
+        out += [
+            ("churn_prediction_cache_hits_total", "counter", "Prediction cache hits", st['hits']),
+            ("churn_prediction_cache_misses_total", "counter", "Prediction cache misses", st['misses']),
+            ("churn_prediction_cache_evictions_total", "counter", "Prediction cache LRU evictions", st['evictions']),
+            ("churn_prediction_cache_size", "gauge", "Rows held in the prediction cache", st['size']),
+        ]
+    if coalescer is not None:
+        st = coalescer.stats()
+        out += [
+            ("churn_coalesced_batches_total", "counter", "Merged batches scored by the coalescer", st['batches']),
+            ("churn_coalesced_rows_total", "counter", "Rows scored through the coalescer", st['rows']),
+        ]
+    out.append(("churn_models_ready", "gauge", "1 when every model is loaded", int(model_store.ready())))
+    return out
+
+metrics.collectors.append(runtime_metrics)
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    # Prometheus text exposition format (per process: under gunicorn each worker keeps its own)
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 # =========================
 # Run
 # =========================
 if __name__ == "__main__":
-    try_load_model("xgb")
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file
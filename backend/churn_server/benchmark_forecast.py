@@ -0,0 +1,253 @@
+"""Timing harness for the SARIMAX forecasting pipeline, for capacity planning.
+
+For each tower count it generates a synthetic CSV (synthetic_towers.py) and
+times every stage the nightly job and the /forecast endpoint go through:
+CSV load, per-key daily aggregation, SARIMAX fit (cold, warm-started from
+the previous day's params, and the hierarchical per-operator mode), vault
+save/load (single pickle, sharded and compact) and 60-day forecasting: per
+key, for every key in one batched bootstrap, and sliced from the
+materialized table (forecast_table.py).
+
+Fitting every key at thousands of towers takes hours, so only a sample of
+keys (--fit-keys) is fitted. Full-run fit time and vault size are projected
+from that sample.
+
+    python benchmark_forecast.py --towers 33 330 3300
+    python benchmark_forecast.py --towers 33 --fit-keys 0 --workers 4    # fit every key, 4 processes
+"""
+import os
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from forecasting import (MIN_ROWS, partition_daily, train_keys, compact_vault,
+                         save_sharded_vault, load_vault, forecast_entry, forecast_entries,
+                         vault_start_params, train_hierarchical)
+from forecast_table import ForecastTable, materialize
+from synthetic_towers import OPERATORS, write_towers_csv
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_JSON = os.path.join(BASE_DIR, 'benchmark_forecast_results.json')
+
+
+class Stopwatch:
+    def __init__(self):
+        self.stages = {}
+
+    def time(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.stages[name] = round(time.perf_counter() - start, 4)
+        return out
+
+
+def summarize(seconds):
+    a = np.asarray(seconds, dtype=float)
+    if not len(a):
+        return None
+    return {
+        'n': len(a),
+        'mean': round(float(a.mean()), 4),
+        'p50': round(float(np.percentile(a, 50)), 4),
+        'p95': round(float(np.percentile(a, 95)), 4),
+        'max': round(float(a.max()), 4),
+    }
+
+
+def dir_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def fit_sample(series, workers, start_params=None):
+    """Fit the sampled keys; returns (vault, report by key, errors, wall seconds)."""
+    start = time.perf_counter()
+    vault, report = train_keys(series, workers, start_params)
+    wall = time.perf_counter() - start
+    errors = {k: r['error'] for k, r in report.items() if r['error']}
+    return vault, report, errors, wall
+
+
+def time_forecasts(vault, days):
+    seconds = []
+    for entry in vault.values():
+        start = time.perf_counter()
+        forecast_entry(entry, days)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def bench_size(towers, args, workdir):
+    sw = Stopwatch()
+    csv_path = os.path.join(workdir, f"towers_{towers}.csv")
+    sw.time('generate_csv', write_towers_csv, csv_path, towers=towers, operators=OPERATORS, days=args.days,
+            cities=args.cities_per_tower and max(1, int(towers * args.cities_per_tower)), seed=args.seed)
+
+    # same steps as forecasting.load_partitions, timed separately
+    df = sw.time('load_csv', pd.read_csv, csv_path)
+    df['date'] = sw.time('parse_dates', pd.to_datetime, df['date'])
+    daily_by_key, row_counts = sw.time('aggregate_per_key', partition_daily, df)
+
+    keys = [k for k in daily_by_key if row_counts[k] >= MIN_ROWS]
+    rng = np.random.default_rng(args.seed)
+    n_fit = len(keys) if args.fit_keys <= 0 else min(args.fit_keys, len(keys))
+    sample = [keys[i] for i in sorted(rng.choice(len(keys), n_fit, replace=False))]
+    series = {f"{city}_{operator}": daily_by_key[(city, operator)] for city, operator in sample}
+
+    # nightly re-fit: yesterday's vault (history minus the last day) warm-starts today's fit
+    yesterday, _, _, _ = fit_sample({k: d.iloc[:-1] for k, d in series.items()}, args.workers)
+    vault, fit_report, fit_errors, fit_wall = fit_sample(series, args.workers)
+    sw.stages['fit_sample'] = round(fit_wall, 4)
+    _, warm_report, _, warm_wall = fit_sample(series, args.workers, vault_start_params(yesterday))
+    sw.stages['fit_sample_warm'] = round(warm_wall, 4)
+    fit_seconds = [r['seconds'] for r in fit_report.values()]
+
+    # vault persistence for the fitted sample
+    pkl = os.path.join(workdir, f"vault_{towers}.pkl")
+    sw.time('save_pickle', joblib.dump, vault, pkl)
+    sw.time('load_pickle', joblib.load, pkl)
+    sharded = os.path.join(workdir, f"vault_{towers}")
+    sw.time('save_sharded', save_sharded_vault, vault, sharded)
+    lazy = sw.time('open_sharded', load_vault, sharded)
+    sw.time('load_sharded_all_keys', lambda: [lazy[k] for k in lazy])
+    compact = sw.time('compact', compact_vault, vault)
+    compact_pkl = os.path.join(workdir, f"vault_{towers}_compact.pkl")
+    sw.time('save_compact', joblib.dump, compact, compact_pkl)
+
+    # hierarchical mode: one fit per operator covers every city, sparse ones included
+    hier_vault, hier_report = sw.time('fit_hierarchical', train_hierarchical, df, workers=args.workers)
+
+    forecast_seconds = time_forecasts(vault, args.forecast_days)
+    sw.time('forecast_all_keys_batched', forecast_entries, vault, args.forecast_days)
+
+    # materialized table: built from the sharded vault, then sliced per key
+    table_dir = os.path.join(workdir, f"table_{towers}")
+    sw.time('materialize_table', materialize, sharded, table_dir, args.forecast_days, args.workers)
+    table = ForecastTable(table_dir)
+    table_seconds = []
+    for key in vault:
+        start = time.perf_counter()
+        table.get(key, args.forecast_days)
+        table_seconds.append(time.perf_counter() - start)
+    compact_forecast_seconds = time_forecasts(compact, args.forecast_days)
+
+    fit_stats = summarize(fit_seconds)
+    fitted = max(1, len(vault))
+    scale = len(keys) / fitted
+    return {
+        'towers': towers,
+        'cities': int(df['city'].nunique()),
+        'rows': len(df),
+        'keys': len(keys),
+        'fitted_keys': len(vault),
+        'fit_errors': fit_errors,
+        'hierarchical': {'fits': hier_report['parents'], 'cities': hier_report['cities'],
+                         'sparse_cities': hier_report['sparse_cities']},
+        'workers': args.workers,
+        'stages_seconds': sw.stages,
+        'fit_seconds_per_key': fit_stats,
+        'warm_fit_seconds_per_key': summarize([r['seconds'] for r in warm_report.values()]),
+        'fit_iterations_per_key': summarize([r['iterations'] for r in fit_report.values() if 'iterations' in r]),
+        'warm_fit_iterations_per_key': summarize([r['iterations'] for r in warm_report.values()
+                                                  if 'iterations' in r]),
+        'warm_fallbacks': sum(1 for r in warm_report.values() if r.get('start') == 'fallback'),
+        'forecast_seconds_per_key': summarize(forecast_seconds),
+        'compact_forecast_seconds_per_key': summarize(compact_forecast_seconds),
+        'table_get_seconds_per_key': summarize(table_seconds),
+        'vault_bytes': {
+            'pickle': dir_size(pkl),
+            'sharded': dir_size(sharded),
+            'compact': dir_size(compact_pkl),
+            'table': dir_size(table_dir),
+        },
+        # extrapolated to every key of this size
+        'projected': {
+            'fit_seconds': round(fit_stats['mean'] * len(keys) / args.workers, 1) if fit_stats else None,
+            'pickle_bytes': int(dir_size(pkl) * scale),
+            'compact_bytes': int(dir_size(compact_pkl) * scale),
+        },
+    }
+
+
+def print_result(r):
+    print(f"\n== {r['towers']} towers: {r['cities']} cities, {r['rows']} rows, {r['keys']} keys "
+          f"({r['fitted_keys']} fitted, {r['workers']} worker(s))")
+    for name, seconds in r['stages_seconds'].items():
+        print(f"  {name:<24} {seconds:>10.4f} s")
+    for label, key in (('fit / key', 'fit_seconds_per_key'), ('warm fit / key', 'warm_fit_seconds_per_key'),
+                       ('forecast / key', 'forecast_seconds_per_key'),
+                       ('compact forecast / key', 'compact_forecast_seconds_per_key'),
+                       ('table slice / key', 'table_get_seconds_per_key')):
+        s = r[key]
+        if s:
+            print(f"  {label:<24} mean {s['mean']:.4f}  p50 {s['p50']:.4f}  p95 {s['p95']:.4f} s")
+    cold, warm = r['fit_iterations_per_key'], r['warm_fit_iterations_per_key']
+    if cold and warm:
+        print(f"  iterations / key         cold {cold['mean']:.1f}  warm {warm['mean']:.1f} "
+              f"({r['warm_fallbacks']} fallback(s) to a cold start)")
+    h = r['hierarchical']
+    print(f"  hierarchical             {h['fits']} fits -> {h['cities']} city models "
+          f"({h['sparse_cities']} sparse), {r['stages_seconds']['fit_hierarchical']:.2f} s")
+    p = r['projected']
+    print(f"  projected full fit       {p['fit_seconds']} s, pickle {p['pickle_bytes'] / 1e6:.1f} MB, "
+          f"compact {p['compact_bytes'] / 1e6:.2f} MB")
+    if r['fit_errors']:
+        print(f"  {len(r['fit_errors'])} fit error(s): {next(iter(r['fit_errors'].values()))}")
+
+
+def environment():
+    import statsmodels
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'statsmodels': statsmodels.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark SARIMAX training and forecasting at several scales.')
+    parser.add_argument('--towers', type=int, nargs='+', default=[33, 330, 3300])
+    parser.add_argument('--cities-per-tower', type=float, default=None,
+                        help='cities as a fraction of towers (default: synthetic_towers default, towers // 3)')
+    parser.add_argument('--days', type=int, default=365, help='days of history per tower')
+    parser.add_argument('--fit-keys', type=int, default=20,
+                        help='keys fitted per size, sampled at random (0 = every key)')
+    parser.add_argument('--workers', type=int, default=1, help='fit processes (1 = sequential per-key timing)')
+    parser.add_argument('--forecast-days', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help='keep generated CSVs and vaults here (default: a temp dir)')
+    parser.add_argument('--output', default=OUT_JSON, help='results JSON (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='forecast_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    try:
+        for towers in args.towers:
+            r = bench_size(towers, args, workdir)
+            results.append(r)
+            print_result(r)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'args': vars(args), 'results': results}, f, indent=2, default=str)
+    print('\nWrote benchmark results to', args.output)
+
+
+if __name__ == '__main__':
+    main()
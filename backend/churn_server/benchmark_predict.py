@@ -0,0 +1,284 @@
+"""Throughput / tail-latency benchmark for the /predict API.
+
+Drives the app in-process through the Flask test client and/or over HTTP
+against a running (or locally started) server, with single-row, batch and
+concurrent-client scenarios, and writes the results as JSON:
+
+    python benchmark_predict.py                       # in-process + local server
+    python benchmark_predict.py --target inprocess --requests 2000
+    python benchmark_predict.py --target server --url http://127.0.0.1:5000
+    python benchmark_predict.py --target server --gunicorn --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_JSON = os.path.join(BASE_DIR, 'benchmark_results.json')
+
+# =========================
+# Synthetic feature vectors
+# =========================
+# same 25-position layout as test_predictions.py: 14 numeric features, then
+# one-hot groups (start, width); a group may be all zeros ("Other")
+ONE_HOT_GROUPS = [
+    (14, 2, True),   # Device OS: Android, iOS (Other = all zero)
+    (16, 4, True),   # Operator: Airtel, BSNL, Jio, Vi (Other = all zero)
+    (20, 3, True),   # Plan Type: 3 Months, Monthly, Yearly (Other = all zero)
+    (23, 2, False),  # Payment: Postpaid, Prepaid
+]
+N_FEATURES = 25
+
+
+def synthetic_vectors(n, seed=0):
+    """n realistic customer feature vectors (ranges follow test_predictions.py)."""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n, N_FEATURES))
+    X[:, 0] = np.round(rng.uniform(0.1, 6.0, n), 1)                        # mobile age (years)
+    X[:, 1] = rng.choice([2, 3, 4, 5], n, p=[0.05, 0.15, 0.6, 0.2])       # network type
+    X[:, 2] = np.round(np.clip(rng.lognormal(np.log(10), 0.6, n), 0.5, 100), 1)   # upload Mbps
+    X[:, 3] = np.round(np.clip(rng.lognormal(np.log(40), 0.6, n), 1, 300), 1)     # download Mbps
+    X[:, 4] = np.round(np.clip(rng.gamma(2.0, 7.0, n), 1, 60), 1)         # jitter ms
+    X[:, 5] = np.round(np.clip(rng.gamma(1.2, 0.8, n), 0, 6), 2)          # packet loss %
+    X[:, 6] = np.round(rng.uniform(2, 60, n), 1)                          # tower density
+    X[:, 7] = np.round(np.clip(rng.normal(-90, 10, n), -120, -50))        # signal dBm
+    X[:, 8] = np.round(rng.uniform(0, 1, n), 2)                           # congestion
+    calls = rng.integers(10, 300, n)
+    X[:, 9] = calls                                                       # total calls
+    X[:, 10] = np.floor(calls * rng.beta(8, 2, n))                        # issues resolved
+    X[:, 11] = np.round(rng.uniform(0, 10, n), 1)                         # satisfaction
+    X[:, 12] = rng.integers(1, 72, n)                                     # months active
+    X[:, 13] = np.round(rng.uniform(10, 100, n), 1)                       # latency score
+
+    for start, width, other in ONE_HOT_GROUPS:
+        pick = rng.integers(0, width + (1 if other else 0), n)
+        rows = np.flatnonzero(pick < width)
+        X[rows, start + pick[rows]] = 1
+    return X
+
+# =========================
+# Clients
+# =========================
+class InProcessTarget:
+    """Calls the app through the Flask test client (no network, no server)."""
+    name = 'inprocess'
+
+    def __init__(self):
+        sys.path.insert(0, BASE_DIR)
+        import app
+        self.app = app
+        self.app.model_store.wait()
+
+    def session(self):
+        client = self.app.app.test_client()
+        return lambda payload: client.post('/predict', json=payload).status_code
+
+    def close(self):
+        pass
+
+
+class HttpTarget:
+    """Calls a server over HTTP; starts one locally when no URL is given."""
+    name = 'server'
+
+    def __init__(self, url=None, gunicorn=False, port=5099, start_timeout=180):
+        self.proc = None
+        if url is None:
+            url = f"http://127.0.0.1:{port}"
+            if gunicorn:
+                cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']
+            else:
+                cmd = [sys.executable, 'app.py']
+            print(f"Starting local server: {' '.join(cmd)} (port {port})")
+            self.proc = subprocess.Popen(cmd, cwd=BASE_DIR, env={**os.environ, 'PORT': str(port)},
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.url = url.rstrip('/')
+        self._wait_ready(start_timeout)
+
+    def _wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc is not None and self.proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {self.proc.returncode}")
+            try:
+                if requests.get(self.url + '/ready', timeout=2).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.25)
+        self.close()
+        raise RuntimeError(f"{self.url} not ready after {timeout}s")
+
+    def session(self):
+        s = requests.Session()
+        url = self.url + '/predict'
+        return lambda payload: s.post(url, json=payload, timeout=60).status_code
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self.proc = None
+
+# =========================
+# Scenarios
+# =========================
+def make_payloads(rows_per_request, n_requests, model, distinct=0, seed=0):
+    """Request bodies of fresh synthetic rows; `distinct` > 0 cycles through
+    that many bodies (repeated vectors, i.e. the prediction-cache hit path)."""
+    n_bodies = min(distinct or n_requests, n_requests)
+    X = synthetic_vectors(n_bodies * rows_per_request, seed).tolist()
+    bodies = []
+    for i in range(n_bodies):
+        rows = X[i * rows_per_request:(i + 1) * rows_per_request]
+        bodies.append({'model': model, 'features': rows[0] if rows_per_request == 1 else rows})
+    return [bodies[i % n_bodies] for i in range(n_requests)]
+
+
+def run_scenario(target, payloads, rows_per_request, clients, warmup):
+    """Send payloads[:warmup] untimed, then time every remaining request."""
+    local = threading.local()
+    payloads, warm = payloads[warmup:], payloads[:warmup]
+
+    def call(payload):
+        send = getattr(local, 'send', None)
+        if send is None:
+            send = local.send = target.session()
+        t0 = time.perf_counter()
+        status = send(payload)
+        return time.perf_counter() - t0, status
+
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        list(ex.map(call, warm))
+        start = time.perf_counter()
+        timings = list(ex.map(call, payloads))
+        wall = time.perf_counter() - start
+
+    lat = np.array([t for t, _ in timings]) * 1000
+    errors = sum(1 for _, status in timings if status != 200)
+    n_rows = len(payloads) * rows_per_request
+    return {
+        'requests': len(payloads),
+        'rows': n_rows,
+        'errors': errors,
+        'seconds': round(wall, 4),
+        'requests_per_s': round(len(payloads) / wall, 1),
+        'rows_per_s': round(n_rows / wall, 1),
+        'latency_ms': {
+            'mean': round(float(lat.mean()), 3),
+            'p50': round(float(np.percentile(lat, 50)), 3),
+            'p95': round(float(np.percentile(lat, 95)), 3),
+            'p99': round(float(np.percentile(lat, 99)), 3),
+            'max': round(float(lat.max()), 3),
+        },
+    }
+
+
+def scenarios(args):
+    return [
+        ('single', 1, args.requests, 1),
+        ('batch', args.batch_size, max(1, args.requests // 10), 1),
+        ('concurrent', 1, args.requests, args.clients),
+    ]
+
+# =========================
+# Reporting
+# =========================
+def environment():
+    info = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'config': {k: os.environ[k] for k in sorted(os.environ)
+                   if k.startswith(('COALESCE_', 'PREDICTION_CACHE_', 'ENGINE_', 'COMPILED_', 'MODEL_THREADS',
+                                    'PREDICT_WORKERS', 'WEB_CONCURRENCY', 'GUNICORN_'))},
+    }
+    try:
+        info['git_commit'] = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info['git_commit'] = None
+    return info
+
+
+def print_result(r):
+    lat = r['latency_ms']
+    print(f"  {r['target']:<9} {r['scenario']:<10} {r['rows_per_s']:>10.1f} rows/s "
+          f"{r['requests_per_s']:>9.1f} req/s  p50 {lat['p50']:>8.3f}  p95 {lat['p95']:>8.3f}  "
+          f"p99 {lat['p99']:>8.3f} ms  errors {r['errors']}")
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['target'], r['scenario']): r for r in json.load(f)['results']}
+    print(f"\nChange vs {baseline_path} (rows/s, p99):")
+    for r in results:
+        old = baseline.get((r['target'], r['scenario']))
+        if old is None:
+            continue
+        tput = (r['rows_per_s'] / old['rows_per_s'] - 1) * 100
+        p99 = (r['latency_ms']['p99'] / old['latency_ms']['p99'] - 1) * 100
+        print(f"  {r['target']:<9} {r['scenario']:<10} rows/s {tput:+7.1f}%   p99 {p99:+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark /predict throughput and latency.')
+    parser.add_argument('--target', choices=['inprocess', 'server', 'both'], default='both')
+    parser.add_argument('--url', help='benchmark a running server instead of starting one (e.g. http://127.0.0.1:5000)')
+    parser.add_argument('--gunicorn', action='store_true', help='start the local server with gunicorn.conf.py')
+    parser.add_argument('--port', type=int, default=5099, help='port for the locally started server')
+    parser.add_argument('--model', default='xgb')
+    parser.add_argument('--requests', type=int, default=500, help='requests per single/concurrent scenario')
+    parser.add_argument('--batch-size', type=int, default=100, help='rows per request in the batch scenario')
+    parser.add_argument('--clients', type=int, default=8, help='client threads in the concurrent scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed requests before each scenario')
+    parser.add_argument('--distinct', type=int, default=0,
+                        help='reuse this many distinct request bodies (0 = every request unique)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=OUT_JSON, help='results JSON (default: %(default)s)')
+    parser.add_argument('--compare', help='earlier results JSON to print the change against')
+    args = parser.parse_args(argv)
+
+    wanted = ['inprocess', 'server'] if args.target == 'both' else [args.target]
+
+    results = []
+    for name in wanted:
+        target = InProcessTarget() if name == 'inprocess' else HttpTarget(args.url, args.gunicorn, args.port)
+        try:
+            # every scenario gets its own vectors, so one never warms the cache for the next
+            for i, (scenario, rows, n_requests, clients) in enumerate(scenarios(args)):
+                payloads = make_payloads(rows, n_requests + args.warmup, args.model, args.distinct,
+                                         seed=args.seed + i)
+                r = run_scenario(target, payloads, rows, clients, args.warmup)
+                r.update(target=target.name, scenario=scenario, rows_per_request=rows,
+                         clients=clients, model=args.model)
+                results.append(r)
+                print_result(r)
+        finally:
+            target.close()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print('Wrote benchmark results to', args.output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
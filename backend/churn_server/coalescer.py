@@ -0,0 +1,82 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Merges concurrent small scoring requests into one matrix call per model.
+
+    submit() queues a request's rows and blocks until they are scored. A
+    worker thread per (model key, feature count) takes the first waiting
+    request, keeps collecting for up to `window_ms` or until `max_batch`
+    rows are queued, scores the stacked matrix with `score_fn(key, X)` and
+    hands each request its own slice of (raw, proba).
+    """
+
+    def __init__(self, score_fn, window_ms=2.0, max_batch=64):
+        self.score_fn = score_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, key):
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = queue.Queue()
+                threading.Thread(target=self._worker, args=(key, q), daemon=True,
+                                 name=f"coalesce-{key[0]}").start()
+            return q
+
+    def submit(self, model_key, X):
+        fut = Future()
+        self._queue((model_key, X.shape[1])).put((X, fut))
+        return fut.result()
+
+    def _collect(self, q):
+        batch = [q.get()]
+        rows = len(batch[0][0])
+        deadline = time.monotonic() + self.window
+        while rows < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _worker(self, key, q):
+        while True:
+            batch = self._collect(q)
+            try:
+                X = batch[0][0] if len(batch) == 1 else np.vstack([x for x, _ in batch])
+                raw, proba = self.score_fn(key[0], X)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(X)
+            start = 0
+            for x, fut in batch:
+                end = start + len(x)
+                fut.set_result((raw[start:end], None if proba is None else proba[start:end]))
+                start = end
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'rows': self.rows,
+            'avg_batch_rows': round(self.rows / self.batches, 2) if self.batches else 0,
+        }
@@ -0,0 +1,297 @@
+import os
+import json
+import shutil
+import hashlib
+
+import numpy as np
+
+READ_SIZE = 1 << 16
+CACHE_VERSION = 2
+META_FILE = "meta.json"
+
+# =========================
+# Incremental readers
+# =========================
+_NUMBER_TAIL = frozenset('0123456789.eE+-')
+
+
+def iter_json_array(f, read_size=READ_SIZE):
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the current record plus one read block is kept in memory, so the
+    file size does not matter.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    state = 'start'
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError('unexpected end of JSON array')
+            chunk = f.read(read_size)
+            buf, pos, eof = chunk, 0, not chunk
+            continue
+
+        ch = buf[pos]
+        if state == 'start':
+            if ch != '[':
+                raise ValueError('Dataset JSON is not a list of records')
+            pos += 1
+            state = 'first'
+        elif state == 'sep':
+            if ch == ']':
+                return
+            if ch != ',':
+                raise ValueError(f'expected "," or "]" in JSON array, got {ch!r}')
+            pos += 1
+            state = 'value'
+        else:
+            if state == 'first' and ch == ']':
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                end = None
+            # a failed decode, or one that ran right up to the end of the
+            # buffer, may just be a record cut in half by the read block; so
+            # may a number followed by a digit, '.' or exponent ("3." + "25")
+            if (end is None or end == len(buf)
+                    or (buf[end] in _NUMBER_TAIL and type(obj) in (int, float))) and not eof:
+                chunk = f.read(read_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            if end is None:
+                raise ValueError('malformed record in JSON array')
+            yield obj
+            pos = end
+            state = 'sep'
+
+def iter_ndjson(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_records(f):
+    """Stream records from a JSON array or NDJSON file, sniffing the format."""
+    ch = f.read(1)
+    while ch and ch.isspace():
+        ch = f.read(1)
+    f.seek(0)
+    if ch == '[':
+        return iter_json_array(f)
+    return iter_ndjson(f)
+
+# =========================
+# Columnar cache
+# =========================
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def default_cache_dir(path):
+    path = os.path.abspath(path)
+    return os.path.join(os.path.dirname(path), '.dataset_cache', os.path.basename(path))
+
+
+# marks a key absent from a record, as opposed to present with a JSON null
+_ABSENT = object()
+
+
+def _is_number(v):
+    return v is None or v is _ABSENT or (isinstance(v, (int, float)) and not isinstance(v, bool))
+
+
+class ColumnarDataset:
+    """Columns of a dataset.json read back from the cache.
+
+    Numeric columns are float64 arrays (absent/null -> NaN, with a separate
+    mask of absent rows). String columns (and mixed ones) are dictionary-encoded:
+    an int32 code array (-1 = absent, -2 = null) plus the list of distinct
+    values. All arrays are memory-mapped.
+    """
+
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self.n_rows = meta['n_rows']
+        self.first_keys = meta['first_keys']
+        self._arrays = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def columns(self):
+        return list(self.meta['columns'])
+
+    def _array(self, name, field='file'):
+        if (name, field) not in self._arrays:
+            col = self.meta['columns'][name]
+            self._arrays[name, field] = np.load(os.path.join(self.directory, col[field]), mmap_mode='r')
+        return self._arrays[name, field]
+
+    def is_numeric(self, name):
+        return self.meta['columns'][name]['kind'] == 'numeric'
+
+    def numeric(self, name):
+        """Column as float64 (absent/null -> NaN); string columns are converted
+        where possible, the rest become NaN too (see float_values for which)."""
+        return self.float_values(name)[0]
+
+    def float_values(self, name):
+        """(values, bad): the column as float64 the way float() reads each raw
+        value, and a mask of values float() rejects (e.g. "abc", lists).
+        Absent and null rows are NaN and not bad."""
+        if name not in self.meta['columns']:
+            return np.full(self.n_rows, np.nan), np.zeros(self.n_rows, dtype=bool)
+        if self.is_numeric(name):
+            return self._array(name), np.zeros(self.n_rows, dtype=bool)
+        converted = [_to_float(c) for c in self.meta['columns'][name]['categories']]
+        # codes -2 (null) and -1 (absent) pick the two trailing entries
+        as_float = np.array([np.nan if v is None else v for v in converted] + [np.nan, np.nan], dtype=float)
+        rejected = np.array([v is None for v in converted] + [False, False], dtype=bool)
+        codes = self._array(name)
+        return as_float[codes], rejected[codes]
+
+    def missing(self, name):
+        """Mask of rows where the key was absent from the record (not null)."""
+        if name not in self.meta['columns']:
+            return np.ones(self.n_rows, dtype=bool)
+        col = self.meta['columns'][name]
+        if self.is_numeric(name):
+            if 'absent' not in col:
+                return np.zeros(self.n_rows, dtype=bool)
+            return self._array(name, 'absent')
+        return self._array(name) == -1
+
+    def nulls(self, name):
+        """Mask of rows where the key was present with a JSON null."""
+        if name not in self.meta['columns']:
+            return np.zeros(self.n_rows, dtype=bool)
+        if self.is_numeric(name):
+            return np.isnan(self._array(name)) & ~self.missing(name)
+        return self._array(name) == -2
+
+    def strings(self, name):
+        """Column decoded back to Python values (None where absent or null)."""
+        if name not in self.meta['columns']:
+            return [None] * self.n_rows
+        if self.is_numeric(name):
+            return [None if v != v else v for v in self._array(name).tolist()]
+        cats = self.meta['columns'][name]['categories'] + [None, None]
+        return [cats[c] for c in self._array(name).tolist()]
+
+    def records(self):
+        """Rebuild the list of dicts exactly as json.load returned them: keys
+        present with null keep a None value, absent keys stay absent."""
+        cols, absent = {}, {}
+        for name in self.columns:
+            values = self.strings(name)
+            if self.is_numeric(name) and self.meta['columns'][name].get('integer'):
+                values = [None if v is None else int(v) for v in values]
+            cols[name] = values
+            absent[name] = self.missing(name).tolist()
+        names = self.columns
+        return [{k: cols[k][i] for k in names if not absent[k][i]} for i in range(self.n_rows)]
+
+
+def _to_float(v):
+    """float(v), or None when float() rejects it."""
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_cache(path, cache_dir, source_meta):
+    """Parse `path` once (incrementally) and write the columnar cache."""
+    values = {}
+    first_keys = None
+    n = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for rec in iter_records(f):
+            if first_keys is None:
+                first_keys = list(rec.keys())
+            for k, v in rec.items():
+                col = values.get(k)
+                if col is None:
+                    col = values[k] = [_ABSENT] * n
+                col.append(v)
+            n += 1
+            for col in values.values():
+                if len(col) < n:
+                    col.append(_ABSENT)
+
+    tmp = cache_dir + f".tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    columns = {}
+    for i, (name, col) in enumerate(values.items()):
+        fname = f"c{i:04d}.npy"
+        if all(_is_number(v) for v in col):
+            arr = np.array([np.nan if v is None or v is _ABSENT else v for v in col], dtype=float)
+            integer = all(isinstance(v, int) for v in col if v is not None and v is not _ABSENT)
+            columns[name] = {'kind': 'numeric', 'file': fname, 'integer': integer}
+            absent = np.array([v is _ABSENT for v in col], dtype=bool)
+            if absent.any():
+                columns[name]['absent'] = f"a{i:04d}.npy"
+                np.save(os.path.join(tmp, columns[name]['absent']), absent)
+        else:
+            # keyed by the JSON text so mixed columns ("bad" next to 0.5) round-trip exactly
+            distinct = {json.dumps(v, sort_keys=True): v for v in col if v is not None and v is not _ABSENT}
+            keys = sorted(distinct)
+            lookup = {k: j for j, k in enumerate(keys)}
+            arr = np.array([-1 if v is _ABSENT else -2 if v is None else lookup[json.dumps(v, sort_keys=True)]
+                            for v in col], dtype=np.int32)
+            columns[name] = {'kind': 'dict', 'file': fname, 'categories': [distinct[k] for k in keys]}
+        np.save(os.path.join(tmp, fname), arr)
+
+    meta = dict(source_meta, version=CACHE_VERSION, n_rows=n,
+                first_keys=first_keys or [], columns=columns)
+    with open(os.path.join(tmp, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+    os.replace(tmp, cache_dir)
+    return meta
+
+
+def load_dataset(path, cache_dir=None):
+    """Open `path` through its columnar cache, rebuilding it only when needed.
+
+    The cache is reused while the source mtime and size match; when only the
+    mtime moved, the content hash decides whether a rebuild is needed.
+    """
+    cache_dir = cache_dir or os.environ.get("DATASET_CACHE_DIR") or default_cache_dir(path)
+    st = os.stat(path)
+
+    meta = None
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_VERSION or meta.get('size') != st.st_size:
+            meta = None
+        elif meta.get('mtime_ns') != st.st_mtime_ns:
+            if meta.get('sha256') == file_sha256(path):
+                meta['mtime_ns'] = st.st_mtime_ns
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+            else:
+                meta = None
+
+    if meta is None:
+        print(f"Building columnar cache for {path} ...")
+        source = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': file_sha256(path)}
+        meta = build_cache(path, cache_dir, source)
+
+    return ColumnarDataset(cache_dir, meta)
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import shutil
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from forecasting import TRAIN_WORKERS, forecast_arrays, load_vault
+
+TABLE_VERSION = 1
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"  # names the published version directory
+VERSION_PREFIX = "v-"
+SERIES = ('predicted_signal_dbm', 'trend', 'lower', 'upper')
+
+# =========================
+# Materialization job
+# =========================
+_worker_vault = None
+
+
+def _init_worker(vault_path):
+    # each process opens the vault once; a sharded vault only loads the shards it is given
+    global _worker_vault
+    warnings.filterwarnings('ignore')
+    _worker_vault = load_vault(vault_path)
+
+
+def _forecast_chunk(keys, days):
+    out = []
+    for model_key in keys:
+        try:
+            entry = _worker_vault[model_key]
+            out.append((model_key, entry['last_date'], forecast_arrays(entry, days, model_key), None))
+        except Exception as e:
+            out.append((model_key, None, None, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def _chunks(keys, n):
+    size = max(1, -(-len(keys) // n))
+    return [keys[i:i + size] for i in range(0, len(keys), size)]
+
+
+def materialize(vault_path, directory, days=60, workers=None):
+    """Forecast every key of the vault at `vault_path` and write the table.
+
+    Keys are split into a few chunks per worker process. Each key gets the
+    same forecast_arrays() result /forecast would compute live (same seed),
+    so serving from the table changes nothing but the latency.
+    Returns (meta, errors by key).
+    """
+    keys = list(load_vault(vault_path))
+    workers = max(1, min(workers or TRAIN_WORKERS, len(keys) or 1))
+    results, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(vault_path,)) as pool:
+        futures = [pool.submit(_forecast_chunk, chunk, days) for chunk in _chunks(keys, workers * 4)]
+        for fut in futures:
+            for model_key, last_date, arrays, error in fut.result():
+                if error:
+                    errors[model_key] = error
+                else:
+                    results[model_key] = (last_date, arrays)
+
+    source = {'vault': os.path.abspath(vault_path), 'days': days}
+    meta = write_table({k: results[k] for k in keys if k in results}, directory, source)
+    return meta, errors
+
+# =========================
+# Table format
+# =========================
+def write_table(forecasts, directory, source_meta=None):
+    """Write forecasts (model_key -> (last_date, forecast_arrays())) as one
+    float32 .npy file per series, every key's days stored back to back.
+
+    meta.json maps each key to its row offset and length in those columns
+    plus its first forecast date. Each run writes a new version directory
+    inside `directory` and then atomically replaces the CURRENT file that
+    names it, so there is always a complete table to read; older versions
+    are removed after the swap.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = f"{VERSION_PREFIX}{time.time_ns()}-{os.getpid()}"
+    target = os.path.join(directory, version)
+    os.makedirs(target)
+
+    band_labels = []
+    index = {}
+    row = 0
+    for model_key, (last_date, arrays) in forecasts.items():
+        if not band_labels:
+            band_labels = list(arrays['bands'])
+        n = len(arrays['trend'])
+        index[model_key] = {
+            'offset': row,
+            'length': n,
+            'start': pd.Timestamp(arrays['dates'][0]).strftime('%Y-%m-%d'),
+            'last_date': pd.Timestamp(last_date).strftime('%Y-%m-%d'),
+        }
+        row += n
+
+    columns = {}
+    names = list(SERIES) + [f"band_{label}" for label in band_labels]
+    for i, name in enumerate(names):
+        col = np.lib.format.open_memmap(os.path.join(target, f"c{i:02d}.npy"), mode='w+',
+                                        dtype=np.float32, shape=(row,))
+        for model_key, (_, arrays) in forecasts.items():
+            meta = index[model_key]
+            values = arrays['bands'][name[5:]] if name.startswith('band_') else arrays[name]
+            # rounded first (as served), so float32 reads back to the same 0.01 dBm value
+            col[meta['offset']:meta['offset'] + meta['length']] = np.asarray(values, dtype=float).round(2)
+        col.flush()
+        del col
+        columns[name] = f"c{i:02d}.npy"
+
+    meta = dict(source_meta or {}, version=TABLE_VERSION, rows=row,
+                columns=columns, bands=band_labels, index=index)
+    with open(os.path.join(target, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    pointer = os.path.join(directory, CURRENT_FILE)
+    with open(pointer + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer + ".tmp", pointer)
+    _remove_old_versions(directory, keep=version)
+    return meta
+
+
+def _remove_old_versions(directory, keep):
+    # readers that still map an old version keep their open files on POSIX;
+    # where the OS refuses (Windows), the next run tries again
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry.startswith(VERSION_PREFIX) and entry != keep:
+            shutil.rmtree(path, ignore_errors=True)
+        elif entry == META_FILE or (entry.startswith('c') and entry.endswith('.npy')):
+            # a table written before versioned directories
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def table_path(directory):
+    """Directory holding the published table: the version named by CURRENT,
+    or `directory` itself for a table written before versioning."""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), encoding='utf-8') as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return directory
+
+
+class ForecastTable:
+    """Materialized forecasts read back through memory maps.
+
+    get(model_key, days) is a dict lookup plus one slice per column; no model
+    is evaluated and only the pages touched are read from disk.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._load()
+
+    def _stamp(self):
+        # CURRENT is replaced, never rewritten: a new inode/mtime means a new table
+        try:
+            st = os.stat(os.path.join(self.directory, CURRENT_FILE))
+        except FileNotFoundError:
+            st = os.stat(os.path.join(self.directory, META_FILE))
+        return st.st_ino, st.st_mtime_ns
+
+    def _load(self):
+        stamp = self._stamp()
+        path = table_path(self.directory)
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != TABLE_VERSION:
+            raise ValueError(f"forecast table version {meta.get('version')} != {TABLE_VERSION}")
+        columns = {name: np.load(os.path.join(path, fname), mmap_mode='r')
+                   for name, fname in meta['columns'].items()}
+        self._stamp_seen = stamp
+        # one attribute, so a request racing refresh() never mixes two tables
+        self._table = (meta, columns)
+
+    @property
+    def meta(self):
+        return self._table[0]
+
+    def refresh(self):
+        """Re-open the table after a new materialization run; one stat() when
+        nothing changed. Returns True if it was re-opened."""
+        try:
+            if self._stamp() == self._stamp_seen:
+                return False
+            self._load()
+        except (OSError, ValueError):
+            return False  # old version removed under us or unreadable; the next request retries
+        return True
+
+    def __contains__(self, model_key):
+        return model_key in self.meta['index']
+
+    def __len__(self):
+        return len(self.meta['index'])
+
+    def last_date(self, model_key):
+        return pd.Timestamp(self.meta['index'][model_key]['last_date'])
+
+    def get(self, model_key, days):
+        """JSON-ready forecast for the first `days` of a key (same shape as
+        forecasting.forecast_entry), or None when the key is missing or the
+        table holds fewer days."""
+        table, columns = self._table
+        meta = table['index'].get(model_key)
+        if meta is None or days > meta['length']:
+            return None
+        lo = meta['offset']
+        rows = {name: col[lo:lo + days].astype(float).round(2).tolist() for name, col in columns.items()}
+        return {
+            'dates': (np.datetime64(meta['start']) + np.arange(days)).astype(str).tolist(),
+            **{name: rows[name] for name in SERIES},
+            'bands': {label: rows[f"band_{label}"] for label in table['bands']},
+        }
@@ -0,0 +1,981 @@
+import os
+import re
+import json
+import time
+import threading
+import warnings
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from bootstrap import band_label, bootstrap_bands, key_seed, parse_quantiles
+
+warnings.filterwarnings('ignore')
+
+# =========================
+# Model settings
+# =========================
+ORDER = (1, 1, 1)
+SEASONAL_ORDER = (1, 1, 1, 7)
+MIN_ROWS = 20  # minimum raw rows per (city, operator) before we fit
+# filtered forecast windows a CompactSARIMAX keeps in memory (per key)
+COMPACT_FILTER_CACHE = 4
+
+# incremental updates: re-fit a key when its new one-step errors are this many
+# times the historical residual scale, or when its last full fit is this old
+DRIFT_THRESHOLD = float(os.environ.get("DRIFT_THRESHOLD", 2.0))
+REFIT_AFTER_DAYS = int(os.environ.get("REFIT_AFTER_DAYS", 30))
+MIN_DRIFT_DAYS = 3
+
+TRAIN_WORKERS = int(os.environ.get("TRAIN_WORKERS", os.cpu_count() or 1))
+
+# hierarchical mode: city offsets come from the last OFFSET_WINDOW days and are
+# shrunk toward the parent by OFFSET_SHRINK_DAYS pseudo-days (sparse cities
+# stay close to the operator forecast); the first WARMUP_DAYS fitted values
+# are skipped, as the seasonal difference makes them meaningless
+OFFSET_WINDOW = int(os.environ.get("OFFSET_WINDOW", 90))
+OFFSET_SHRINK_DAYS = 7
+WARMUP_DAYS = 2 + SEASONAL_ORDER[3]
+
+# residual bootstrap: paths drawn per forecast, the bands reported and the base
+# seed (each key gets its own stream, see bootstrap.key_seed)
+FORECAST_PATHS = int(os.environ.get("FORECAST_PATHS", 1000))
+FORECAST_QUANTILES = parse_quantiles(os.environ.get("FORECAST_QUANTILES", "0.05,0.5,0.95"))
+FORECAST_SEED = int(os.environ.get("FORECAST_SEED", 0))
+
+# =========================
+# Preprocessing
+# =========================
+_partition_cache = {}
+
+
+def partition_daily(df):
+    """Split the tower data into per-(city, operator) daily frames in one pass.
+
+    A single groupby over (city, operator, date) produces the daily mean
+    signal / max is_weekend for every key at once; each key is then only
+    resampled to a daily frequency on its own already-aggregated rows.
+    Returns (daily_by_key, row_counts) keyed by (city, operator).
+    """
+    row_counts = df.groupby(['city', 'operator'], sort=False).size().to_dict()
+    daily = df.groupby(['city', 'operator', 'date']).agg({
+        'signal_strength_dbm': 'mean',
+        'is_weekend': 'max'
+    })
+
+    daily_by_key = {}
+    for key, frame in daily.groupby(level=[0, 1], sort=False):
+        daily_by_key[key] = frame.droplevel([0, 1]).asfreq('D').interpolate(method='time')
+    return daily_by_key, row_counts
+
+
+def load_partitions(path):
+    """Read the tower CSV once and cache its partitions for training and forecasting.
+
+    The cache is keyed by the file's path, mtime and size, so an updated CSV
+    is re-read automatically. Raises FileNotFoundError like pd.read_csv.
+    """
+    st = os.stat(path)
+    cache_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if cache_key in _partition_cache:
+        return _partition_cache[cache_key]
+
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    daily_by_key, row_counts = partition_daily(df)
+
+    parts = {
+        'cities': df['city'].unique(),
+        'operators': df['operator'].unique(),
+        'daily': daily_by_key,
+        'row_counts': row_counts,
+    }
+    _partition_cache.clear()
+    _partition_cache[cache_key] = parts
+    return parts
+
+# =========================
+# Training
+# =========================
+def sarimax_model(daily):
+    return SARIMAX(
+        daily['signal_strength_dbm'],
+        exog=daily[['is_weekend']],
+        order=ORDER,
+        seasonal_order=SEASONAL_ORDER,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+
+
+def fit_model(model, start_params=None):
+    """model.fit(), warm-started from `start_params` when given.
+
+    Falls back to the default (cold) start values when the warm fit raises,
+    does not converge, or start_params do not match the model's parameters.
+    Returns (results, info) where info has 'start' ('cold', 'warm' or
+    'fallback'), the optimizer 'iterations' summed over both attempts and
+    'converged' for the kept fit.
+    """
+    iterations = 0
+    start = 'cold'
+    if start_params is not None:
+        start_params = np.asarray(start_params, dtype=float)
+        if start_params.shape == (model.k_params,) and np.isfinite(start_params).all():
+            try:
+                results = model.fit(start_params=start_params, disp=False)
+                iterations = results.mle_retvals.get('iterations', 0)
+                if results.mle_retvals.get('converged', True):
+                    return results, {'start': 'warm', 'iterations': iterations, 'converged': True}
+            except Exception:
+                pass
+        start = 'fallback'
+    results = model.fit(disp=False)
+    return results, {'start': start,
+                     'iterations': iterations + results.mle_retvals.get('iterations', 0),
+                     'converged': bool(results.mle_retvals.get('converged', True))}
+
+
+def fit_sarimax(daily, start_params=None):
+    return fit_model(sarimax_model(daily), start_params)[0]
+
+
+def make_entry(results, daily):
+    # We save the model and the residues so the backend can "bootstrap" spikes
+    return {
+        'model_results': results,
+        'historical_residuals': results.resid.values[2:],
+        'last_date': daily.index[-1]
+    }
+
+
+def fit_key(model_key, daily, start_params=None):
+    """Fit one key. Runs inside a pool worker, so it only sees its own series.
+
+    Returns (model_key, entry or None, seconds, error message or None,
+    fit info from fit_model() or None).
+    """
+    warnings.filterwarnings('ignore')
+    start = time.perf_counter()
+    try:
+        results, info = fit_model(sarimax_model(daily), start_params)
+        entry = make_entry(results, daily)
+        return model_key, entry, time.perf_counter() - start, None, info
+    except Exception as e:
+        return model_key, None, time.perf_counter() - start, f"{type(e).__name__}: {e}", None
+
+
+def vault_start_params(vault):
+    """Fitted params per key of an existing vault, to warm-start a re-fit.
+
+    Works for full SARIMAXResults and CompactSARIMAX entries alike; a sharded
+    vault loads each shard once here. Hierarchical city entries are listed
+    under their parent's key (e.g. "Airtel"), which is what
+    train_hierarchical() fits.
+    """
+    params = {}
+    for k in vault:
+        model = vault[k]['model_results']
+        params[model.parent_key if isinstance(model, OffsetSARIMAX) else k] = \
+            np.asarray(model.params, dtype=float)
+    return params
+
+
+def training_series(parts, min_rows=MIN_ROWS):
+    """Daily series of every (city, operator) in load_partitions() output with
+    at least `min_rows` raw rows, keyed "{city}_{operator}"."""
+    return {f"{city}_{operator}": parts['daily'][(city, operator)]
+            for city in parts['cities'] for operator in parts['operators']
+            if parts['row_counts'].get((city, operator), 0) >= min_rows}
+
+
+def train_keys(series_by_key, workers=None, start_params=None):
+    """Fit every key's pre-aggregated daily series with fit_key().
+
+    workers=1 fits in this process, more fit on a process pool (None uses
+    TRAIN_WORKERS); either way each key goes through the same fit_key().
+    `start_params` (see vault_start_params) warm-starts each key found in it;
+    other keys start cold. Returns (model_vault, report) where report maps
+    each key to its fit time, error (None on success), start ('cold', 'warm'
+    or 'fallback') and optimizer iterations.
+    """
+    workers = workers or TRAIN_WORKERS
+    start_params = start_params or {}
+    model_vault = {}
+    report = {}
+
+    def collect(result):
+        model_key, entry, seconds, error, info = result
+        report[model_key] = dict(info or {}, seconds=seconds, error=error)
+        if entry is None:
+            print(f"Skipping {model_key} due to training error: {error}")
+            return
+        model_vault[model_key] = entry
+        print(f"Saved model for: {model_key} ({seconds:.2f}s)")
+
+    if workers <= 1:
+        for key, daily in series_by_key.items():
+            collect(fit_key(key, daily, start_params.get(key)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fit_key, key, daily, start_params.get(key))
+                       for key, daily in series_by_key.items()]
+            for fut in as_completed(futures):
+                collect(fut.result())
+
+    # keep the vault in submission order so the pickle is stable across runs
+    model_vault = {k: model_vault[k] for k in series_by_key if k in model_vault}
+    return model_vault, report
+
+
+def warm_start_params(path):
+    """vault_start_params() of the vault at `path`, or {} when there is none."""
+    if not path:
+        return {}
+    if not os.path.exists(path):
+        print(f"No vault at {path}; fitting from default start values")
+        return {}
+    params = vault_start_params(load_vault(path))
+    print(f"Warm-starting from {len(params)} models in {path}")
+    return params
+
+
+def train_vault(path, workers=1, warm_start=None, hierarchical=False, by_state=False, city_states=None):
+    """Train the forecast vault from the tower CSV at `path`.
+
+    Per-key mode fits every (city, operator) with at least MIN_ROWS rows;
+    hierarchical=True fits per operator (by_state: per state + operator) and
+    derives the cities (see train_hierarchical). `workers` as in train_keys();
+    `warm_start` is the path of last run's vault. Prints the fit report and
+    returns (model_vault, report). Raises FileNotFoundError like pd.read_csv.
+    """
+    start_params = warm_start_params(warm_start)
+
+    if hierarchical:
+        df = pd.read_csv(path)
+        df['date'] = pd.to_datetime(df['date'])
+        print(f"Starting hierarchical training for {df['operator'].nunique()} operators...")
+        model_vault, report = train_hierarchical(df, by_state, city_states, workers, start_params)
+        print_report(report['fits'])
+        print(f"{report['parents']} parent models -> {report['cities']} city models "
+              f"({report['sparse_cities']} below the {MIN_ROWS}-row threshold)")
+        return model_vault, report
+
+    parts = load_partitions(path)
+    series_by_key = training_series(parts)
+    print(f"Starting training for {len(series_by_key)} of "
+          f"{len(parts['cities']) * len(parts['operators'])} potential models...")
+    model_vault, report = train_keys(series_by_key, workers, start_params)
+    print_report(report)
+    return model_vault, report
+
+
+def print_report(report):
+    failed = {k: r for k, r in report.items() if r['error']}
+    total = sum(r['seconds'] for r in report.values())
+    slowest = sorted(report.items(), key=lambda kv: kv[1]['seconds'], reverse=True)[:5]
+    print(f"Fit time: {total:.1f}s summed over {len(report)} keys")
+    for k, r in slowest:
+        print(f"  {k}: {r['seconds']:.2f}s")
+    for start in ('cold', 'warm', 'fallback'):
+        runs = [r for r in report.values() if r.get('start') == start]
+        if runs:
+            print(f"  {start:<8} starts: {len(runs):>5} keys, "
+                  f"mean {sum(r['iterations'] for r in runs) / len(runs):.1f} iterations, "
+                  f"mean {sum(r['seconds'] for r in runs) / len(runs):.2f}s")
+    if failed:
+        print(f"{len(failed)} key(s) failed:")
+        for k, r in failed.items():
+            print(f"  {k}: {r['error']}")
+
+# =========================
+# Compact persistence
+# =========================
+class CompactSARIMAX:
+    """Parameter-only stand-in for a fitted SARIMAXResults.
+
+    Keeps the fitted params, the model specification, the exog layout and the
+    final predicted state/covariance. get_forecast() rebuilds a SARIMAX over
+    the forecast window, starts the Kalman filter from that state and returns
+    the same predicted_mean / conf_int() as the full results object. The
+    filtered window is cached, so only the first request for a horizon pays
+    for the rebuild.
+    """
+
+    def __init__(self, params, spec, exog_names, endog_name, state, state_cov):
+        self.params = params
+        self.spec = spec
+        self.exog_names = exog_names
+        self.endog_name = endog_name
+        self.state = state
+        self.state_cov = state_cov
+
+    @classmethod
+    def from_results(cls, results):
+        mod = results.model
+        spec = {
+            'order': mod.order,
+            'seasonal_order': mod.seasonal_order,
+            'trend': mod.trend,
+            # keep time trends aligned with the end of the training sample
+            'trend_offset': mod.trend_offset + mod.nobs,
+            'measurement_error': mod.measurement_error,
+            'time_varying_regression': mod.time_varying_regression,
+            'mle_regression': mod.mle_regression,
+            'simple_differencing': mod.simple_differencing,
+            'enforce_stationarity': mod.enforce_stationarity,
+            'enforce_invertibility': mod.enforce_invertibility,
+            'hamilton_representation': mod.hamilton_representation,
+            'concentrate_scale': mod.concentrate_scale,
+        }
+        return cls(
+            params=np.asarray(results.params, dtype=float).copy(),
+            spec=spec,
+            exog_names=list(mod.exog_names or []),
+            endog_name=mod.endog_names,
+            state=np.asarray(results.predicted_state[:, -1]).copy(),
+            state_cov=np.asarray(results.predicted_state_cov[:, :, -1]).copy(),
+        )
+
+    def extend(self, endog, exog=None):
+        """Filter new observations from the stored state with the same params.
+
+        Returns (updated CompactSARIMAX, one-step-ahead residuals of the new
+        observations); NaN observations are skipped by the filter.
+        """
+        if isinstance(exog, pd.DataFrame) and self.exog_names:
+            exog = exog[self.exog_names]
+        mod = SARIMAX(endog.rename(self.endog_name), exog=exog, **self.spec)
+        mod.ssm.initialize_known(self.state, self.state_cov)
+        res = mod.filter(self.params)
+        spec = dict(self.spec, trend_offset=self.spec['trend_offset'] + len(endog))
+        updated = CompactSARIMAX(self.params, spec, self.exog_names, self.endog_name,
+                                 np.asarray(res.predicted_state[:, -1]).copy(),
+                                 np.asarray(res.predicted_state_cov[:, :, -1]).copy())
+        return updated, np.asarray(res.resid, dtype=float)
+
+    def __getstate__(self):
+        # the filter cache is rebuilt on demand, never written to the vault
+        state = dict(self.__dict__)
+        state.pop('_filtered', None)
+        state.pop('_filtered_lock', None)
+        return state
+
+    def get_forecast(self, steps, exog=None):
+        if isinstance(exog, pd.DataFrame):
+            index = exog.index[:steps]
+            exog = exog[self.exog_names] if self.exog_names else exog
+        else:
+            index = pd.RangeIndex(steps)
+
+        # /forecast asks for the same few horizons over and over; rebuilding the
+        # SARIMAX and re-running the filter is most of the cost, so keep the
+        # filtered model for the last few (window, exog) combinations
+        values = None if exog is None else np.ascontiguousarray(exog, dtype=float)
+        cache_key = (steps, str(index[0]) if len(index) else None,
+                     None if values is None else values.tobytes())
+        # request threads share the model: dict.setdefault hands every thread
+        # the same lock, and the filter runs outside it
+        lock = self.__dict__.setdefault('_filtered_lock', threading.Lock())
+        with lock:
+            cache = self.__dict__.setdefault('_filtered', {})
+            res = cache.get(cache_key)
+        if res is None:
+            endog = pd.Series(np.nan, index=index, name=self.endog_name)
+            mod = SARIMAX(endog, exog=exog, **self.spec)
+            mod.ssm.initialize_known(self.state, self.state_cov)
+            res = mod.filter(self.params)
+            with lock:
+                while len(cache) >= COMPACT_FILTER_CACHE:
+                    cache.pop(next(iter(cache)))
+                cache[cache_key] = res
+        return res.get_prediction()
+
+
+def compact_entry(entry):
+    """Vault entry with model_results swapped for a CompactSARIMAX."""
+    if isinstance(entry['model_results'], (CompactSARIMAX, OffsetSARIMAX)):
+        return entry  # already parameter-only
+    return dict(entry,
+                model_results=CompactSARIMAX.from_results(entry['model_results']),
+                historical_residuals=np.asarray(entry['historical_residuals'], dtype=float))
+
+
+def compact_vault(model_vault, verify=False):
+    """compact_entry() of every entry; with verify, an entry whose compact
+    forecast does not match (see verify_compact) keeps its full results."""
+    out = {}
+    for model_key, entry in model_vault.items():
+        small = compact_entry(entry)
+        if verify and not verify_compact(entry, small):
+            print(f"Keeping full results for {model_key}: compact forecast mismatch")
+            small = entry
+        out[model_key] = small
+    return out
+
+
+def verify_compact(entry, compact, days=60, rtol=1e-6, atol=1e-6):
+    """Check a compact entry reproduces the full results' forecast mean and CI."""
+    exog = future_exog(entry['last_date'], days)
+    full = entry['model_results'].get_forecast(steps=days, exog=exog)
+    small = compact['model_results'].get_forecast(steps=days, exog=exog)
+    return (np.allclose(full.predicted_mean.values, small.predicted_mean.values, rtol=rtol, atol=atol)
+            and np.allclose(full.conf_int().values, small.conf_int().values, rtol=rtol, atol=atol))
+
+# =========================
+# Hierarchical models
+# =========================
+class _ShiftedForecast:
+    def __init__(self, forecast, offset):
+        self.forecast = forecast
+        self.offset = offset
+
+    @property
+    def predicted_mean(self):
+        return self.forecast.predicted_mean + self.offset
+
+    def conf_int(self, alpha=0.05):
+        return self.forecast.conf_int(alpha=alpha) + self.offset
+
+
+class OffsetSARIMAX:
+    """City model of a hierarchical vault: its parent's (operator, or state +
+    operator) forecast shifted by the city's reconciled offset in dBm.
+
+    get_forecast() has the same interface as SARIMAXResults, so forecast_entry,
+    the sharded vault and the materialized table treat it like any other model.
+    The parent is stored compact, so each city costs a few KB.
+    """
+
+    def __init__(self, parent, offset, parent_key, weight):
+        self.parent = parent
+        self.offset = float(offset)
+        self.parent_key = parent_key
+        self.weight = float(weight)
+
+    @property
+    def params(self):
+        return self.parent.params
+
+    def get_forecast(self, steps, exog=None):
+        return _ShiftedForecast(self.parent.get_forecast(steps=steps, exog=exog), self.offset)
+
+
+def reconcile_offsets(offsets, weights):
+    """Shift offsets so their weighted mean is 0.
+
+    The parent series is the reading-weighted mean of its cities, so with
+    reconciled offsets the same weighted mean of the city forecasts equals
+    the parent forecast on every day.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if weights.sum() <= 0:
+        return offsets
+    return offsets - np.dot(weights, offsets) / weights.sum()
+
+
+def _city_offsets(city_daily, parent_daily, window_start):
+    """Shrunk offset and reading count per city over the offset window.
+
+    city_daily: DataFrame (city, date) -> mean, count of raw readings.
+    A city with no readings in the window uses its whole history, with no
+    weight in the reconciliation (it does not contribute to recent parent days).
+    """
+    offsets, counts = {}, {}
+    for city, frame in city_daily.groupby(level=0, sort=False):
+        frame = frame.droplevel(0)
+        diff = frame['mean'] - parent_daily.reindex(frame.index)
+        recent = diff.index >= window_start
+        use = diff[recent] if recent.any() else diff
+        use = use.dropna()
+        offsets[city] = use.sum() / (len(use) + OFFSET_SHRINK_DAYS) if len(use) else 0.0
+        counts[city] = int(frame.loc[recent, 'count'].sum())
+    return offsets, counts
+
+
+def hierarchical_groups(df, by_state=False, city_states=None):
+    """Group columns for hierarchical training; adds df['state'] from
+    city_states when by_state is set and the CSV has no state column."""
+    if not by_state:
+        return ['operator']
+    if 'state' not in df.columns:
+        if city_states is None:
+            raise ValueError("by_state needs a 'state' column or a city_states mapping")
+        df['state'] = df['city'].map(city_states).fillna('Unknown')
+    return ['state', 'operator']
+
+
+def train_hierarchical(df, by_state=False, city_states=None, workers=None, start_params=None):
+    """One SARIMAX per operator (or state + operator) on the aggregate daily
+    series, disaggregated to every city with readings for that operator.
+
+    Each city gets parent forecast + offset, where the offset is the city's
+    shrunk mean gap to the parent over OFFSET_WINDOW days, reconciled so the
+    reading-weighted city average equals the parent forecast. City residuals
+    (city - (parent fitted + offset)) feed the bootstrap; cities with fewer
+    than MIN_ROWS of them use the parent's. Cities below MIN_ROWS, which the
+    per-key mode skips, get a forecast too.
+
+    `df` is the raw tower frame with parsed dates. `start_params` warm-starts
+    the parent fits; it is keyed by parent key ("Airtel", or "Karnataka_Airtel"
+    with by_state), as vault_start_params() returns for a hierarchical vault.
+    Returns (model_vault keyed "{city}_{operator}" like train_keys, report)
+    where report holds the parent fit report and the city coverage.
+    """
+    groups = hierarchical_groups(df, by_state, city_states)
+    levels = list(range(len(groups)))
+
+    def group_key(key):
+        return "_".join(str(k) for k in (key if isinstance(key, tuple) else (key,)))
+
+    parent_daily = df.groupby(groups + ['date']).agg({
+        'signal_strength_dbm': 'mean',
+        'is_weekend': 'max'
+    })
+    row_counts = {group_key(k): n for k, n in df.groupby(groups, sort=False).size().items()}
+    series_by_key = {}
+    for key, frame in parent_daily.groupby(level=levels, sort=False):
+        if row_counts[group_key(key)] < MIN_ROWS:
+            continue
+        series_by_key[group_key(key)] = frame.droplevel(levels).asfreq('D').interpolate(method='time')
+
+    parents, fit_report = train_keys(series_by_key, workers, start_params)
+
+    city_daily = df.groupby(groups + ['city', 'date'])['signal_strength_dbm'].agg(['mean', 'count'])
+    model_vault = {}
+    sparse = 0
+    for key, city_frame in city_daily.groupby(level=levels, sort=False):
+        parent_key = group_key(key)
+        if parent_key not in parents:
+            continue
+        operator = key[-1] if isinstance(key, tuple) else key
+        entry = parents[parent_key]
+        results, daily = entry['model_results'], series_by_key[parent_key]
+        small = compact_entry(entry)
+        parent = small['model_results'] if verify_compact(entry, small) else results
+
+        city_frame = city_frame.droplevel(levels)
+        window_start = daily.index[-1] - pd.Timedelta(days=OFFSET_WINDOW - 1)
+        offsets, counts = _city_offsets(city_frame, daily['signal_strength_dbm'], window_start)
+        cities = list(offsets)
+        reconciled = reconcile_offsets([offsets[c] for c in cities], [counts[c] for c in cities])
+        total = sum(counts.values()) or 1
+
+        fitted = results.fittedvalues.iloc[WARMUP_DAYS:]
+        parent_resid = np.asarray(entry['historical_residuals'], dtype=float)[WARMUP_DAYS - 2:]
+        for city, offset in zip(cities, reconciled):
+            observed = city_frame.loc[city, 'mean']
+            resid = (observed - fitted.reindex(observed.index) - offset).dropna().values
+            if city_frame.loc[city, 'count'].sum() < MIN_ROWS:
+                sparse += 1
+            model_vault[f"{city}_{operator}"] = {
+                'model_results': OffsetSARIMAX(parent, offset, parent_key, counts[city] / total),
+                'historical_residuals': resid if len(resid) >= MIN_ROWS else parent_resid,
+                'last_date': entry['last_date'],
+            }
+
+    report = {'fits': fit_report, 'parents': len(parents), 'cities': len(model_vault), 'sparse_cities': sparse}
+    return model_vault, report
+
+# =========================
+# Vault storage
+# =========================
+VAULT_INDEX = "index.json"
+
+
+def _shard_stem(i, model_key):
+    return f"{i:05d}_{re.sub(r'[^A-Za-z0-9_.-]', '_', model_key)}"
+
+
+def _write_shard(directory, stem, entry):
+    """Write one key's shard files (each replaced atomically); returns its index record."""
+    shard, residuals = stem + ".pkl", stem + ".npy"
+    joblib.dump({'model_results': entry['model_results']}, os.path.join(directory, shard + ".tmp"))
+    os.replace(os.path.join(directory, shard + ".tmp"), os.path.join(directory, shard))
+    with open(os.path.join(directory, residuals + ".tmp"), 'wb') as f:
+        np.save(f, np.asarray(entry['historical_residuals'], dtype=float))
+    os.replace(os.path.join(directory, residuals + ".tmp"), os.path.join(directory, residuals))
+
+    record = {
+        'shard': shard,
+        'residuals': residuals,
+        'last_date': pd.Timestamp(entry['last_date']).isoformat(),
+    }
+    if entry.get('last_fit_date') is not None:
+        record['last_fit_date'] = pd.Timestamp(entry['last_fit_date']).isoformat()
+    return record
+
+
+def _write_index(directory, index):
+    # written last so a half-written vault is never picked up
+    tmp = os.path.join(directory, VAULT_INDEX + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, os.path.join(directory, VAULT_INDEX))
+
+
+def save_sharded_vault(model_vault, directory):
+    """Write the vault as a small index.json plus one shard per key.
+
+    Each key gets a joblib shard with its model_results and a .npy file with
+    its historical_residuals (memory-mappable on load). last_date is kept in
+    the index so listing the vault never touches a shard.
+    """
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    for i, (model_key, entry) in enumerate(model_vault.items()):
+        index[model_key] = _write_shard(directory, _shard_stem(i, model_key), entry)
+    _write_index(directory, index)
+
+
+def write_vault_entries(path, changed, vault=None):
+    """Persist updated entries: only their shards for a sharded vault, the
+    whole file (through a temp file) for a single pickle."""
+    if os.path.isdir(path):
+        with open(os.path.join(path, VAULT_INDEX), encoding='utf-8') as f:
+            index = json.load(f)
+        for model_key, entry in changed.items():
+            if model_key in index:
+                stem = os.path.splitext(index[model_key]['shard'])[0]
+            else:
+                stem = _shard_stem(len(index), model_key)
+            index[model_key] = _write_shard(path, stem, entry)
+        _write_index(path, index)
+        return
+
+    full = dict(vault if vault is not None else joblib.load(path))
+    full.update(changed)
+    joblib.dump(full, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+class ShardedVault(Mapping):
+    """Read-only dict view of a sharded vault; shards load on first access.
+
+    vault["Guntur_Airtel"] returns the same entry layout as the single
+    pickle ('model_results', 'historical_residuals', 'last_date').
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._index_path = os.path.join(directory, VAULT_INDEX)
+        self._index_mtime = os.stat(self._index_path).st_mtime_ns
+        with open(self._index_path, encoding='utf-8') as f:
+            self.index = json.load(f)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, model_key):
+        entry = self._entries.get(model_key)
+        if entry is not None:
+            return entry
+        meta = self.index[model_key]
+        with self._lock:
+            if model_key not in self._entries:
+                shard = joblib.load(os.path.join(self.directory, meta['shard']))
+                self._entries[model_key] = {
+                    'model_results': shard['model_results'],
+                    'historical_residuals': np.load(os.path.join(self.directory, meta['residuals']), mmap_mode='r'),
+                    'last_date': pd.Timestamp(meta['last_date']),
+                }
+                if 'last_fit_date' in meta:
+                    self._entries[model_key]['last_fit_date'] = pd.Timestamp(meta['last_fit_date'])
+        return self._entries[model_key]
+
+    def __contains__(self, model_key):
+        return model_key in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def last_date(self, model_key):
+        return pd.Timestamp(self.index[model_key]['last_date'])
+
+    def refresh(self):
+        """Pick up entries rewritten by write_vault_entries(); costs one stat()
+        when nothing changed. Returns True if the index was re-read."""
+        mtime = os.stat(self._index_path).st_mtime_ns
+        if mtime == self._index_mtime:
+            return False
+        with self._lock:
+            with open(self._index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            for model_key, meta in index.items():
+                if self.index.get(model_key) != meta:
+                    self._entries.pop(model_key, None)
+            self.index = index
+            self._index_mtime = mtime
+        return True
+
+
+def load_vault(path):
+    """Open a vault: a sharded directory lazily, a single .pkl eagerly."""
+    if os.path.isdir(path):
+        return ShardedVault(path)
+    return joblib.load(path)
+
+# =========================
+# Forecasting
+# =========================
+def future_exog(last_date, days):
+    future_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=days)
+    return pd.DataFrame({
+        'is_weekend': [1 if d.weekday() >= 5 else 0 for d in future_dates]
+    }, index=future_dates)
+
+
+def _trend(entry, days):
+    exog = future_exog(entry['last_date'], days)
+    forecast_obj = entry['model_results'].get_forecast(steps=days, exog=exog)
+    conf_int = forecast_obj.conf_int()
+    return exog.index, forecast_obj.predicted_mean.values, conf_int.iloc[:, 0].values, conf_int.iloc[:, 1].values
+
+
+def _forecast_arrays(dates, trend, lower, upper, sample, bands, quantiles):
+    return {
+        'dates': dates,
+        'predicted_signal_dbm': sample,
+        'trend': trend,
+        'lower': lower,
+        'upper': upper,
+        'bands': {band_label(q): band for q, band in zip(quantiles, bands)},
+    }
+
+
+def forecast_json(arrays):
+    """JSON-ready form of forecast_arrays() output (values rounded to 0.01 dBm)."""
+    def rounded(a):
+        return np.asarray(a, dtype=float).round(2).tolist()
+    return {
+        'dates': pd.DatetimeIndex(arrays['dates']).strftime('%Y-%m-%d').tolist(),
+        'predicted_signal_dbm': rounded(arrays['predicted_signal_dbm']),
+        'trend': rounded(arrays['trend']),
+        'lower': rounded(arrays['lower']),
+        'upper': rounded(arrays['upper']),
+        'bands': {label: rounded(band) for label, band in arrays['bands'].items()},
+    }
+
+
+def forecast_arrays(entry, days, model_key=None, n_paths=FORECAST_PATHS,
+                    quantiles=FORECAST_QUANTILES, seed=None):
+    """forecast_entry() as float arrays (dates as a DatetimeIndex)."""
+    dates, trend, lower, upper = _trend(entry, days)
+    seed = key_seed(FORECAST_SEED, model_key) if seed is None else seed
+    boot = bootstrap_bands(trend, entry['historical_residuals'], n_paths, quantiles, seed)
+    return _forecast_arrays(dates, trend, lower, upper, boot['sample'], boot['bands'], quantiles)
+
+
+def forecast_entry(entry, days, model_key=None, n_paths=FORECAST_PATHS,
+                   quantiles=FORECAST_QUANTILES, seed=None):
+    """Forecast `days` ahead from one vault entry.
+
+    Returns a JSON-ready dict with the trend, the confidence interval, a
+    residual-bootstrapped "realistic" sample path and the bootstrap quantile
+    bands over `n_paths` paths (keyed 'p5', 'p50', ...). With seed=None the
+    stream is FORECAST_SEED mixed with `model_key`, so the same key always
+    gets the same sample path.
+    """
+    return forecast_json(forecast_arrays(entry, days, model_key, n_paths, quantiles, seed))
+
+
+def forecast_entries(entries, days, n_paths=FORECAST_PATHS, quantiles=FORECAST_QUANTILES, seed=None):
+    """forecast_entry() for many keys: one Kalman forecast per key, then every
+    key's paths drawn and reduced to bands in one array operation.
+
+    `entries` maps model_key -> vault entry. One Generator (FORECAST_SEED by
+    default) covers the whole batch, so results are reproducible for the
+    same keys in the same order. Returns model_key -> forecast dict.
+    """
+    keys = list(entries)
+    if not keys:
+        return {}
+    trends = [_trend(entries[k], days) for k in keys]
+    boot = bootstrap_bands(np.stack([t[1] for t in trends]),
+                           [entries[k]['historical_residuals'] for k in keys],
+                           n_paths, quantiles, FORECAST_SEED if seed is None else seed)
+    return {k: forecast_json(_forecast_arrays(*trend, boot['sample'][i], boot['bands'][i], quantiles))
+            for i, (k, trend) in enumerate(zip(keys, trends))}
+
+# =========================
+# Incremental updates
+# =========================
+def read_new_rows(path, since, chunksize=200000):
+    """Rows of the tower CSV dated after `since`, read in chunks so older
+    history is never held in memory."""
+    parts = []
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk['date'] = pd.to_datetime(chunk['date'])
+        parts.append(chunk[chunk['date'] > since])
+    return pd.concat(parts, ignore_index=True)
+
+
+def new_observations(daily, last_date):
+    """The part of a daily frame after last_date, on a gap-free daily index.
+
+    Missing days keep a NaN signal (the Kalman filter skips them) and take
+    is_weekend from the calendar. Returns None when nothing is new.
+    """
+    daily = daily[daily.index > last_date]
+    if daily.empty:
+        return None
+    index = pd.date_range(last_date + pd.Timedelta(days=1), daily.index[-1], freq='D')
+    daily = daily.reindex(index)
+    calendar = pd.Series((index.weekday >= 5).astype(int), index=index)
+    daily['is_weekend'] = daily['is_weekend'].fillna(calendar)
+    return daily
+
+
+def extend_entry(entry, new_daily):
+    """Add new observations to an entry using its fitted params (no re-optimization).
+
+    Returns (updated entry, one-step residuals of the new days).
+    """
+    model = entry['model_results']
+    endog, exog = new_daily['signal_strength_dbm'], new_daily[['is_weekend']]
+    if isinstance(model, CompactSARIMAX):
+        model, new_resid = model.extend(endog, exog)
+        residuals = np.concatenate([np.asarray(entry['historical_residuals'], dtype=float),
+                                    new_resid[~np.isnan(new_resid)]])
+    else:
+        model = model.append(endog, exog=exog)
+        resid = np.asarray(model.resid, dtype=float)
+        new_resid = resid[-len(new_daily):]
+        residuals = resid[2:][~np.isnan(resid[2:])]
+
+    updated = dict(entry, model_results=model, historical_residuals=residuals,
+                   last_date=new_daily.index[-1])
+    return updated, new_resid
+
+
+def drift_ratio(new_resid, historical_residuals):
+    """RMS of the new one-step errors over the historical residual scale.
+
+    The scale is the MAD-based sigma, so the large start-up residuals of the
+    differenced model do not inflate it. None when there are too few days.
+    """
+    r = np.asarray(new_resid, dtype=float)
+    r = r[~np.isnan(r)]
+    hist = np.asarray(historical_residuals, dtype=float)
+    if len(r) < MIN_DRIFT_DAYS or not len(hist):
+        return None
+    scale = 1.4826 * float(np.median(np.abs(hist - np.median(hist))))
+    if scale == 0:
+        return None
+    return float(np.sqrt(np.mean(r ** 2)) / scale)
+
+
+def entry_history(entry):
+    """Daily series behind a full-results entry (None for compact entries)."""
+    model = entry['model_results']
+    if isinstance(model, CompactSARIMAX):
+        return None
+    data = model.model.data
+    history = pd.concat([data.orig_endog, data.orig_exog], axis=1)
+    return history.interpolate(method='time')
+
+
+def refit_entry(entry, history=None):
+    """Full SARIMAX re-fit over the key's whole history, keeping the entry's
+    format; warm-started from the entry's own params."""
+    history = entry_history(entry) if history is None else history
+    if history is None:
+        raise ValueError("a compact entry needs its history to be re-fitted")
+    refit = make_entry(fit_sarimax(history, entry['model_results'].params), history)
+    refit['last_fit_date'] = refit['last_date']
+    return compact_entry(refit) if isinstance(entry['model_results'], CompactSARIMAX) else refit
+
+
+def update_vault(vault, new_daily_by_key, drift_threshold=DRIFT_THRESHOLD,
+                 refit_after_days=REFIT_AFTER_DAYS, history_for=None):
+    """Extend every vault key that has days after its last_date.
+
+    A key is fully re-fitted only when its new errors cross `drift_threshold`
+    (see drift_ratio) or its last full fit is `refit_after_days` old; 0
+    disables either check. Compact entries need `history_for(model_key)` to
+    return their full daily frame for a re-fit.
+    Returns (changed entries by key, report by key).
+    """
+    changed, report = {}, {}
+    for (city, operator), daily in new_daily_by_key.items():
+        model_key = f"{city}_{operator}"
+        if model_key not in vault:
+            report[model_key] = {'new_days': len(daily), 'drift': None, 'refit': None, 'seconds': 0.0,
+                                 'error': 'not in vault (needs a full training run)'}
+            continue
+        entry = vault[model_key]
+        if isinstance(entry['model_results'], OffsetSARIMAX):
+            report[model_key] = {'new_days': len(daily), 'drift': None, 'refit': None, 'seconds': 0.0,
+                                 'error': 'hierarchical entry (re-run train_hierarchical)'}
+            continue
+        new = new_observations(daily, entry['last_date'])
+        if new is None:
+            continue
+
+        start = time.perf_counter()
+        updated, new_resid = extend_entry(entry, new)
+        updated['last_fit_date'] = pd.Timestamp(entry.get('last_fit_date', entry['last_date']))
+        drift = drift_ratio(new_resid, entry['historical_residuals'])
+
+        reason, error = None, None
+        if drift_threshold and drift is not None and drift > drift_threshold:
+            reason = 'drift'
+        elif refit_after_days and (updated['last_date'] - updated['last_fit_date']).days >= refit_after_days:
+            reason = 'schedule'
+        if reason:
+            try:
+                history = None
+                if isinstance(entry['model_results'], CompactSARIMAX):
+                    history = history_for(model_key) if history_for else None
+                updated = refit_entry(updated, history)
+            except Exception as e:
+                error = f"re-fit failed, kept extended entry: {type(e).__name__}: {e}"
+
+        changed[model_key] = updated
+        report[model_key] = {'new_days': len(new), 'drift': drift, 'refit': reason,
+                             'seconds': time.perf_counter() - start, 'error': error}
+    return changed, report
+
+
+def incremental_update(csv_path, vault_path, drift_threshold=DRIFT_THRESHOLD,
+                       refit_after_days=REFIT_AFTER_DAYS):
+    """Daily refresh: fold the CSV rows newer than each key's last_date into
+    the vault at `vault_path` and rewrite only the entries that changed.
+
+    Returns (changed entries by key, report by key).
+    """
+    vault = load_vault(vault_path)
+    if not len(vault):
+        return {}, {}
+    if isinstance(vault, ShardedVault):
+        since = min(vault.last_date(k) for k in vault)
+    else:
+        since = min(pd.Timestamp(e['last_date']) for e in vault.values())
+
+    new_rows = read_new_rows(csv_path, since)
+    if new_rows.empty:
+        return {}, {}
+    new_daily_by_key, _ = partition_daily(new_rows)
+
+    histories = None
+
+    def history_for(model_key):
+        # only compact entries that must be re-fitted read the whole CSV, and
+        # then once for all of them
+        nonlocal histories
+        if histories is None:
+            histories = {f"{city}_{operator}": daily
+                         for (city, operator), daily in load_partitions(csv_path)['daily'].items()}
+        return histories.get(model_key)
+
+    changed, report = update_vault(vault, new_daily_by_key, drift_threshold, refit_after_days, history_for)
+    if changed:
+        write_vault_entries(vault_path, changed, None if isinstance(vault, ShardedVault) else vault)
+    return changed, report
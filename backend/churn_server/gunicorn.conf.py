@@ -0,0 +1,47 @@
+"""Production serving: gunicorn -c gunicorn.conf.py app:app
+
+The app (both models, the forecast vault and the dataset indexes) is loaded
+once in the master before the workers are forked, so every worker shares the
+same memory copy-on-write and answers its first request warm. Model threads
+are capped so that workers x MODEL_THREADS does not exceed the cores.
+
+Environment:
+    PORT            listen port (default 5000)
+    WEB_CONCURRENCY worker processes (default: number of cores, max 8)
+    GUNICORN_THREADS request threads per worker (default 4)
+    MODEL_THREADS   threads per model prediction (default: cores // workers)
+"""
+import gc
+import os
+
+cores = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(cores, 8)))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+preload_app = True
+timeout = 120
+
+# set before app.py (and with it xgboost / OpenMP) is imported
+model_threads = max(1, cores // workers)
+os.environ.setdefault("MODEL_THREADS", str(model_threads))
+os.environ.setdefault("OMP_NUM_THREADS", os.environ["MODEL_THREADS"])
+os.environ.setdefault("PREDICT_WORKERS", str(threads))
+
+
+def when_ready(server):
+    # runs in the master after the app is imported and before any fork
+    import app
+    if app.model_store.wait():
+        server.log.info("All models loaded before fork")
+    else:
+        server.log.warning(f"Some models failed to load: {app.model_store.status()}")
+    # keep the loaded objects out of the GC's reach so collections in the
+    # workers do not touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} started with shared models "
+                    f"({os.environ['MODEL_THREADS']} model threads, {threads} request threads)")
@@ -0,0 +1,163 @@
+import re
+
+import numpy as np
+
+METRICS = ('download_mbps', 'upload_mbps', 'latency_ms', 'confidence_score')
+DIMENSIONS = ('state', 'city', 'area', 'pincode', 'operator', 'network_type')
+
+# dashboard filter name -> record field (same names as DataProcessor.filters)
+FILTER_FIELDS = {
+    'state': 'state',
+    'city': 'city',
+    'area': 'area',
+    'pincode': 'pincode',
+    'network': 'network_type',
+    'operator': 'operator',
+}
+
+# dropdown level -> the filters above it in the state > city > area > pincode hierarchy
+OPTION_PARENTS = {
+    'cities': ('city', ('state',)),
+    'areas': ('area', ('state', 'city')),
+    'pincodes': ('pincode', ('state', 'city', 'area')),
+}
+
+METRIC_COLUMN = {'download': 0, 'upload': 1, 'latency': 2, 'score': 3}
+
+
+_JS_FLOAT = re.compile(r'[+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+
+def _num(value):
+    # same as parseFloat(x) || 0 in data-processor.js: strings are read up to
+    # the first character that is not part of a number (" 42ms" -> 42), and
+    # booleans, null and anything unparsable count as 0
+    if isinstance(value, bool) or value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        value = float(value)
+    else:
+        match = _JS_FLOAT.match(str(value).lstrip())
+        if match is None:
+            return 0.0
+        value = float(match.group().replace('Infinity', 'inf'))
+    return 0.0 if value != value or value == 0 else value
+
+
+def _dim_value(dim, value):
+    # pincodes are compared as strings on the dashboard
+    return str(value) if dim == 'pincode' and value is not None else value
+
+
+class KPIIndex:
+    """Pre-aggregated KPI cells with inverted indexes per filter dimension.
+
+    Records are grouped once into cells, one per distinct
+    (state, city, area, pincode, operator, network_type), holding the sums of
+    METRICS and a row count. Each dimension value maps to the sorted array of
+    cells that contain it, so a filter combination is answered by
+    intersecting a few posting lists and summing their cells.
+    """
+
+    def __init__(self, records):
+        cell_ids = {}
+        sums = []
+        counts = []
+        for r in records:
+            key = tuple(_dim_value(d, r.get(d)) for d in DIMENSIONS)
+            cid = cell_ids.get(key)
+            if cid is None:
+                cid = cell_ids[key] = len(counts)
+                sums.append([0.0] * len(METRICS))
+                counts.append(0)
+            row = sums[cid]
+            for j, m in enumerate(METRICS):
+                row[j] += _num(r.get(m))
+            counts[cid] += 1
+
+        self.sums = np.asarray(sums, dtype=float).reshape(-1, len(METRICS))
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+        keys = list(cell_ids)
+        self.values = {}
+        self.codes = {}
+        self.postings = {}
+        for i, dim in enumerate(DIMENSIONS):
+            column = [k[i] for k in keys]
+            uniq = sorted(set(column), key=lambda v: (v is None, str(v)))
+            lookup = {v: c for c, v in enumerate(uniq)}
+            codes = np.fromiter((lookup[v] for v in column), dtype=np.int64, count=len(column))
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniq) + 1))
+            self.values[dim] = uniq
+            self.codes[dim] = codes
+            self.postings[dim] = {v: order[bounds[c]:bounds[c + 1]] for v, c in lookup.items()}
+
+        # best-operator grouping uses upper-cased names like the dashboard
+        op_col = DIMENSIONS.index('operator')
+        self.op_names = sorted({(k[op_col] or 'Unknown').upper() for k in keys})
+        op_lookup = {v: i for i, v in enumerate(self.op_names)}
+        self.op_codes = np.fromiter((op_lookup[(k[op_col] or 'Unknown').upper()] for k in keys),
+                                    dtype=np.int64, count=len(keys))
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def select(self, filters, names=None):
+        """Cell ids matching the given dashboard filters ('All' = no filter)."""
+        cells = None
+        for name in (names or FILTER_FIELDS):
+            value = filters.get(name, 'All')
+            if value in (None, '', 'All'):
+                continue
+            dim = FILTER_FIELDS[name]
+            posting = self.postings[dim].get(_dim_value(dim, value))
+            if posting is None:
+                return np.zeros(0, dtype=np.int64)
+            cells = posting if cells is None else np.intersect1d(cells, posting, assume_unique=True)
+        return np.arange(len(self.counts)) if cells is None else cells
+
+    def kpis(self, filters, metric='score'):
+        cells = self.select(filters)
+        count = int(self.counts[cells].sum())
+        if count == 0:
+            return {'bestOperator': 'N/A', 'avgDownload': 0, 'avgUpload': 0,
+                    'avgScore': 0, 'avgLatency': 0, 'count': 0}
+
+        avg = self.sums[cells].sum(axis=0) / count
+
+        col = METRIC_COLUMN.get(metric, METRIC_COLUMN['score'])
+        op_totals = np.bincount(self.op_codes[cells], weights=self.sums[cells, col], minlength=len(self.op_names))
+        op_counts = np.bincount(self.op_codes[cells], weights=self.counts[cells], minlength=len(self.op_names))
+        present = op_counts > 0
+        op_avg = np.where(present, op_totals / np.where(present, op_counts, 1), np.nan)
+
+        lower_is_better = metric == 'latency'
+        best = int(np.nanargmin(op_avg) if lower_is_better else np.nanargmax(op_avg))
+        best_operator, best_val = self.op_names[best], op_avg[best]
+
+        # Business Logic Override (mirrors data-processor.js): prefer JIO within 10% of best
+        if 'JIO' in self.op_names and present[self.op_names.index('JIO')]:
+            jio_avg = op_avg[self.op_names.index('JIO')]
+            if (lower_is_better and jio_avg < best_val * 1.1) or (not lower_is_better and jio_avg > best_val * 0.9):
+                best_operator = 'JIO'
+
+        return {
+            'bestOperator': best_operator,
+            'avgDownload': round(float(avg[0]), 2),
+            'avgUpload': round(float(avg[1]), 2),
+            'avgScore': round(float(avg[3]), 2),
+            'avgLatency': round(float(avg[2])),
+            'count': count,
+        }
+
+    def options(self, filters):
+        """Dropdown values for each hierarchy level under the current selection."""
+        out = {}
+        for level, (name, parents) in OPTION_PARENTS.items():
+            dim = FILTER_FIELDS[name]
+            cells = self.select(filters, parents)
+            codes = np.unique(self.codes[dim][cells])
+            vals = [self.values[dim][c] for c in codes if self.values[dim][c] is not None]
+            out[level] = sorted(vals, key=lambda v: (len(v), v)) if dim == 'pincode' else sorted(vals)
+        return out
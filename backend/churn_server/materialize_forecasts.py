@@ -0,0 +1,50 @@
+"""Precompute every key's forecast into a memory-mapped table for /forecast.
+
+Forecasts each (city, operator) in the vault on a process pool and writes
+forecast_table.py's columnar format (float32 columns + a per-key offset
+index). The server serves keys from that table by slicing, falling back to
+the vault for keys the table does not cover or that changed since.
+
+    python materialize_forecasts.py --vault telecom_models_vault --output forecast_table
+    python materialize_forecasts.py --days 90 --workers 8
+"""
+import os
+import sys
+import time
+import argparse
+
+from forecasting import TRAIN_WORKERS
+from forecast_table import materialize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Materialize every vault key\'s forecast into a memory-mapped table.')
+    parser.add_argument('--vault', default=os.environ.get("FORECAST_VAULT_PATH",
+                                                          os.path.join(BASE_DIR, 'telecom_models_dictionary.pkl')),
+                        help='sharded vault directory or single .pkl (default: FORECAST_VAULT_PATH)')
+    parser.add_argument('--output', default=os.environ.get("FORECAST_TABLE_PATH",
+                                                           os.path.join(BASE_DIR, 'forecast_table')),
+                        help='table directory (default: FORECAST_TABLE_PATH)')
+    parser.add_argument('--days', type=int, default=60, help='days forecast per key (requests up to this are served)')
+    parser.add_argument('--workers', type=int, default=TRAIN_WORKERS, help='forecast processes')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.vault):
+        print('Vault not found at', args.vault)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    meta, errors = materialize(args.vault, args.output, args.days, args.workers)
+    elapsed = time.perf_counter() - start
+
+    size = sum(os.path.getsize(os.path.join(args.output, f)) for f in os.listdir(args.output))
+    print(f"Materialized {len(meta['index'])} key(s) x {args.days} days into {args.output} "
+          f"({size / 1e6:.2f} MB) in {elapsed:.2f}s")
+    for k, error in sorted(errors.items()):
+        print(f"  skipped {k}: {error}")
+
+
+if __name__ == '__main__':
+    main()
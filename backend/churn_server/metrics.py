@@ -0,0 +1,115 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# seconds; covers a cached single row (~100us) up to a large batch
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_str(labels):
+    if not labels:
+        return ''
+    parts = []
+    for k, v in labels:
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{k}="{v}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += value
+            s[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(k, list(c), total, n) for k, (c, total, n) in sorted(self._series.items())]
+        for key, counts, total, n in series:
+            running = 0
+            for bound, c in zip(self.buckets + (float('inf'),), counts):
+                running += c
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_label_str(key + (('le', le),))} {running}")
+            lines.append(f"{self.name}_sum{_label_str(key)} {total!r}")
+            lines.append(f"{self.name}_count{_label_str(key)} {n}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines += [f"{self.name}{_label_str(k)} {v}" for k, v in values]
+        return lines
+
+
+class Registry:
+    """Metrics served at /metrics in the Prometheus text exposition format.
+
+    `collectors` are callables returning (name, type, help, value) tuples for
+    values owned elsewhere (cache and coalescer counters), read at scrape time.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        h = Histogram(name, help_text, buckets)
+        self.metrics.append(h)
+        return h
+
+    def counter(self, name, help_text):
+        c = Counter(name, help_text)
+        self.metrics.append(c)
+        return c
+
+    def render(self):
+        lines = []
+        for m in self.metrics:
+            lines += m.render()
+        for collect in self.collectors:
+            for name, kind, help_text, value in collect():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value!r}"]
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def timed(histogram, **labels):
+    """Observe the wall time of the block into `histogram`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
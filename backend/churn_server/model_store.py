@@ -0,0 +1,192 @@
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from concurrent.futures import wait as wait_futures
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CHUNK_SIZE = 1 << 20
+
+log = logging.getLogger("churn_server")
+
+
+class ChecksumMismatch(ValueError):
+    pass
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _open_source(source, timeout=60):
+    """Yield byte chunks from a local path, a file:// URL or an http(s) URL."""
+    scheme = urlparse(source).scheme
+    if scheme in ('http', 'https'):
+        with requests.get(source, stream=True, timeout=timeout) as r:
+            r.raise_for_status()
+            yield from r.iter_content(chunk_size=CHUNK_SIZE)
+        return
+
+    local = url2pathname(urlparse(source).path) if scheme == 'file' else source
+    with open(local, 'rb') as f:
+        yield from iter(lambda: f.read(CHUNK_SIZE), b'')
+
+
+def fetch_artifact(source, path, sha256=None):
+    """Make sure `path` holds the artifact, streaming it from `source` if needed.
+
+    The body is written to disk chunk by chunk while being hashed, so it is
+    never held in memory, and it only replaces `path` once the checksum
+    matches. An existing file is kept when it matches `sha256` (or when no
+    checksum is configured).
+    """
+    if os.path.exists(path) and (sha256 is None or sha256_file(path) == sha256):
+        return path
+    if not source:
+        if os.path.exists(path):
+            raise ChecksumMismatch(f"{path} does not match its sha256 and no source is configured")
+        raise FileNotFoundError(f"{path} not found and no source is configured")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.part-{os.getpid()}-{threading.get_ident()}"
+    h = hashlib.sha256()
+    try:
+        with open(tmp, 'wb') as out:
+            for chunk in _open_source(source):
+                h.update(chunk)
+                out.write(chunk)
+        if sha256 is not None and h.hexdigest() != sha256:
+            raise ChecksumMismatch(f"{source}: sha256 {h.hexdigest()} != expected {sha256}")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+class ModelStore:
+    """Loads every model in the background and hands them out when warm.
+
+    Each key moves through pending -> loading -> ready (or error). get()
+    blocks only on the key it needs, so one slow artifact does not hold up
+    predictions for the others.
+    """
+
+    def __init__(self, model_map, model_dir, sources=None, checksums=None, n_jobs=None):
+        self.model_map = model_map
+        self.model_dir = model_dir
+        self.sources = sources or {}
+        self.checksums = checksums or {}
+        self.n_jobs = n_jobs
+        self.models = {}
+        self.state = {k: 'pending' for k in model_map}
+        self.errors = {}
+        self.load_seconds = {}
+        self.versions = {k: 0 for k in model_map}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def path(self, key):
+        return os.path.join(self.model_dir, self.model_map[key])
+
+    def _load(self, key):
+        self.state[key] = 'loading'
+        start = time.perf_counter()
+        try:
+            path = fetch_artifact(self.sources.get(key), self.path(key), self.checksums.get(key))
+            with open(path, 'rb') as f:
+                model = pickle.load(f)
+            self._configure(model)
+        except Exception as e:
+            self.state[key] = 'error'
+            self.errors[key] = f"{type(e).__name__}: {e}"
+            log.warning("Failed loading model %s: %s", key, self.errors[key])
+            raise
+        # bumped before the model is published: a caller that reads version()
+        # before get() is never handed a model older than that version
+        self.versions[key] += 1
+        self.models[key] = model
+        self.load_seconds[key] = time.perf_counter() - start
+        self.state[key] = 'ready'
+        self.errors.pop(key, None)
+        log.info("Model %s ready in %.2fs", key, self.load_seconds[key])
+        return model
+
+    def _configure(self, model):
+        # cap the model's own prediction threads (n_jobs / nthread), e.g. so
+        # several server processes do not each use every core
+        if self.n_jobs and hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=self.n_jobs)
+
+    def _submit(self, key):
+        with self._lock:
+            fut = self._futures.get(key)
+            if fut is None or (fut.done() and fut.exception() is not None):
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.model_map)),
+                                                    thread_name_prefix='model-load')
+                fut = self._futures[key] = self._pool.submit(self._load, key)
+            return fut
+
+    def preload(self, keys=None):
+        """Start fetching and loading all (or the given) models concurrently."""
+        return [self._submit(k) for k in (keys or self.model_map)]
+
+    def wait(self, timeout=None):
+        """Block until every started load has finished and stop the loader threads.
+
+        Used before forking worker processes: threads do not survive a fork,
+        so the pool is shut down and recreated on demand by later reloads.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+        wait_futures(futures, timeout=timeout)
+        with self._lock:
+            if self._pool is not None and all(f.done() for f in self._futures.values()):
+                self._pool.shutdown()
+                self._pool = None
+        return self.ready()
+
+    def get(self, key):
+        if key in self.models:
+            return self.models[key]
+        if key not in self.model_map:
+            raise KeyError(f"unknown model '{key}'")
+        return self._submit(key).result()
+
+    def reload(self, key):
+        """Drop a model and load it again (e.g. after replacing the .pkl)."""
+        with self._lock:
+            self.models.pop(key, None)
+            self._futures.pop(key, None)
+            self.state[key] = 'pending'
+        return self.get(key)
+
+    def version(self, key):
+        """Counter bumped on every (re)load of `key`; 0 until first loaded."""
+        return self.versions.get(key, 0)
+
+    def ready(self):
+        return all(s == 'ready' for s in self.state.values())
+
+    def status(self):
+        return {
+            k: {
+                'state': self.state[k],
+                'seconds': round(self.load_seconds[k], 3) if k in self.load_seconds else None,
+                'version': self.versions[k],
+                'error': self.errors.get(k),
+            }
+            for k in self.model_map
+        }
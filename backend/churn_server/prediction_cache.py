@@ -0,0 +1,86 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def row_digests(X):
+    """Canonical hash of every feature row.
+
+    Rows are hashed as float64 bytes after folding -0.0 into 0.0 and every
+    NaN into one bit pattern, so equal vectors always share a key however
+    they were sent (ints vs floats, dict vs list).
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64) + 0.0
+    X[np.isnan(X)] = np.nan
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in X]
+
+
+class PredictionCache:
+    """LRU cache of per-row scoring results with an optional TTL.
+
+    Entries are keyed by (model key, model version, row digest). Reloading a
+    model bumps its version in ModelStore, so older entries are never hit
+    again and age out through LRU eviction.
+    """
+
+    def __init__(self, maxsize=10000, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Cached (raw, proba_row) for each key, or None where missing/expired."""
+        now = time.monotonic()
+        out = []
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is not None and self.ttl is not None and now - entry[0] > self.ttl:
+                    del self._data[key]
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    out.append(None)
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    out.append(entry[1])
+        return out
+
+    def put_many(self, keys, values):
+        now = time.monotonic()
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._data[key] = (now, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, model_key=None):
+        """Drop every entry (or only those of one model)."""
+        with self._lock:
+            if model_key is None:
+                self._data.clear()
+            else:
+                for key in [k for k in self._data if k[0] == model_key]:
+                    del self._data[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
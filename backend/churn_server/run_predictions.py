@@ -3,8 +3,13 @@ import json
 import pickle
 import csv
 import sys
+import argparse
 from collections import Counter
 
+import numpy as np
+
+from dataset_cache import iter_records, load_dataset
+
 BASE_DIR = os.path.dirname(__file__)
 MODEL_DIR = os.path.join(BASE_DIR, 'models')
 DATASET_PATH = os.path.join(BASE_DIR, '..', '..', 'data', 'dataset.json')
@@ -15,11 +20,208 @@ MODEL_MAP = {
     'rf': 'random_forest_model.pkl'
 }
 
+CHUNK_SIZE = 50000
+
 def load_model(path):
     with open(path, 'rb') as f:
         return pickle.load(f)
 
-def main():
+def label_for(pred):
+    return 'ha' if pred == 1 else 'kadha'
+
+def score_rowwise(data, feature_keys_sorted, models, rows, summaries):
+    for idx, rec in enumerate(data):
+        try:
+            vals = [rec.get(k, 0) for k in feature_keys_sorted]
+            X = [vals]
+            for mk, m in models.items():
+                try:
+                    pred = m.predict(X)[0]
+                except Exception as e:
+                    pred = None
+                proba = None
+                if hasattr(m, 'predict_proba') and pred is not None:
+                    try:
+                        proba = m.predict_proba(X)[0].tolist()
+                    except Exception:
+                        proba = None
+                label_telugu = label_for(pred)
+                rows.append([idx, mk, int(pred) if pred is not None else '', label_telugu, json.dumps(proba)])
+                summaries[mk][str(pred)] += 1
+        except Exception as e:
+            print('Failed on record', idx, 'error', e)
+
+def build_matrix(data, feature_keys_sorted, offset=0):
+    """Build the (n_records, n_features) float matrix in one go.
+
+    Records whose values cannot be converted to float are left as NaN rows
+    and reported back through the `valid` mask so callers can skip them.
+    """
+    n, d = len(data), len(feature_keys_sorted)
+    X = np.full((n, d), np.nan, dtype=float)
+    valid = np.ones(n, dtype=bool)
+    for idx, rec in enumerate(data):
+        try:
+            X[idx] = [rec.get(k, 0) for k in feature_keys_sorted]
+        except Exception as e:
+            valid[idx] = False
+            print('Failed on record', offset + idx, 'error', e)
+    return X, valid
+
+def predict_block(m, X):
+    """Return (pred, proba) for a block of rows with one ensemble pass.
+
+    When the model has predict_proba the labels are taken from its argmax,
+    otherwise model.predict is used and proba is None.
+    """
+    if hasattr(m, 'predict_proba'):
+        try:
+            proba = np.asarray(m.predict_proba(X))
+            classes = getattr(m, 'classes_', None)
+            if classes is None:
+                classes = np.arange(proba.shape[1])
+            return np.asarray(classes)[proba.argmax(axis=1)], proba
+        except Exception:
+            pass
+    return np.asarray(m.predict(X)), None
+
+def score_model_vectorized(m, X, valid, chunk_size, offset=0):
+    """Score every valid row of X with `m` in chunks.
+
+    Returns (pred, proba, ok): an object array of predictions, a list of
+    probability lists (or None) and a mask of rows the model scored. When a
+    whole chunk fails the rows are retried one by one so failures are still
+    reported by index.
+    """
+    n = len(X)
+    pred = np.empty(n, dtype=object)
+    proba = [None] * n
+    ok = np.zeros(n, dtype=bool)
+
+    idx_all = np.flatnonzero(valid)
+    for start in range(0, len(idx_all), chunk_size):
+        idx = idx_all[start:start + chunk_size]
+        try:
+            p, pr = predict_block(m, X[idx])
+            pred[idx] = p
+            if pr is not None:
+                for i, row in zip(idx, pr.tolist()):
+                    proba[i] = row
+            ok[idx] = True
+        except Exception:
+            for i in idx:
+                try:
+                    p, pr = predict_block(m, X[i:i + 1])
+                    pred[i] = p[0]
+                    proba[i] = pr[0].tolist() if pr is not None else None
+                    ok[i] = True
+                except Exception as e:
+                    print('Failed on record', offset + int(i), 'error', e)
+    return pred, proba, ok
+
+def build_matrix_columnar(ds, feature_keys_sorted):
+    """Feature matrix straight from the columnar cache, no per-record dicts.
+
+    Same values as build_matrix() on the raw records: absent keys become 0
+    (rec.get(k, 0)), JSON nulls NaN, numeric strings such as "1.5" their
+    float; a value float() rejects marks the row invalid.
+    """
+    X = np.empty((len(ds), len(feature_keys_sorted)), dtype=float)
+    valid = np.ones(len(ds), dtype=bool)
+    for j, k in enumerate(feature_keys_sorted):
+        col, bad = ds.float_values(k)
+        col = np.array(col, dtype=float)
+        col[ds.missing(k)] = 0
+        X[:, j] = col
+        valid &= ~bad
+    for idx in np.flatnonzero(~valid).tolist():
+        print('Failed on record', idx, 'error', 'non-numeric feature value')
+    return X, valid
+
+def score_vectorized(data, feature_keys_sorted, models, rows, summaries, chunk_size=CHUNK_SIZE, offset=0):
+    X, valid = build_matrix(data, feature_keys_sorted, offset)
+    score_matrix(X, valid, models, rows, summaries, chunk_size, offset)
+
+def score_matrix(X, valid, models, rows, summaries, chunk_size=CHUNK_SIZE, offset=0):
+    per_model = {}
+    for mk, m in models.items():
+        pred, proba, ok = score_model_vectorized(m, X, valid, chunk_size, offset)
+        per_model[mk] = (pred, proba, ok)
+
+        # summaries from array ops: unique labels + counts in one pass
+        labels, counts = np.unique(pred[ok].astype(str), return_counts=True)
+        for lab, c in zip(labels.tolist(), counts.tolist()):
+            summaries[mk][lab] += c
+        n_failed = int(np.count_nonzero(~ok))
+        if n_failed:
+            summaries[mk]['None'] += n_failed
+
+    for idx in range(len(X)):
+        for mk, (pred, proba, ok) in per_model.items():
+            p = pred[idx] if ok[idx] else None
+            rows.append([offset + idx, mk, int(p) if p is not None else '', label_for(p), json.dumps(proba[idx])])
+
+LABEL_KEYS = {'churn', 'Churn', 'label', 'target'}
+HEADER = ['index', 'model', 'prediction', 'label_telugu', 'proba']
+
+def infer_feature_keys(first):
+    # infer feature keys from first record (drop obvious label keys)
+    return sorted(k for k in first.keys() if k not in LABEL_KEYS)
+
+def iter_chunks(it, size):
+    chunk = []
+    for rec in it:
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_streaming(ds_path, models, chunk_size, out_csv):
+    """Score `ds_path` chunk by chunk and append each chunk to `out_csv`.
+
+    Peak memory is bounded by `chunk_size` records, independent of the input
+    size. Returns the summaries Counter per model.
+    """
+    summaries = {k: Counter() for k in models.keys()}
+    feature_keys_sorted = None
+    offset = 0
+
+    with open(ds_path, 'r', encoding='utf-8') as src, \
+            open(out_csv, 'w', newline='', encoding='utf-8') as out:
+        w = csv.writer(out)
+        w.writerow(HEADER)
+
+        for chunk in iter_chunks(iter_records(src), chunk_size):
+            if feature_keys_sorted is None:
+                feature_keys_sorted = infer_feature_keys(chunk[0])
+                print('Using feature keys:', feature_keys_sorted)
+
+            rows = []
+            score_vectorized(chunk, feature_keys_sorted, models, rows, summaries, chunk_size, offset)
+            w.writerows(rows)
+            offset += len(chunk)
+            print(f'Scored {offset} records')
+
+    if offset == 0:
+        print('Dataset is empty')
+    return summaries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score data/dataset.json with every model in models/.')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='build the feature matrix once and score each model in chunked predict_proba calls')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='rows per predict_proba call in vectorized/stream mode (default: %(default)s)')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the dataset incrementally (JSON array or NDJSON) and append each scored chunk to the CSV')
+    parser.add_argument('--input', default=DATASET_PATH,
+                        help='dataset path, JSON array or NDJSON (default: data/dataset.json)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse the JSON directly instead of reading through the columnar cache')
+    args = parser.parse_args(argv)
+
     # check models
     models = {}
     for k, fn in MODEL_MAP.items():
@@ -38,59 +240,67 @@ def main():
         sys.exit(1)
 
     # load dataset
-    ds_path = os.path.abspath(DATASET_PATH)
+    ds_path = os.path.abspath(args.input)
     if not os.path.exists(ds_path):
         print('Dataset not found at', ds_path)
         sys.exit(1)
 
-    print('Loading dataset (this may take a while)...')
-    with open(ds_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    if not isinstance(data, list):
-        print('Dataset JSON is not a list of records; aborting')
-        sys.exit(1)
-
-    if len(data) == 0:
-        print('Dataset is empty')
-        sys.exit(1)
-
-    # infer feature keys from first record (drop obvious label keys)
-    first = data[0]
-    label_keys = {'churn', 'Churn', 'label', 'target'}
-    feature_keys = [k for k in first.keys() if k not in label_keys]
-    feature_keys_sorted = sorted(feature_keys)
-    print('Using feature keys:', feature_keys_sorted)
-
-    # Prepare CSV header
-    header = ['index', 'model', 'prediction', 'label_telugu']
-    # if model has predict_proba we'll add a proba column
-    # we'll store proba as JSON string
-    header.append('proba')
+    if args.stream:
+        try:
+            summaries = run_streaming(ds_path, models, args.chunk_size, OUT_CSV)
+        except ValueError as e:
+            print(f'{e}; aborting')
+            sys.exit(1)
+        print('Wrote predictions to', OUT_CSV)
+        for mk, cnt in summaries.items():
+            print('Summary for', mk, ':', dict(cnt))
+        return
 
     rows = []
     summaries = {k: Counter() for k in models.keys()}
 
-    for idx, rec in enumerate(data):
+    if not args.no_cache:
+        # columnar cache: JSON is only parsed when the source file changed
         try:
-            vals = [rec.get(k, 0) for k in feature_keys_sorted]
-            X = [vals]
-            for mk, m in models.items():
-                try:
-                    pred = m.predict(X)[0]
-                except Exception as e:
-                    pred = None
-                proba = None
-                if hasattr(m, 'predict_proba') and pred is not None:
-                    try:
-                        proba = m.predict_proba(X)[0].tolist()
-                    except Exception:
-                        proba = None
-                label_telugu = 'ha' if pred == 1 else 'kadha'
-                rows.append([idx, mk, int(pred) if pred is not None else '', label_telugu, json.dumps(proba)])
-                summaries[mk][str(pred)] += 1
-        except Exception as e:
-            print('Failed on record', idx, 'error', e)
+            ds = load_dataset(ds_path)
+        except ValueError as e:
+            print(f'{e}; aborting')
+            sys.exit(1)
+        if len(ds) == 0:
+            print('Dataset is empty')
+            sys.exit(1)
+
+        feature_keys_sorted = infer_feature_keys(dict.fromkeys(ds.first_keys))
+        print('Using feature keys:', feature_keys_sorted)
+
+        if args.vectorized:
+            X, valid = build_matrix_columnar(ds, feature_keys_sorted)
+            score_matrix(X, valid, models, rows, summaries, args.chunk_size)
+        else:
+            score_rowwise(ds.records(), feature_keys_sorted, models, rows, summaries)
+    else:
+        print('Loading dataset (this may take a while)...')
+        with open(ds_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if not isinstance(data, list):
+            print('Dataset JSON is not a list of records; aborting')
+            sys.exit(1)
+
+        if len(data) == 0:
+            print('Dataset is empty')
+            sys.exit(1)
+
+        feature_keys_sorted = infer_feature_keys(data[0])
+        print('Using feature keys:', feature_keys_sorted)
+
+        if args.vectorized:
+            score_vectorized(data, feature_keys_sorted, models, rows, summaries, args.chunk_size)
+        else:
+            score_rowwise(data, feature_keys_sorted, models, rows, summaries)
+
+    # proba is stored as a JSON string
+    header = HEADER
 
     # write CSV
     with open(OUT_CSV, 'w', newline='', encoding='utf-8') as f:
@@ -0,0 +1,88 @@
+import numpy as np
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0
+AREA_FIELDS = ('state', 'city', 'area', 'pincode')
+
+
+class AreaIndex:
+    """Nearest-area lookup over dataset.json coordinates.
+
+    Every record with coordinates is indexed as its own point (repeats of the
+    same area at the same position are kept once) in a haversine BallTree on
+    radians. An area is as close as its closest record, which is what the
+    dashboard's local scan returns, but a lookup is O(log n) instead of a scan
+    over every record. One extra tree is kept per city for city-restricted
+    lookups.
+    """
+
+    def __init__(self, points):
+        self.points = points
+        coords = np.radians([[p['latitude'], p['longitude']] for p in points]).reshape(-1, 2)
+        self.tree = BallTree(coords, metric='haversine') if len(points) else None
+
+        self.city_trees = {}
+        by_city = {}
+        for i, p in enumerate(points):
+            by_city.setdefault(p['city'], []).append(i)
+        for city, idx in by_city.items():
+            idx = np.asarray(idx)
+            self.city_trees[city] = (idx, BallTree(coords[idx], metric='haversine'))
+
+    @classmethod
+    def from_records(cls, records):
+        points, seen = [], set()
+        for r in records:
+            lat, lon = r.get('latitude'), r.get('longitude')
+            if not lat or not lon:
+                continue
+            try:
+                lat, lon = float(lat), float(lon)
+            except (TypeError, ValueError):
+                continue
+            key = tuple(r.get(f) for f in AREA_FIELDS) + (lat, lon)
+            if key in seen:
+                continue
+            seen.add(key)
+            points.append({**{f: r.get(f) for f in AREA_FIELDS}, 'latitude': lat, 'longitude': lon})
+        return cls(points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, lat, lon, k=1, radius_km=None, city=None):
+        """Return up to k distinct areas closest to (lat, lon), nearest first,
+        each with the position and distance of its closest record."""
+        if city is not None:
+            if city not in self.city_trees:
+                return []
+            idx, tree = self.city_trees[city]
+        else:
+            idx, tree = None, self.tree
+        if tree is None:
+            return []
+
+        n = tree.data.shape[0]
+        query = min(k, n)
+        while True:
+            dist, ind = tree.query(np.radians([[lat, lon]]), k=query)
+            dist_km = dist[0] * EARTH_RADIUS_KM
+            ind = ind[0] if idx is None else idx[ind[0]]
+
+            results, seen, exhausted = [], set(), query == n
+            for d, i in zip(dist_km, ind):
+                if radius_km is not None and d > radius_km:
+                    exhausted = True
+                    break
+                point = self.points[i]
+                area = tuple(point[f] for f in AREA_FIELDS)
+                if area in seen:
+                    continue
+                seen.add(area)
+                results.append({**point, 'distance_km': round(float(d), 3)})
+                if len(results) == k:
+                    return results
+            if exhausted:
+                return results
+            # several of the nearest records were the same area; look further
+            query = min(n, query * 4)
@@ -0,0 +1,86 @@
+"""Synthetic tower signal CSVs with the schema of telecom_33_towers_4_operators.csv.
+
+Columns: date, city, operator, signal_strength_dbm, is_weekend. One row per
+tower, operator and day (towers are spread over cities round-robin), so
+forecasting.load_partitions() sees `cities x operators` keys, each with
+`towers per city` readings a day.
+
+    python synthetic_towers.py --towers 33 --days 365 --output towers_33.csv
+    python synthetic_towers.py --towers 3300 --cities 300 --output towers_3300.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = ('Airtel', 'Jio', 'Vi', 'BSNL')
+
+
+def generate_towers(towers=33, operators=OPERATORS, days=365, cities=None,
+                    start='2024-01-01', missing=0.02, seed=0):
+    """DataFrame of daily signal readings per (tower, operator).
+
+    Each (city, operator) has its own base level; each tower adds an offset.
+    The signal has a slow drift, a weekend dip (the weekly season the
+    SARIMAX models pick up) and AR(1) noise. About `missing` of the rows are
+    dropped so the daily interpolation has gaps to fill.
+    """
+    rng = np.random.default_rng(seed)
+    cities = cities or max(1, towers // 3)
+    dates = pd.date_range(start, periods=days, freq='D')
+    n_ops = len(operators)
+
+    tower_city = np.arange(towers) % cities
+    base = rng.uniform(-105, -70, size=(cities, n_ops))
+    level = base[tower_city] + rng.normal(0, 3, size=(towers, n_ops))      # (towers, ops)
+
+    t = np.arange(days)
+    weekend = (dates.weekday >= 5).astype(int)
+    drift = rng.normal(0, 2, size=(towers, n_ops, 1)) * (t / max(days, 1))
+    weekly = -rng.uniform(0.5, 3, size=(towers, n_ops, 1)) * weekend
+
+    noise = rng.normal(0, 1.5, size=(towers, n_ops, days))
+    for d in range(1, days):                                              # AR(1), phi = 0.6
+        noise[:, :, d] += 0.6 * noise[:, :, d - 1]
+
+    signal = level[:, :, None] + drift + weekly + noise                   # (towers, ops, days)
+
+    frame = pd.DataFrame({
+        'date': np.tile(dates.strftime('%Y-%m-%d'), towers * n_ops),
+        'city': np.repeat(np.array([f"City{c:04d}" for c in tower_city]), n_ops * days),
+        'operator': np.tile(np.repeat(np.asarray(operators), days), towers),
+        'signal_strength_dbm': signal.reshape(-1).round(2),
+        'is_weekend': np.tile(weekend, towers * n_ops),
+    })
+    if missing:
+        frame = frame[rng.random(len(frame)) >= missing].reset_index(drop=True)
+    return frame
+
+
+def write_towers_csv(path, **kwargs):
+    frame = generate_towers(**kwargs)
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic tower signal CSV.')
+    parser.add_argument('--towers', type=int, default=33)
+    parser.add_argument('--cities', type=int, default=None, help='default: towers // 3')
+    parser.add_argument('--operators', default=','.join(OPERATORS), help='comma-separated operator names')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--missing', type=float, default=0.02, help='fraction of rows to drop')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='synthetic_towers.csv')
+    args = parser.parse_args(argv)
+
+    frame = write_towers_csv(args.output, towers=args.towers, operators=tuple(args.operators.split(',')),
+                             days=args.days, cities=args.cities, start=args.start,
+                             missing=args.missing, seed=args.seed)
+    print(f"Wrote {len(frame)} rows ({frame['city'].nunique()} cities x "
+          f"{frame['operator'].nunique()} operators) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+# no model loading, dataset or vault at import: the tests inject their own model
+os.environ.setdefault('PRELOAD_MODELS', '0')
+os.environ.setdefault('DATASET_PATH', os.path.join(os.path.dirname(__file__), 'no-dataset.json'))
+os.environ.setdefault('FORECAST_VAULT_PATH', os.path.join(os.path.dirname(__file__), 'no-vault.pkl'))
+os.environ.setdefault('FORECAST_TABLE_PATH', os.path.join(os.path.dirname(__file__), 'no-table'))
+
+import app as server  # noqa: E402
+
+N_FEATURES = 25
+
+
+@pytest.fixture
+def client(monkeypatch):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(100, N_FEATURES))
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, (X[:, 0] > 0).astype(int))
+    monkeypatch.setitem(server.model_store.models, 'rf', model)
+    return server.app.test_client()
+
+
+def test_scores_a_valid_row(client):
+    res = client.post('/predict', json={'model': 'rf', 'features': [0.5] * N_FEATURES})
+    assert res.status_code == 200
+    assert len(res.get_json()['results']) == 1
+
+
+@pytest.mark.parametrize('model', ['nope', 3, None, ['rf']])
+def test_unknown_model_is_a_bad_request(client, model):
+    res = client.post('/predict', json={'model': model, 'features': [0.5] * N_FEATURES})
+    assert res.status_code == 400
+    assert 'model must be one of' in res.get_json()['error']
+
+
+def test_unknown_model_in_list_is_a_bad_request(client):
+    res = client.post('/predict', json={'models': ['rf', 'nope'], 'features': [0.5] * N_FEATURES})
+    assert res.status_code == 400
+
+
+@pytest.mark.parametrize('features', [
+    [0.5] * (N_FEATURES - 1),
+    [0.5] * (N_FEATURES + 1),
+    [[0.5] * N_FEATURES, [0.5] * (N_FEATURES - 1)],
+    {'a': 1.0, 'b': 2.0},
+    [[[0.5] * N_FEATURES]],
+    [],
+])
+def test_wrong_feature_width_is_a_bad_request(client, features):
+    res = client.post('/predict', json={'model': 'rf', 'features': features})
+    assert res.status_code == 400
+    assert res.get_json()['error'].startswith('invalid features')
+
+
+@pytest.mark.parametrize('body', ['[1, 2]', '[[0.5, 0.5]]', '"rf"', '3', 'null'])
+def test_non_object_body_is_a_bad_request(client, body):
+    res = client.post('/predict', data=body, content_type='application/json')
+    assert res.status_code == 400
+    assert '"features"' in res.get_json()['error']
+
+
+def test_forecast_non_object_body_is_a_bad_request(client):
+    res = client.post('/forecast', json=['Mumbai', 'Jio'])
+    assert res.status_code == 400
+
+
+def test_batch_of_full_rows_is_scored(client):
+    res = client.post('/predict', json={'model': 'rf', 'features': [[0.1] * N_FEATURES] * 3})
+    assert res.status_code == 200
+    assert len(res.get_json()['results']) == 3
+
+
+def test_stage_metrics_split_inference_from_labelling(client):
+    # a row no other test sends, so it is scored rather than served from the cache
+    client.post('/predict', json={'model': 'rf', 'features': [0.123] * N_FEATURES})
+    lines = [l for l in client.get('/metrics').get_data(as_text=True).splitlines()
+             if l.startswith('churn_stage_seconds_count') and 'model="rf"' in l]
+    assert any('stage="predict_proba"' in l for l in lines)
+    assert any('stage="label"' in l for l in lines)
+
+
+def test_ready_turns_200_once_the_preload_finishes(tmp_path, monkeypatch):
+    import pickle
+    from model_store import ModelStore
+
+    (tmp_path / 'rf.pkl').write_bytes(pickle.dumps({'model': 'rf'}))
+    store = ModelStore({'rf': 'rf.pkl'}, str(tmp_path))
+    monkeypatch.setattr(server, 'model_store', store)
+    client = server.app.test_client()
+
+    res = client.get('/ready')
+    assert res.status_code == 503 and res.get_json()['models']['rf']['state'] == 'pending'
+    store.preload()
+    assert store.wait(timeout=30)
+    res = client.get('/ready')
+    assert res.status_code == 200 and res.get_json()['models']['rf']['state'] == 'ready'
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from bootstrap import band_label, bootstrap_bands, bootstrap_paths, key_seed, parse_quantiles, path_quantiles
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(5)
+    return -90 + np.cumsum(rng.normal(0, 0.2, 60)), rng.normal(0, 2, 150)
+
+
+def test_same_seed_gives_the_same_sample_and_bands(series):
+    trend, resid = series
+    seed = key_seed(0, 'City0000_Airtel')
+    one = bootstrap_bands(trend, resid, n_paths=200, seed=seed)
+    two = bootstrap_bands(trend, resid, n_paths=200, seed=seed)
+    np.testing.assert_array_equal(one['sample'], two['sample'])
+    np.testing.assert_array_equal(one['bands'], two['bands'])
+
+    other = bootstrap_bands(trend, resid, n_paths=200, seed=key_seed(0, 'City0000_Jio'))
+    assert not np.array_equal(one['sample'], other['sample'])
+
+
+def test_shorter_horizon_is_a_prefix_of_a_longer_one(series):
+    trend, resid = series
+    long = bootstrap_bands(trend, resid, n_paths=200, seed=3)
+    short = bootstrap_bands(trend[:30], resid, n_paths=200, seed=3)
+    np.testing.assert_array_equal(short['sample'], long['sample'][:30])
+    np.testing.assert_array_equal(short['bands'], long['bands'][:, :30])
+
+
+def test_unequal_residual_lengths_match_a_per_key_loop():
+    trends = np.arange(3 * 20, dtype=float).reshape(3, 20)
+    # disjoint value ranges, so a draw from another key's slice would show up
+    residuals = [1000 * (k + 1) + np.arange(n, dtype=float) for k, n in enumerate((7, 40, 1))]
+    paths = bootstrap_paths(trends, residuals, 50, np.random.default_rng(11))
+    assert paths.shape == (3, 50, 20)
+
+    lengths = np.array([len(r) for r in residuals])
+    draws = np.random.default_rng(11).integers(0, lengths[:, None, None], size=(3, 20, 50))
+    for k, (trend, resid) in enumerate(zip(trends, residuals)):
+        np.testing.assert_array_equal(paths[k], trend + resid[draws[k]].T)
+        noise = paths[k] - trend
+        assert noise.min() >= resid.min() and noise.max() <= resid.max()
+
+
+def test_single_key_matches_its_row_of_a_batch(series):
+    trend, resid = series
+    one = bootstrap_paths(trend, resid, 30, np.random.default_rng(2))
+    batch = bootstrap_paths(trend[None, :], [resid], 30, np.random.default_rng(2))
+    np.testing.assert_array_equal(one, batch[0])
+
+
+def test_path_quantiles_match_numpy():
+    paths = np.random.default_rng(4).normal(size=(2, 101, 15))
+    qs = (0.05, 0.5, 0.975)
+    np.testing.assert_allclose(path_quantiles(paths, qs), np.moveaxis(np.quantile(paths, qs, axis=-2), 0, -2))
+
+
+def test_empty_residuals_are_rejected():
+    with pytest.raises(ValueError):
+        bootstrap_paths(np.zeros((2, 5)), [np.ones(3), []], 10, np.random.default_rng(0))
+
+
+def test_quantile_labels_and_parsing():
+    assert [band_label(q) for q in (0.05, 0.5, 0.975)] == ['p5', 'p50', 'p97.5']
+    assert parse_quantiles('0.95, 0.05,0.5') == (0.05, 0.5, 0.95)
+    with pytest.raises(ValueError):
+        parse_quantiles('0.5,1.5')
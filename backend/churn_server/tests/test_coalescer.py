@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from coalescer import MicroBatcher
+
+CALLERS = 16
+
+
+def submit_all(batcher, rows_per_caller=(1, 2, 3)):
+    barrier = threading.Barrier(CALLERS)
+
+    def call(i):
+        # each caller's rows carry its own id, so a wrong slice is visible
+        X = np.full((rows_per_caller[i % len(rows_per_caller)], 4), float(i))
+        barrier.wait()
+        return X, batcher.submit('rf', X)
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        return list(pool.map(call, range(CALLERS)))
+
+
+def score(key, X):
+    return X.sum(axis=1), X[:, :2] * 2
+
+
+def test_each_caller_gets_its_own_rows_back():
+    batcher = MicroBatcher(score, window_ms=50, max_batch=1024)
+    for X, (raw, proba) in submit_all(batcher):
+        np.testing.assert_array_equal(raw, X.sum(axis=1))
+        np.testing.assert_array_equal(proba, X[:, :2] * 2)
+
+    stats = batcher.stats()
+    assert stats['rows'] == sum((1, 2, 3)[i % 3] for i in range(CALLERS))
+    assert 1 <= stats['batches'] < CALLERS
+
+
+def test_max_batch_splits_the_queue():
+    seen = []
+    batcher = MicroBatcher(lambda key, X: seen.append(len(X)) or score(key, X), window_ms=50, max_batch=4)
+    for X, (raw, _) in submit_all(batcher, rows_per_caller=(1,)):
+        np.testing.assert_array_equal(raw, X.sum(axis=1))
+    assert sum(seen) == CALLERS and max(seen) <= 4
+
+
+def test_score_errors_reach_every_waiting_caller():
+    calls = []
+
+    def fail(key, X):
+        calls.append(len(X))
+        raise RuntimeError('model exploded')
+
+    batcher = MicroBatcher(fail, window_ms=50, max_batch=1024)
+    barrier = threading.Barrier(CALLERS)
+
+    def call(i):
+        barrier.wait()
+        with pytest.raises(RuntimeError, match='model exploded'):
+            batcher.submit('rf', np.full((1, 4), float(i)))
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        list(pool.map(call, range(CALLERS)))
+    assert sum(calls) == CALLERS and len(calls) < CALLERS
+    assert batcher.stats()['batches'] == 0
+
+    # the worker survives a failed batch
+    batcher.score_fn = score
+    raw, _ = batcher.submit('rf', np.ones((2, 4)))
+    np.testing.assert_array_equal(raw, [4.0, 4.0])
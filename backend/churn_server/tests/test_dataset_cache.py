@@ -0,0 +1,108 @@
+import os
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+
+from dataset_cache import load_dataset
+from run_predictions import build_matrix, build_matrix_columnar, score_matrix, score_rowwise
+
+KEYS = ['a', 'b', 'c']
+RECORDS = [
+    {'a': 1, 'b': 2.5, 'c': 'x'},
+    {'a': None, 'b': 1.0, 'c': 'y'},     # present null -> NaN
+    {'b': 3.0, 'c': 'x'},                # absent -> 0
+    {'a': '1.5', 'b': 0.5, 'c': None},   # numeric string
+    {'a': 'bad', 'b': 2.0, 'c': 'y'},    # not a number -> invalid row
+    {'a': 4, 'b': None},
+]
+
+
+def write_json(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = str(tmp_path / 'dataset.json')
+    write_json(path, RECORDS)
+    return path, load_dataset(path, str(tmp_path / 'cache'))
+
+
+def test_records_round_trip_nulls_and_absent_keys(dataset):
+    _, ds = dataset
+    assert ds.records() == RECORDS
+
+
+def test_missing_is_absent_only(dataset):
+    _, ds = dataset
+    assert ds.missing('a').tolist() == [False, False, True, False, False, False]
+    assert ds.nulls('a').tolist() == [False, True, False, False, False, False]
+    assert ds.missing('c').tolist() == [False, False, False, False, False, True]
+    assert ds.nulls('c').tolist() == [False, False, False, True, False, False]
+
+
+def test_columnar_matrix_matches_raw_records(dataset):
+    _, ds = dataset
+    X, valid = build_matrix(RECORDS, ['a', 'b'])
+    Xc, valid_c = build_matrix_columnar(ds, ['a', 'b'])
+    assert valid.tolist() == valid_c.tolist() == [True, True, True, True, False, True]
+    np.testing.assert_array_equal(X[valid], Xc[valid_c])
+    assert np.isnan(Xc[1, 0]) and Xc[2, 0] == 0 and Xc[3, 0] == 1.5
+
+
+def fitted_models():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 2))
+    X[rng.random(200) < 0.1, 0] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + X[:, 1] > 0).astype(int)
+    return {
+        'rf': RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y),
+        'xgb': XGBClassifier(n_estimators=5, max_depth=2).fit(X, y),
+    }
+
+
+@pytest.mark.parametrize('mode', ['rowwise', 'vectorized'])
+def test_cached_and_uncached_scoring_agree(dataset, mode):
+    _, ds = dataset
+    models = fitted_models()
+    keys = ['a', 'b']
+
+    def run(source):
+        rows, summaries = [], {k: Counter() for k in models}
+        if mode == 'rowwise':
+            score_rowwise(source if source is RECORDS else ds.records(), keys, models, rows, summaries)
+        else:
+            X, valid = build_matrix(RECORDS, keys) if source is RECORDS else build_matrix_columnar(ds, keys)
+            score_matrix(X, valid, models, rows, summaries)
+        return rows, summaries
+
+    assert run(RECORDS) == run(ds)
+
+
+def test_cache_rebuilt_when_content_changes(tmp_path):
+    path, cache = str(tmp_path / 'dataset.json'), str(tmp_path / 'cache')
+    write_json(path, RECORDS)
+    assert len(load_dataset(path, cache)) == len(RECORDS)
+
+    write_json(path, RECORDS[:2])
+    assert load_dataset(path, cache).records() == RECORDS[:2]
+
+
+def test_cache_reused_when_only_mtime_moves(tmp_path, monkeypatch):
+    path, cache = str(tmp_path / 'dataset.json'), str(tmp_path / 'cache')
+    write_json(path, RECORDS)
+    load_dataset(path, cache)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    import dataset_cache
+    monkeypatch.setattr(dataset_cache, 'build_cache', lambda *a: pytest.fail('cache rebuilt'))
+    ds = load_dataset(path, cache)
+    assert ds.records() == RECORDS
+    with open(os.path.join(cache, 'meta.json'), encoding='utf-8') as f:
+        assert json.load(f)['mtime_ns'] == st.st_mtime_ns + 10**9
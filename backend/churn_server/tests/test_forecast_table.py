@@ -0,0 +1,81 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import forecast_table as ft
+from forecast_table import CURRENT_FILE, ForecastTable, write_table
+
+
+def forecasts(level, keys=('A_Jio', 'B_Airtel'), days=5):
+    dates = pd.date_range('2024-05-01', periods=days, freq='D')
+    out = {}
+    for i, key in enumerate(keys):
+        base = np.full(days, level + i, dtype=float)
+        out[key] = (pd.Timestamp('2024-04-30'), {
+            'dates': dates,
+            'predicted_signal_dbm': base, 'trend': base, 'lower': base - 1, 'upper': base + 1,
+            'bands': {'p5': base - 2, 'p95': base + 2},
+        })
+    return out
+
+
+def versions(directory):
+    return sorted(e for e in os.listdir(directory) if e.startswith(ft.VERSION_PREFIX))
+
+
+def test_publish_swaps_the_pointer_and_removes_the_old_version(tmp_path):
+    directory = str(tmp_path / 'table')
+    write_table(forecasts(-80), directory)
+    first = versions(directory)
+    table = ForecastTable(directory)
+    assert table.get('A_Jio', 3)['trend'] == [-80.0] * 3
+
+    write_table(forecasts(-70), directory)
+    second = versions(directory)
+    assert len(first) == len(second) == 1 and first != second
+    with open(os.path.join(directory, CURRENT_FILE)) as f:
+        assert f.read() == second[0]
+
+    assert table.refresh() is True
+    assert table.get('B_Airtel', 5)['trend'] == [-69.0] * 5
+    assert table.refresh() is False
+
+
+def test_a_complete_table_is_readable_at_every_step_of_a_publish(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'table')
+    write_table(forecasts(-80), directory)
+    seen = []
+    real_replace = os.replace
+
+    def checked_replace(src, dst):
+        # just before the pointer moves, readers still get the old table
+        seen.append(ForecastTable(directory).get('A_Jio', 2)['trend'])
+        real_replace(src, dst)
+        seen.append(ForecastTable(directory).get('A_Jio', 2)['trend'])
+
+    monkeypatch.setattr(ft.os, 'replace', checked_replace)
+    write_table(forecasts(-60), directory)
+    assert seen == [[-80.0, -80.0], [-60.0, -60.0]]
+
+
+def test_legacy_table_is_read_and_then_replaced(tmp_path):
+    directory = tmp_path / 'table'
+    directory.mkdir()
+    np.save(directory / 'c00.npy', np.array([-90, -91], dtype=np.float32))
+    meta = {'version': ft.TABLE_VERSION, 'rows': 2, 'columns': {'trend': 'c00.npy'}, 'bands': [],
+            'index': {'A_Jio': {'offset': 0, 'length': 2, 'start': '2024-05-01', 'last_date': '2024-04-30'}}}
+    (directory / ft.META_FILE).write_text(json.dumps(meta))
+    rows = ForecastTable(str(directory))._table[1]['trend']
+    assert rows.tolist() == [-90.0, -91.0]
+
+    write_table(forecasts(-50), str(directory))
+    assert sorted(os.listdir(directory)) == sorted([CURRENT_FILE] + versions(str(directory)))
+    assert ForecastTable(str(directory)).get('A_Jio', 1)['trend'] == [-50.0]
+
+
+def test_missing_table_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ForecastTable(str(tmp_path / 'nothing'))
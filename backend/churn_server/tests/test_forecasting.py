@@ -0,0 +1,231 @@
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import forecasting
+from forecasting import (CompactSARIMAX, compact_entry, fit_sarimax, forecast_entry, future_exog,
+                         incremental_update, load_vault, make_entry, partition_daily, sarimax_model)
+from synthetic_towers import generate_towers
+
+warnings.filterwarnings('ignore')
+
+
+@pytest.fixture(scope='module')
+def daily():
+    df = generate_towers(towers=3, days=120, seed=1)
+    df['date'] = pd.to_datetime(df['date'])
+    daily_by_key, _ = partition_daily(df)
+    return next(iter(daily_by_key.values()))
+
+
+@pytest.fixture(scope='module')
+def entry(daily):
+    return make_entry(fit_sarimax(daily), daily)
+
+
+def test_compact_forecast_matches_full_results(entry):
+    compact = compact_entry(entry)
+    assert isinstance(compact['model_results'], CompactSARIMAX)
+
+    exog = future_exog(entry['last_date'], 60)
+    full = entry['model_results'].get_forecast(steps=60, exog=exog)
+    small = compact['model_results'].get_forecast(steps=60, exog=exog)
+    np.testing.assert_allclose(small.predicted_mean.values, full.predicted_mean.values, rtol=1e-8, atol=1e-8)
+    np.testing.assert_allclose(small.conf_int().values, full.conf_int().values, rtol=1e-8, atol=1e-8)
+
+
+def test_compact_entry_serves_the_same_forecast(entry):
+    key = 'City0000_Airtel'
+    assert forecast_entry(compact_entry(entry), 30, key) == forecast_entry(entry, 30, key)
+
+
+def test_compact_filter_cache_is_reused_and_not_pickled(entry):
+    import pickle
+
+    model = compact_entry(entry)['model_results']
+    exog = future_exog(entry['last_date'], 30)
+    first = model.get_forecast(steps=30, exog=exog).predicted_mean.values
+    assert len(model._filtered) == 1
+    again = model.get_forecast(steps=30, exog=exog.copy()).predicted_mean.values
+    assert len(model._filtered) == 1
+    np.testing.assert_array_equal(first, again)
+
+    restored = pickle.loads(pickle.dumps(model))
+    assert not hasattr(restored, '_filtered') and not hasattr(restored, '_filtered_lock')
+    np.testing.assert_array_equal(restored.get_forecast(steps=30, exog=exog).predicted_mean.values, first)
+
+
+
+def test_compact_filter_cache_is_safe_across_threads(entry):
+    from concurrent.futures import ThreadPoolExecutor
+
+    model = compact_entry(entry)['model_results']
+    last = entry['last_date']
+    # more horizons than cache slots, so threads keep evicting each other's entries
+    horizons = [5 + i % (forecasting.COMPACT_FILTER_CACHE * 3) for i in range(96)]
+    want = {h: entry['model_results'].get_forecast(steps=h, exog=future_exog(last, h)).predicted_mean.values
+            for h in set(horizons)}
+
+    def run(h):
+        return h, model.get_forecast(steps=h, exog=future_exog(last, h)).predicted_mean.values
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for h, got in pool.map(run, horizons):
+            np.testing.assert_allclose(got, want[h], rtol=1e-8, atol=1e-8)
+    assert len(model._filtered) <= forecasting.COMPACT_FILTER_CACHE
+
+# =========================
+# Incremental updates
+# =========================
+@pytest.fixture(scope='module')
+def towers():
+    # no missing days: the incremental path leaves gaps to the Kalman filter,
+    # a full partition interpolates them, and only gap-free data is comparable
+    df = generate_towers(towers=3, days=150, missing=0, seed=2)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def write_vault(tmp_path, towers, cutoff, compact):
+    csv = tmp_path / 'towers.csv'
+    old = towers[towers['date'] <= cutoff]
+    old.to_csv(csv, index=False)
+    daily_by_key, _ = partition_daily(old)
+    vault = {}
+    for (city, operator), daily in daily_by_key.items():
+        entry = make_entry(fit_sarimax(daily), daily)
+        vault[f"{city}_{operator}"] = compact_entry(entry) if compact else entry
+    path = str(tmp_path / 'vault.pkl')
+    joblib.dump(vault, path)
+    towers.to_csv(csv, index=False)  # the new days arrive
+    return str(csv), path, vault
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_incremental_update_equals_filtering_the_full_history(tmp_path, towers, compact):
+    cutoff = towers['date'].min() + pd.Timedelta(days=119)
+    csv, path, before = write_vault(tmp_path, towers, cutoff, compact)
+
+    changed, report = incremental_update(csv, path, drift_threshold=0, refit_after_days=0)
+    assert sorted(changed) == sorted(before)
+    assert all(r['new_days'] == 30 and r['refit'] is None for r in report.values())
+
+    full_daily, _ = partition_daily(towers)
+    after = load_vault(path)
+    for (city, operator), daily in full_daily.items():
+        key = f"{city}_{operator}"
+        entry = after[key]
+        assert entry['last_date'] == daily.index[-1]
+        refiltered = sarimax_model(daily).filter(before[key]['model_results'].params)
+        exog = future_exog(daily.index[-1], 30)
+        want = refiltered.get_forecast(steps=30, exog=exog)
+        got = entry['model_results'].get_forecast(steps=30, exog=exog)
+        np.testing.assert_allclose(got.predicted_mean.values, want.predicted_mean.values, rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(got.conf_int().values, want.conf_int().values, rtol=1e-6, atol=1e-6)
+
+
+def test_compact_refits_read_the_csv_once(tmp_path, towers, monkeypatch):
+    cutoff = towers['date'].min() + pd.Timedelta(days=139)
+    csv, path, before = write_vault(tmp_path, towers, cutoff, compact=True)
+    calls = []
+    real = forecasting.load_partitions
+    monkeypatch.setattr(forecasting, 'load_partitions', lambda p: calls.append(p) or real(p))
+
+    changed, report = incremental_update(csv, path, drift_threshold=0, refit_after_days=1)
+    assert len(before) > 1 and all(r['refit'] == 'schedule' and r['error'] is None for r in report.values())
+    assert all(isinstance(e['model_results'], CompactSARIMAX) for e in changed.values())
+    assert calls == [csv]
+
+
+# =========================
+# Training
+# =========================
+def test_sequential_and_parallel_training_fit_the_same_vault(tmp_path, towers):
+    csv = str(tmp_path / 'towers.csv')
+    towers.to_csv(csv, index=False)
+    one, one_report = forecasting.train_vault(csv, workers=1)
+    two, two_report = forecasting.train_vault(csv, workers=2)
+    assert list(one) == list(two) and len(one) == 4
+    assert {k: r['iterations'] for k, r in one_report.items()} == {k: r['iterations'] for k, r in two_report.items()}
+    for key in one:
+        np.testing.assert_array_equal(one[key]['model_results'].params, two[key]['model_results'].params)
+
+
+
+def test_fit_model_warm_starts_from_previous_params(daily, entry):
+    results, info = forecasting.fit_model(sarimax_model(daily), entry['model_results'].params)
+    assert info['start'] == 'warm' and info['converged']
+    np.testing.assert_allclose(results.params, entry['model_results'].params, rtol=1e-3, atol=1e-3)
+
+    _, cold = forecasting.fit_model(sarimax_model(daily))
+    assert cold['start'] == 'cold'
+
+
+@pytest.mark.parametrize('bad', ['short', 'nan', 'inf'])
+def test_fit_model_falls_back_on_unusable_start_params(daily, entry, bad):
+    params = np.array(entry['model_results'].params, dtype=float)
+    if bad == 'short':
+        params = params[:-1]
+    else:
+        params[0] = np.nan if bad == 'nan' else np.inf
+    results, info = forecasting.fit_model(sarimax_model(daily), params)
+    assert info['start'] == 'fallback'
+    np.testing.assert_array_equal(results.params, fit_sarimax(daily).params)
+
+# =========================
+# Hierarchical models
+# =========================
+@pytest.fixture(scope='module')
+def hierarchy():
+    df = generate_towers(towers=6, cities=3, operators=('Airtel', 'Jio'), days=120, missing=0, seed=3)
+    # a city with only a handful of recent Airtel readings, below MIN_ROWS
+    sparse = df[(df['city'] == 'City0000') & (df['operator'] == 'Airtel')].tail(forecasting.MIN_ROWS // 2).copy()
+    sparse['city'] = 'Sparse'
+    df = pd.concat([df, sparse], ignore_index=True)
+    df['date'] = pd.to_datetime(df['date'])
+    vault, report = forecasting.train_hierarchical(df, workers=1)
+    return df, vault, report
+
+
+def test_reconciled_offsets_have_zero_weighted_mean():
+    offsets = forecasting.reconcile_offsets([1.0, -3.0, 4.0], [10, 30, 0])
+    assert abs(np.dot([10, 30, 0], offsets)) < 1e-12
+    np.testing.assert_allclose(np.diff(offsets), [-4.0, 7.0])
+
+
+def test_weighted_city_forecasts_equal_the_parent(hierarchy):
+    _, vault, report = hierarchy
+    assert report['parents'] == 2 and report['cities'] == 7
+    for operator in ('Airtel', 'Jio'):
+        models = [e['model_results'] for k, e in vault.items() if k.endswith(f"_{operator}")]
+        assert all(isinstance(m, forecasting.OffsetSARIMAX) and m.parent_key == operator for m in models)
+        assert abs(sum(m.weight for m in models) - 1) < 1e-9
+
+        exog = future_exog(vault[f"City0000_{operator}"]['last_date'], 30)
+        parent = models[0].parent.get_forecast(steps=30, exog=exog).predicted_mean.values
+        weighted = sum(m.weight * m.get_forecast(steps=30, exog=exog).predicted_mean.values for m in models)
+        np.testing.assert_allclose(weighted, parent, rtol=1e-9, atol=1e-9)
+
+
+def test_city_below_min_rows_gets_a_forecast(hierarchy):
+    df, vault, report = hierarchy
+    assert (df['city'] == 'Sparse').sum() < forecasting.MIN_ROWS
+    assert report['sparse_cities'] == 1 and 'Sparse_Airtel' in vault and 'Sparse_Jio' not in vault
+    entry = vault['Sparse_Airtel']
+    assert len(entry['historical_residuals']) >= forecasting.MIN_ROWS  # the parent's, not its own few
+    assert len(forecast_entry(entry, 14, 'Sparse_Airtel')['predicted_signal_dbm']) == 14
+
+
+def test_hierarchical_refit_warm_starts_from_the_vault(hierarchy):
+    df, vault, _ = hierarchy
+    start_params = forecasting.vault_start_params(vault)
+    assert sorted(start_params) == ['Airtel', 'Jio']
+
+    again, report = forecasting.train_hierarchical(df, workers=1, start_params=start_params)
+    assert {k: r['start'] for k, r in report['fits'].items()} == {'Airtel': 'warm', 'Jio': 'warm'}
+    assert list(again) == list(vault)
+    for key, params in start_params.items():
+        np.testing.assert_allclose(again[f"City0000_{key}"]['model_results'].params, params, rtol=1e-3, atol=1e-3)
@@ -0,0 +1,58 @@
+import io
+import json
+
+import pytest
+
+from dataset_cache import iter_json_array, iter_records
+
+RECORDS = [
+    {'a': 1, 'b': -2.5e-3, 'c': 'x, y ] {'},
+    {'a': None, 'nested': {'k': [1, 2, {'z': '}'}]}, 'c': 'café \\"q\\"'},
+    {},
+    {'a': 12345678901234567890, 'b': True, 'c': False},
+    [1, 2, 3],
+    'plain string',
+    7,
+]
+
+
+def texts():
+    compact = json.dumps(RECORDS, separators=(',', ':'))
+    spaced = json.dumps(RECORDS, indent=2)
+    return [compact, spaced, '  \n' + spaced + '\n  ', json.dumps(RECORDS, ensure_ascii=False)]
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 5, 7, 16, 64, 1 << 16])
+def test_every_block_size_yields_the_same_records(read_size):
+    for text in texts():
+        assert list(iter_json_array(io.StringIO(text), read_size=read_size)) == RECORDS
+
+
+@pytest.mark.parametrize('text', ['[]', ' [ ] ', '[\n]'])
+def test_empty_array(text):
+    assert list(iter_json_array(io.StringIO(text), read_size=1)) == []
+
+
+def test_trailing_number_split_across_blocks():
+    # "12" cut after "1" must not be yielded as 1
+    assert list(iter_json_array(io.StringIO('[1, 12]'), read_size=5)) == [1, 12]
+    assert list(iter_json_array(io.StringIO('[3.25e2]'), read_size=3)) == [325.0]
+
+
+@pytest.mark.parametrize('text, message', [
+    ('{"a": 1}', 'not a list'),
+    ('[{"a": 1} {"a": 2}]', 'expected'),
+    ('[{"a": 1},', 'unexpected end'),
+    ('[{"a": 1', 'malformed'),
+])
+def test_malformed_input_raises(text, message):
+    for read_size in (1, 4, 1 << 16):
+        with pytest.raises(ValueError, match=message):
+            list(iter_json_array(io.StringIO(text), read_size=read_size))
+
+
+def test_iter_records_sniffs_ndjson_and_arrays():
+    records = [r for r in RECORDS if isinstance(r, dict)]
+    ndjson = '\n'.join(json.dumps(r) for r in records) + '\n\n'
+    assert list(iter_records(io.StringIO(ndjson))) == records
+    assert list(iter_records(io.StringIO('\n  ' + json.dumps(records)))) == records
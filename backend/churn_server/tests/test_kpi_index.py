@@ -0,0 +1,134 @@
+import os
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from kpi_index import KPIIndex
+
+DATA_PROCESSOR_JS = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'js', 'data-processor.js')
+
+# runs the dashboard's own DataProcessor over the same records and filters
+NODE_DRIVER = r"""
+const fs = require('fs');
+const src = fs.readFileSync(process.argv[1], 'utf8');
+const DataProcessor = new Function(src + '\nreturn DataProcessor;')();
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const out = input.queries.map(q => {
+    const dp = new DataProcessor();
+    dp.rawData = input.records;
+    Object.assign(dp.filters, q.filters);
+    dp.applyFilters();
+    return {
+        kpis: dp.calculateKPIs(q.metric),
+        count: dp.filteredData.length,
+        cities: dp.getCitiesForState(dp.filters.state),
+        areas: dp.getAreasForCity(dp.filters.city),
+        pincodes: dp.getPincodesForArea(dp.filters.area).map(String),
+    };
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+PLACES = {
+    'Karnataka': {'Bengaluru': {'Indiranagar': [560038], 'Whitefield': [560066, 560067]},
+                  'Mysuru': {'Gokulam': [570002]}},
+    'Maharashtra': {'Pune': {'Baner': [411045], 'Kothrud': [411038]}},
+}
+OPERATORS = ['Jio', 'Airtel', 'VI', 'BSNL', None]
+
+
+def noisy(rng, value):
+    # values as they turn up in dataset.json: numbers, strings, nulls, junk
+    roll = rng.random()
+    if roll < 0.05:
+        return None
+    if roll < 0.10:
+        return f"{value:.3f}"
+    if roll < 0.12:
+        return f" {value:.1f}ms"  # parseFloat keeps the leading number
+    if roll < 0.14:
+        return 'n/a'
+    return value
+
+
+def make_records(n=600, seed=3):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        state = rng.choice(sorted(PLACES))
+        city = rng.choice(sorted(PLACES[state]))
+        area = rng.choice(sorted(PLACES[state][city]))
+        record = {
+            'state': state, 'city': city, 'area': area,
+            'pincode': rng.choice(PLACES[state][city][area]),
+            'operator': rng.choice(OPERATORS),
+            'network_type': rng.choice(['4G', '5G']),
+            'download_mbps': noisy(rng, rng.uniform(1, 200)),
+            'upload_mbps': noisy(rng, rng.uniform(1, 50)),
+            'latency_ms': noisy(rng, rng.uniform(10, 120)),
+            'confidence_score': noisy(rng, rng.random()),
+        }
+        if record['operator'] is None:
+            del record['operator']
+        records.append(record)
+    return records
+
+
+def queries():
+    out = [{'filters': {}, 'metric': m} for m in ('score', 'download', 'upload', 'latency')]
+    for state, cities in PLACES.items():
+        out.append({'filters': {'state': state}, 'metric': 'score'})
+        for city, areas in cities.items():
+            out.append({'filters': {'state': state, 'city': city}, 'metric': 'latency'})
+            for area, pincodes in areas.items():
+                out.append({'filters': {'state': state, 'city': city, 'area': area}, 'metric': 'download'})
+                out.append({'filters': {'state': state, 'city': city, 'area': area,
+                                        'pincode': str(pincodes[0]), 'network': '5G'}, 'metric': 'upload'})
+    out.append({'filters': {'operator': 'Jio', 'network': '4G'}, 'metric': 'score'})
+    # no rows; the dashboard never builds dropdowns for it (picking a state resets the city)
+    out.append({'filters': {'state': 'Karnataka', 'city': 'Pune'}, 'metric': 'score', 'kpis_only': True})
+    return out
+
+
+def run_js(records, qs):
+    proc = subprocess.run(['node', '-e', NODE_DRIVER, os.path.abspath(DATA_PROCESSOR_JS)],
+                          input=json.dumps({'records': records, 'queries': qs}),
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def test_kpis_and_options_match_the_dashboard():
+    records = make_records()
+    qs = queries()
+    index = KPIIndex(records)
+    for q, js in zip(qs, run_js(records, qs)):
+        got = index.kpis(q['filters'], q['metric'])
+        want = js['kpis']
+        assert got['count'] == js['count'], q
+        assert got['bestOperator'] == want['bestOperator'], q
+        for name in ('avgDownload', 'avgUpload', 'avgScore'):
+            assert abs(got[name] - float(want[name])) <= 0.0100001, (q, name)
+        assert abs(got['avgLatency'] - float(want['avgLatency'])) <= 1, q
+
+        if q.get('kpis_only'):
+            continue
+        options = index.options(q['filters'])
+        filters = q['filters']
+        assert options['pincodes'] == js['pincodes'], q
+        # the dashboard only asks for a level once the level above is chosen
+        # (or for everything when nothing is)
+        if 'city' not in filters or 'state' in filters:
+            assert options['cities'] == js['cities'], q
+        if 'city' in filters or 'state' not in filters:
+            assert options['areas'] == js['areas'], q
+
+
+def test_empty_selection():
+    index = KPIIndex(make_records(50))
+    out = index.kpis({'state': 'Nowhere'})
+    assert out['count'] == 0 and out['bestOperator'] == 'N/A'
@@ -0,0 +1,58 @@
+import glob
+import hashlib
+import pickle
+
+import pytest
+
+from model_store import ChecksumMismatch, ModelStore, fetch_artifact
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    body = pickle.dumps({'weights': list(range(1000))})
+    src = tmp_path / 'src' / 'model.pkl'
+    src.parent.mkdir()
+    src.write_bytes(body)
+    return src, body, hashlib.sha256(body).hexdigest()
+
+
+@pytest.mark.parametrize('as_url', [True, False])
+def test_fetch_from_a_file_url_or_a_plain_path(tmp_path, artifact, as_url):
+    src, body, digest = artifact
+    dest = tmp_path / 'models' / 'model.pkl'
+    source = src.as_uri() if as_url else str(src)
+    assert fetch_artifact(source, str(dest), digest) == str(dest)
+    assert dest.read_bytes() == body
+    assert not glob.glob(f"{dest}.part-*")
+
+
+def test_checksum_mismatch_keeps_the_old_file_and_no_partial(tmp_path, artifact):
+    src, body, _ = artifact
+    dest = tmp_path / 'model.pkl'
+    dest.write_bytes(b'old model')
+    with pytest.raises(ChecksumMismatch):
+        fetch_artifact(str(src), str(dest), '0' * 64)
+    assert dest.read_bytes() == b'old model'
+    assert not glob.glob(f"{dest}.part-*")
+
+
+def test_matching_file_is_not_fetched_again(tmp_path, artifact):
+    src, body, digest = artifact
+    dest = tmp_path / 'model.pkl'
+    dest.write_bytes(body)
+    assert fetch_artifact(str(tmp_path / 'missing.pkl'), str(dest), digest) == str(dest)
+    with pytest.raises(FileNotFoundError):
+        fetch_artifact(None, str(tmp_path / 'absent.pkl'))
+
+
+def test_store_loads_from_sources_and_records_errors(tmp_path, artifact):
+    src, body, digest = artifact
+    store = ModelStore({'good': 'good.pkl', 'bad': 'bad.pkl'}, str(tmp_path / 'models'),
+                       sources={'good': src.as_uri(), 'bad': src.as_uri()},
+                       checksums={'good': digest, 'bad': '0' * 64})
+    store.preload()
+    assert not store.wait(timeout=30)
+    status = store.status()
+    assert status['good']['state'] == 'ready' and status['good']['version'] == 1
+    assert status['bad']['state'] == 'error' and 'ChecksumMismatch' in status['bad']['error']
+    assert store.get('good') == pickle.loads(body)
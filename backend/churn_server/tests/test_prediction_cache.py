@@ -0,0 +1,110 @@
+import pickle
+import struct
+
+import numpy as np
+import pytest
+
+import prediction_cache as pc
+from model_store import ModelStore
+from prediction_cache import PredictionCache, row_digests
+
+
+def test_equal_rows_share_a_digest():
+    ints = np.array([[1, 0, 3]])
+    floats = np.array([[1.0, -0.0, 3.0]])
+    assert row_digests(ints) == row_digests(floats)
+
+    other_nan = struct.unpack('<d', struct.pack('<Q', 0x7ff8000000000123))[0]
+    a = np.array([[np.nan, 1.0]])
+    b = np.array([[other_nan, 1.0]])
+    assert a.tobytes() != b.tobytes()
+    assert row_digests(a) == row_digests(b)
+    assert row_digests(np.array([[-np.nan, 1.0]])) == row_digests(a)
+
+
+def test_different_rows_get_different_digests():
+    X = np.array([[0.0, 1.0], [1.0, 0.0], [0.0, np.nan], [0.0, 1.0 + 1e-12]])
+    digests = row_digests(X)
+    assert len(set(digests)) == len(digests)
+
+
+def test_row_digests_does_not_modify_input():
+    X = np.array([[-0.0, np.nan]])
+    row_digests(X)
+    assert np.signbit(X[0, 0])
+
+
+def test_lru_eviction_and_hit_counts():
+    cache = PredictionCache(maxsize=2)
+    cache.put_many(['a', 'b'], [1, 2])
+    assert cache.get_many(['a']) == [1]  # 'a' is now most recent
+    cache.put_many(['c'], [3])
+    assert cache.get_many(['a', 'b', 'c']) == [1, None, 3]
+    st = cache.stats()
+    assert (st['hits'], st['misses'], st['evictions'], st['size']) == (3, 1, 1, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(pc.time, 'monotonic', lambda: now[0])
+    cache = PredictionCache(maxsize=10, ttl=5)
+    cache.put_many(['a'], [1])
+    now[0] += 4
+    assert cache.get_many(['a']) == [1]
+    now[0] += 2
+    assert cache.get_many(['a']) == [None]
+    assert cache.stats()['size'] == 0
+
+
+def test_invalidate_one_model():
+    cache = PredictionCache()
+    cache.put_many([('rf', 1, b'x'), ('xgb', 1, b'x')], ['r', 'x'])
+    cache.invalidate('rf')
+    assert cache.get_many([('rf', 1, b'x'), ('xgb', 1, b'x')]) == [None, 'x']
+
+
+class Doubler:
+    def __init__(self, factor):
+        self.factor = factor
+
+    def predict(self, X):
+        return np.asarray(X).sum(axis=1) * self.factor
+
+
+@pytest.fixture
+def store(tmp_path):
+    with open(tmp_path / 'm.pkl', 'wb') as f:
+        pickle.dump(Doubler(2), f)
+    return ModelStore({'m': 'm.pkl'}, str(tmp_path))
+
+
+def cached_predict(store, cache, X):
+    # same keying as app.score_request: the version is read before the model
+    version = store.version('m')
+    keys = [('m', version, d) for d in row_digests(X)]
+    got = cache.get_many(keys)
+    miss = [i for i, v in enumerate(got) if v is None]
+    if miss:
+        fresh = store.get('m').predict(X[miss])
+        cache.put_many([keys[i] for i in miss], list(fresh))
+        for i, v in zip(miss, fresh):
+            got[i] = v
+    return got
+
+
+def test_reload_bumps_version_and_misses_the_cache(store, tmp_path):
+    cache = PredictionCache()
+    X = np.array([[1.0, 2.0]])
+    assert store.version('m') == 0
+    store.get('m')
+    assert store.version('m') == 1
+    assert cached_predict(store, cache, X) == [6.0]
+    assert cached_predict(store, cache, X) == [6.0]
+    assert cache.stats()['hits'] == 1
+
+    with open(tmp_path / 'm.pkl', 'wb') as f:
+        pickle.dump(Doubler(10), f)
+    store.reload('m')
+    assert store.version('m') == 2
+    assert cached_predict(store, cache, X) == [30.0]
+    assert cache.stats()['hits'] == 1
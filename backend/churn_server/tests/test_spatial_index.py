@@ -0,0 +1,84 @@
+import math
+import random
+
+import pytest
+
+from spatial_index import AreaIndex
+
+
+def js_distance(lat1, lon1, lat2, lon2):
+    # LocationService.calculateDistance
+    r = 6371
+    d_lat, d_lon = math.radians(lat2 - lat1), math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2
+         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2)
+    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def js_closest(lat, lon, city_records):
+    # LocationService.findClosestArea: the closest record within 5 km
+    best, best_d = None, math.inf
+    for r in city_records:
+        if r.get('latitude') and r.get('longitude'):
+            d = js_distance(lat, lon, r['latitude'], r['longitude'])
+            if d < best_d:
+                best, best_d = r, d
+    return best if best is not None and best_d < 5 else None
+
+
+def make_records(seed=5):
+    rng = random.Random(seed)
+    records = []
+    for city, (clat, clon) in {'Guntur': (16.30, 80.44), 'Vijayawada': (16.51, 80.64)}.items():
+        for a in range(6):
+            # areas are spread out and elongated, so the centroid of one area
+            # is often farther than a record of another
+            alat, alon = clat + rng.uniform(-0.05, 0.05), clon + rng.uniform(-0.05, 0.05)
+            for _ in range(rng.randint(1, 12)):
+                records.append({
+                    'state': 'Andhra Pradesh', 'city': city, 'area': f"{city}-{a}",
+                    'pincode': 522000 + a,
+                    'latitude': round(alat + rng.uniform(-0.03, 0.03), 5),
+                    'longitude': round(alon + rng.uniform(-0.001, 0.001), 5),
+                })
+    records.append({'state': 'Andhra Pradesh', 'city': 'Guntur', 'area': 'nowhere', 'pincode': 1,
+                    'latitude': None, 'longitude': 80.4})
+    return records
+
+
+def test_nearest_matches_the_dashboard_scan():
+    records = make_records()
+    index = AreaIndex.from_records(records)
+    rng = random.Random(1)
+    compared = 0
+    for _ in range(300):
+        city = rng.choice(['Guntur', 'Vijayawada'])
+        clat, clon = (16.30, 80.44) if city == 'Guntur' else (16.51, 80.64)
+        lat, lon = clat + rng.uniform(-0.08, 0.08), clon + rng.uniform(-0.08, 0.08)
+        want = js_closest(lat, lon, [r for r in records if r['city'] == city])
+        got = index.nearest(lat, lon, k=1, radius_km=5, city=city)
+        if want is None:
+            assert got == []
+        else:
+            assert (got[0]['area'], got[0]['pincode']) == (want['area'], want['pincode'])
+            compared += 1
+    assert compared > 100
+
+
+def test_k_returns_distinct_areas_nearest_first():
+    records = make_records()
+    index = AreaIndex.from_records(records)
+    got = index.nearest(16.30, 80.44, k=4, city='Guntur')
+    areas = [g['area'] for g in got]
+    assert len(areas) == len(set(areas)) == 4
+    assert [g['distance_km'] for g in got] == sorted(g['distance_km'] for g in got)
+
+    everything = index.nearest(16.30, 80.44, k=100)
+    assert len(everything) == len({(r['city'], r['area']) for r in records if r['latitude']})
+
+
+@pytest.mark.parametrize('city', ['Atlantis', None])
+def test_empty_results(city):
+    assert AreaIndex.from_records([]).nearest(16.3, 80.4, city=city) == []
+    if city:
+        assert AreaIndex.from_records(make_records()).nearest(16.3, 80.4, city=city) == []
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from xgboost import XGBClassifier
+
+from tree_engine import ROW_BLOCK, compile_model, probe_matrix
+
+
+def training_data(n_classes=2):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 5))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 0).astype(int)
+    if n_classes > 2:
+        y = y + (X[:, 3] > 0.5)
+    return X, y
+
+
+def with_nans(X, seed=1):
+    X = np.array(X, dtype=float)
+    rng = np.random.default_rng(seed)
+    X[rng.random(X.shape) < 0.2] = np.nan
+    X[0] = np.nan  # one row with nothing at all
+    return X
+
+
+def nan_training_data():
+    X, y = training_data()
+    return with_nans(X, seed=2), y
+
+
+MODELS = {
+    'rf': lambda: RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(*training_data()),
+    'tree': lambda: DecisionTreeClassifier(max_depth=8, random_state=0).fit(*training_data()),
+    'xgb': lambda: XGBClassifier(n_estimators=20, max_depth=4).fit(*training_data()),
+    'xgb_multiclass': lambda: XGBClassifier(n_estimators=10, max_depth=3).fit(*training_data(3)),
+    # trained with NaNs, so the learned default directions actually matter
+    'xgb_nan_trained': lambda: XGBClassifier(n_estimators=20, max_depth=4).fit(*nan_training_data()),
+    'rf_nan_trained': lambda: RandomForestClassifier(n_estimators=15, max_depth=6,
+                                                     random_state=0).fit(*nan_training_data()),
+}
+
+
+@pytest.fixture(scope='module', params=sorted(MODELS))
+def model(request):
+    return MODELS[request.param]()
+
+
+def assert_same(model, engine, X):
+    np.testing.assert_allclose(engine.predict_proba(X), model.predict_proba(X), atol=1e-5)
+    np.testing.assert_array_equal(engine.predict(X), model.predict(X))
+
+
+def test_engine_matches_model_on_threshold_probes(model):
+    engine = compile_model(model)
+    assert_same(model, engine, probe_matrix(engine, n=512))
+
+
+def test_engine_matches_model_on_nan_rows(model):
+    trees = getattr(model, 'estimators_', [model])
+    if not isinstance(model, XGBClassifier) and not hasattr(trees[0].tree_, 'missing_go_to_left'):
+        pytest.skip("this sklearn version does not route NaN through trees")
+    X, _ = training_data()
+    engine = compile_model(model)
+    assert_same(model, engine, with_nans(X))
+
+
+def test_engine_matches_model_across_row_blocks():
+    model = MODELS['xgb']()
+    engine = compile_model(model)
+    X = np.tile(probe_matrix(engine, n=100), ((ROW_BLOCK // 100) + 2, 1))
+    assert X.shape[0] > ROW_BLOCK
+    assert_same(model, engine, X)
+
+
+def test_single_row_is_accepted():
+    model = MODELS['rf']()
+    engine = compile_model(model)
+    X, _ = training_data()
+    np.testing.assert_allclose(engine.predict_proba(X[3]), model.predict_proba(X[3:4]), atol=1e-5)
+
+
+def test_unsupported_model_raises_type_error():
+    from sklearn.linear_model import LogisticRegression
+    with pytest.raises(TypeError):
+        compile_model(LogisticRegression().fit(*training_data()))
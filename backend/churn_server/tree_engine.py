@@ -0,0 +1,251 @@
+import json
+
+import numpy as np
+
+ROW_BLOCK = 4096  # rows evaluated at once; bounds the (rows x trees) work arrays
+
+
+class CompiledForest:
+    """Tree ensemble flattened into contiguous NumPy node arrays.
+
+    Every tree of the model is packed into the same arrays (feature index,
+    threshold, left/right child, missing direction, leaf value) with one root
+    offset per tree. Evaluation walks all trees for all rows at once, one
+    depth level per step, so a single row costs a few array ops instead of a
+    Python-level call per tree.
+
+    Built with compile_model() from a fitted sklearn forest/tree classifier
+    or an XGBoost gbtree classifier; exposes predict / predict_proba /
+    classes_ like the original.
+    """
+
+    def __init__(self, kind, roots, feature, threshold, left, right, default_left,
+                 leaf_value, max_depth, classes, n_features, tree_class=None,
+                 base_margin=None, objective=None, missing=np.nan):
+        self.kind = kind
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.tree_class = tree_class
+        self.base_margin = base_margin
+        self.objective = objective
+        self.missing = missing
+
+    # -------------------------
+    # Evaluation
+    # -------------------------
+    def _leaves(self, X):
+        """Leaf node id reached in every tree, shape (rows, trees)."""
+        n = X.shape[0]
+        node = np.repeat(self.roots[None, :], n, axis=0)
+        rows = np.arange(n)[:, None]
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            if self.kind == 'sklearn':
+                go_left = x <= self.threshold[node]
+            else:
+                go_left = x < self.threshold[node]
+            nan = np.isnan(x)
+            if nan.any():
+                go_left = np.where(nan, self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def _prepare(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # both libraries compare float32 features against float32/float64 thresholds
+        X = X.astype(np.float32)
+        if self.kind == 'xgboost' and not np.isnan(self.missing):
+            X = np.where(X == self.missing, np.float32(np.nan), X)
+        return X if self.kind == 'xgboost' else X.astype(np.float64)
+
+    def _proba_block(self, X):
+        node = self._leaves(X)
+        if self.kind == 'sklearn':
+            # mean of the per-tree class distributions, like RandomForestClassifier
+            return self.leaf_value[node].mean(axis=1)
+
+        leaf = self.leaf_value[node].astype(np.float64)
+        n_groups = len(self.base_margin)
+        margin = np.empty((X.shape[0], n_groups))
+        for g in range(n_groups):
+            margin[:, g] = leaf[:, self.tree_class == g].sum(axis=1) + self.base_margin[g]
+
+        if n_groups == 1:
+            p = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        margin -= margin.max(axis=1, keepdims=True)
+        e = np.exp(margin)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, X):
+        X = self._prepare(X)
+        if X.shape[0] <= ROW_BLOCK:
+            return self._proba_block(X)
+        return np.vstack([self._proba_block(X[i:i + ROW_BLOCK]) for i in range(0, X.shape[0], ROW_BLOCK)])
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# =========================
+# Compilers
+# =========================
+def _pack(trees):
+    """Concatenate per-tree node arrays, rebasing child ids onto the flat layout.
+
+    Leaves point to themselves so extra depth steps are no-ops.
+    """
+    offsets = np.cumsum([0] + [len(t['feature']) for t in trees])
+    feature, threshold, left, right, default_left, value = [], [], [], [], [], []
+    max_depth = 0
+    for off, t in zip(offsets, trees):
+        n = len(t['feature'])
+        ids = np.arange(n)
+        is_leaf = t['left'] < 0
+        feature.append(np.where(is_leaf, 0, t['feature']))
+        threshold.append(t['threshold'])
+        left.append(np.where(is_leaf, ids, t['left']) + off)
+        right.append(np.where(is_leaf, ids, t['right']) + off)
+        default_left.append(t['default_left'])
+        value.append(t['value'])
+        max_depth = max(max_depth, t['depth'])
+
+    return {
+        'roots': offsets[:-1].astype(np.int64),
+        'feature': np.concatenate(feature).astype(np.int64),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left).astype(np.int64),
+        'right': np.concatenate(right).astype(np.int64),
+        'default_left': np.concatenate(default_left).astype(bool),
+        'leaf_value': np.concatenate(value),
+        'max_depth': max_depth,
+    }
+
+
+def _depth(left, right):
+    depth = np.zeros(len(left), dtype=np.int64)
+    for i in range(len(left)):  # parents always come before children
+        if left[i] >= 0:
+            depth[left[i]] = depth[right[i]] = depth[i] + 1
+    return int(depth.max()) if len(depth) else 0
+
+
+def _compile_sklearn(model):
+    estimators = getattr(model, 'estimators_', None)
+    if estimators is None:
+        estimators = [model]
+    if getattr(model, 'n_outputs_', 1) != 1:
+        raise TypeError("multi-output sklearn models are not supported")
+
+    trees = []
+    for est in estimators:
+        t = est.tree_
+        value = t.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        value = value / np.where(totals == 0, 1, totals)
+        missing_left = getattr(t, 'missing_go_to_left', None)
+        trees.append({
+            'feature': t.feature,
+            'threshold': t.threshold.astype(np.float64),
+            'left': t.children_left,
+            'right': t.children_right,
+            'default_left': (np.asarray(missing_left, dtype=bool) if missing_left is not None
+                             else np.zeros(t.node_count, dtype=bool)),
+            'value': value,
+            'depth': int(t.max_depth),
+        })
+
+    packed = _pack(trees)
+    return CompiledForest('sklearn', classes=np.asarray(model.classes_),
+                          n_features=int(model.n_features_in_), **packed)
+
+
+def _compile_xgboost(model):
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(booster.save_raw('json'))['learner']
+    gb = learner['gradient_booster']
+    if gb['name'] != 'gbtree':
+        raise TypeError(f"XGBoost booster '{gb['name']}' is not supported")
+    objective = learner['objective']['name']
+    if objective not in ('binary:logistic', 'multi:softprob', 'multi:softmax'):
+        raise TypeError(f"XGBoost objective '{objective}' is not supported")
+    if getattr(model, 'best_iteration', None) is not None:
+        raise TypeError("XGBoost models with early stopping (best_iteration) are not supported")
+
+    params = learner['learner_model_param']
+    base = [float(v) for v in params['base_score'].strip('[]').split(',')]
+    num_class = int(params['num_class'])
+    if objective == 'binary:logistic':
+        p = min(max(base[0], 1e-16), 1 - 1e-16)
+        base_margin = np.array([np.log(p / (1 - p))])
+    else:
+        base_margin = np.resize(np.array(base), num_class)
+
+    trees = []
+    for t in gb['model']['trees']:
+        if any(t['split_type']):
+            raise TypeError("categorical XGBoost splits are not supported")
+        left = np.asarray(t['left_children'], dtype=np.int64)
+        right = np.asarray(t['right_children'], dtype=np.int64)
+        cond = np.asarray(t['split_conditions'], dtype=np.float32)
+        trees.append({
+            'feature': np.asarray(t['split_indices'], dtype=np.int64),
+            'threshold': cond,
+            'left': left,
+            'right': right,
+            'default_left': np.asarray(t['default_left'], dtype=bool),
+            'value': cond,  # leaves keep their weight in split_conditions
+            'depth': _depth(left, right),
+        })
+
+    packed = _pack(trees)
+    classes = np.asarray(getattr(model, 'classes_', np.arange(max(num_class, 2))))
+    missing = getattr(model, 'missing', None)
+    return CompiledForest('xgboost', classes=classes, n_features=int(params['num_feature']),
+                          tree_class=np.asarray(gb['model']['tree_info'], dtype=np.int64),
+                          base_margin=base_margin, objective=objective,
+                          missing=np.nan if missing is None else float(missing), **packed)
+
+
+def compile_model(model):
+    """Flatten a fitted model into a CompiledForest.
+
+    Raises TypeError for model types or options the engine does not cover,
+    so callers can keep using the original model.
+    """
+    module = type(model).__module__
+    if module.startswith('xgboost'):
+        return _compile_xgboost(model)
+    if module.startswith('sklearn') and hasattr(model, 'classes_'):
+        if hasattr(model, 'tree_') or all(hasattr(e, 'tree_') for e in getattr(model, 'estimators_', [None])):
+            return _compile_sklearn(model)
+    raise TypeError(f"cannot compile {type(model).__name__}")
+
+
+def probe_matrix(engine, n=256, seed=0):
+    """Rows that land on both sides of the engine's own split thresholds."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, engine.n_features_in_))
+    internal = engine.left != np.arange(len(engine.left))
+    for f in range(engine.n_features_in_):
+        thr = engine.threshold[internal & (engine.feature == f)].astype(np.float64)
+        thr = thr[np.isfinite(thr)]
+        if len(thr):
+            X[:, f] = rng.choice(thr, size=n) + rng.normal(scale=1e-3, size=n) * (np.abs(thr).mean() + 1)
+    return X
+
+
+def matches(model, engine, X, atol=1e-5):
+    """True when the engine reproduces the model's predict / predict_proba on X."""
+    return (np.allclose(np.asarray(model.predict_proba(X)), engine.predict_proba(X), atol=atol)
+            and np.array_equal(np.asarray(model.predict(X)), engine.predict(X)))
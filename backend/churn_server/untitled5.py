@@ -12,6 +12,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 import warnings
+# seeded, vectorized residual bootstrap (bootstrap.py next to this notebook)
+from bootstrap import bootstrap_bands, key_seed
 
 # 1. Setup
 warnings.filterwarnings('ignore')
@@ -66,9 +68,10 @@ def run_bootstrapped_signal_forecast(path):
         forecast_smooth = forecast_obj.predicted_mean
 
         # --- ALTERNATIVE NOISE METHOD: BOOTSTRAPPING ---
-        # Instead of np.random.normal, we pick random samples from the actual past errors
-        bootstrapped_noise = np.random.choice(historical_errors, size=forecast_steps, replace=True)
-        realistic_test = forecast_smooth + bootstrapped_noise
+        # Instead of np.random.normal, we pick random samples from the actual past errors:
+        # 1000 seeded paths at once -> a reproducible sample path plus the 5-95% band
+        boot = bootstrap_bands(forecast_smooth.values, historical_errors, n_paths=1000, seed=key_seed(0, op_name))
+        realistic_test = pd.Series(boot['sample'], index=future_dates)
         # -----------------------------------------------
 
         # 6. Visualization
@@ -91,6 +94,10 @@ def run_bootstrapped_signal_forecast(path):
         plt.fill_between(future_dates, conf_int.iloc[:, 0], conf_int.iloc[:, 1],
                          color='#c0392b', alpha=0.1, label='Confidence Range')
 
+        # Bootstrap band (5th-95th percentile of the resampled paths)
+        plt.fill_between(future_dates, boot['bands'][0], boot['bands'][-1],
+                         color='#2980b9', alpha=0.15, label='Bootstrap 5-95% Band')
+
         # Formatting
         plt.title(f'Realistic Signal Strength Forecast: {op_name} (Using Residual Bootstrapping)', fontsize=15)
         plt.ylabel('Signal Strength (dBm)')
@@ -161,9 +168,9 @@ def get_forecast_values(path):
         forecast_obj = results.get_forecast(steps=forecast_steps, exog=future_exog)
         forecast_smooth = forecast_obj.predicted_mean
 
-        # Apply Bootstrapping Noise (Realistic spikes)
-        bootstrapped_noise = np.random.choice(historical_errors, size=forecast_steps, replace=True)
-        realistic_values = forecast_smooth + bootstrapped_noise
+        # Apply Bootstrapping Noise (Realistic spikes), seeded per operator so reruns match
+        boot = bootstrap_bands(forecast_smooth.values, historical_errors, seed=key_seed(0, op_name))
+        realistic_values = pd.Series(boot['sample'], index=future_dates)
 
         # 6. Build the result table for this operator
         op_df = pd.DataFrame({
@@ -193,6 +200,8 @@ import pandas as pd
 import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 import warnings
+from forecasting import load_partitions
+from bootstrap import bootstrap_bands, key_seed
 
 # 1. Setup
 warnings.filterwarnings('ignore')
@@ -201,18 +210,16 @@ warnings.filterwarnings('ignore')
 FILE_PATH = "/content/telecom_33_towers_4_operators.csv"
 
 def generate_area_operator_forecast(path):
-    # 2. Load Data
+    # 2. Load Data (one groupby pass for every area/operator, cached in forecasting.py)
     try:
-        df = pd.read_csv(path)
+        parts = load_partitions(path)
     except FileNotFoundError:
         print("Error: File not found. Please check the path or upload the CSV.")
         return
 
-    df['date'] = pd.to_datetime(df['date'])
-
     # Identify unique areas and operators
-    cities = df['city'].unique()
-    operators = df['operator'].unique()
+    cities = parts['cities']
+    operators = parts['operators']
 
     all_results = []
 
@@ -220,17 +227,12 @@ def generate_area_operator_forecast(path):
 
     for city in cities:
         for op in operators:
-            # 3. Filter data for the specific Area and Operator
-            subset = df[(df['city'] == city) & (df['operator'] == op)]
-
-            if len(subset) < 14: # Skip if there isn't enough data for a seasonal model
+            # 3. Look up the pre-aggregated series for this Area and Operator
+            if parts['row_counts'].get((city, op), 0) < 14: # Skip if there isn't enough data for a seasonal model
                 continue
 
-            # Aggregate to Daily Average Signal Strength
-            op_area_data = subset.groupby('date').agg({
-                'signal_strength_dbm': 'mean',
-                'is_weekend': 'max'
-            }).asfreq('D').interpolate(method='time')
+            # Daily Average Signal Strength
+            op_area_data = parts['daily'][(city, op)]
 
             # 4. Fit the SARIMAX Model (1,1,1)
             try:
@@ -257,9 +259,9 @@ def generate_area_operator_forecast(path):
                 forecast_obj = results.get_forecast(steps=forecast_steps, exog=future_exog)
                 forecast_smooth = forecast_obj.predicted_mean
 
-                # Apply realistic fluctuations
-                bootstrapped_noise = np.random.choice(historical_errors, size=forecast_steps, replace=True)
-                realistic_values = forecast_smooth + bootstrapped_noise
+                # Apply realistic fluctuations (seeded per area/operator so reruns match)
+                boot = bootstrap_bands(forecast_smooth.values, historical_errors, seed=key_seed(0, f"{city}_{op}"))
+                realistic_values = pd.Series(boot['sample'], index=future_dates)
 
                 # 7. Build the Result Table
                 forecast_df = pd.DataFrame({
@@ -304,81 +306,44 @@ data_table.enable_dataframe_formatter()
 
 df
 
-import pandas as pd
-import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
 import joblib  # Preferred over pickle for ML models
 import warnings
-import os
+# forecasting.py (next to this notebook) holds the training code shared with the server and scripts
+from forecasting import train_vault, compact_vault, save_sharded_vault
 
 # 1. Setup
 warnings.filterwarnings('ignore')
 FILE_PATH = "/content/telecom_33_towers_4_operators.csv"
 MODEL_SAVE_PATH = "telecom_models_dictionary.pkl"
-
-def train_and_save_models(path):
-    # 2. Load Data
+MODEL_VAULT_DIR = "telecom_models_vault"  # sharded format: index.json + one shard per key
+
+def train_and_save_models(path, sharded=False, compact=False, **options):
+    # sharded=True writes MODEL_VAULT_DIR instead of one big pickle
+    # compact=True keeps only params + final state per key (see CompactSARIMAX)
+    # options go to forecasting.train_vault:
+    #   workers=N fits keys on N processes (default 1: one at a time)
+    #   warm_start=<vault path> seeds each key's fit with last run's params (cold start if it fails to converge)
+    #   hierarchical=True fits one model per operator (by_state=True: per state + operator, from a 'state'
+    #   column or city_states={city: state}) and derives every city from it with a reconciled offset
+    # 2. Load the data and fit every model
     try:
-        df = pd.read_csv(path)
+        model_vault, _ = train_vault(path, **options)
     except FileNotFoundError:
         print("Error: File not found.")
         return
 
-    df['date'] = pd.to_datetime(df['date'])
-    cities = df['city'].unique()
-    operators = df['operator'].unique()
-
-    # This dictionary will store models for every city and operator
-    model_vault = {}
+    if compact:
+        # Swap in parameter-only models, checking each against the full results first
+        model_vault = compact_vault(model_vault, verify=True)
 
-    print(f"Starting training and serialization for {len(cities) * len(operators)} potential models...")
-
-    for city in cities:
-        for op in operators:
-            subset = df[(df['city'] == city) & (df['operator'] == op)]
-
-            if len(subset) < 20: # Minimum data threshold
-                continue
-
-            # Aggregate to Daily Average Signal Strength
-            op_area_data = subset.groupby('date').agg({
-                'signal_strength_dbm': 'mean',
-                'is_weekend': 'max'
-            }).asfreq('D').interpolate(method='time')
-
-            try:
-                # 3. Fit Model
-                model = SARIMAX(
-                    op_area_data['signal_strength_dbm'],
-                    exog=op_area_data[['is_weekend']],
-                    order=(1,1,1),
-                    seasonal_order=(1,1,1,7),
-                    enforce_stationarity=False,
-                    enforce_invertibility=False
-                )
-                results = model.fit(disp=False)
-
-                # 4. Prepare data for the .pkl file
-                # We save the model and the residues so the backend can "bootstrap" spikes
-                model_entry = {
-                    'model_results': results,
-                    'historical_residuals': results.resid.values[2:],
-                    'last_date': op_area_data.index[-1]
-                }
-
-                # Use a unique key for the dictionary
-                model_key = f"{city}_{op}"
-                model_vault[model_key] = model_entry
-
-                print(f"Saved model for: {model_key}")
-
-            except Exception as e:
-                print(f"Skipping {op} in {city} due to training error.")
-
-    # 5. Export the entire dictionary to a single .pkl file
-    joblib.dump(model_vault, MODEL_SAVE_PATH)
+    # 3. Export the entire dictionary to a single .pkl file (or a sharded vault)
+    save_path = MODEL_VAULT_DIR if sharded else MODEL_SAVE_PATH
+    if sharded:
+        save_sharded_vault(model_vault, save_path)
+    else:
+        joblib.dump(model_vault, save_path)
     print("\n" + "="*50)
-    print(f"SUCCESS: Saved {len(model_vault)} models to {MODEL_SAVE_PATH}")
+    print(f"SUCCESS: Saved {len(model_vault)} models to {save_path}")
     print("="*50)
 
 if __name__ == "__main__":
@@ -398,6 +363,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import warnings
+from bootstrap import bootstrap_bands, key_seed
 
 warnings.filterwarnings('ignore')
 
@@ -436,8 +402,8 @@ def test_model_prediction(city, operator, days=30):
     forecast_smooth = forecast_obj.predicted_mean
 
     # Apply the "Realistic Spikes" using Bootstrapping from the saved residuals
-    bootstrapped_noise = np.random.choice(historical_errors, size=days, replace=True)
-    realistic_prediction = forecast_smooth + bootstrapped_noise
+    boot = bootstrap_bands(forecast_smooth.values, historical_errors, seed=key_seed(0, model_key))
+    realistic_prediction = pd.Series(boot['sample'], index=future_dates)
 
     # 5. Output Numeric Values (Sample)
     print(f"\n--- Testing Results for {city} | {operator} ---")
@@ -464,6 +430,7 @@ import joblib
 import pandas as pd
 import numpy as np
 import warnings
+from bootstrap import bootstrap_bands, key_seed
 
 warnings.filterwarnings('ignore')
 
@@ -495,15 +462,17 @@ def get_full_60d_forecast(city, operator):
     forecast_obj = model_results.get_forecast(steps=days, exog=future_exog)
     forecast_smooth = forecast_obj.predicted_mean
 
-    # Apply Bootstrapping for consistent fluctuations
-    bootstrapped_noise = np.random.choice(historical_errors, size=days, replace=True)
-    realistic_prediction = forecast_smooth + bootstrapped_noise
+    # Apply Bootstrapping for consistent fluctuations (1000 seeded paths -> sample + 5/50/95% bands)
+    boot = bootstrap_bands(forecast_smooth.values, historical_errors, seed=key_seed(0, model_key))
+    realistic_prediction = pd.Series(boot['sample'], index=future_dates)
 
     # 5. Create the full Table
     results_df = pd.DataFrame({
         'Day': range(1, days + 1),
         'Date': future_dates.strftime('%Y-%m-%d'),
-        'Predicted_Signal_dBm': realistic_prediction.values.round(2)
+        'Predicted_Signal_dBm': realistic_prediction.values.round(2),
+        'P5_dBm': boot['bands'][0].round(2),
+        'P95_dBm': boot['bands'][-1].round(2)
     })
 
     # 6. Force pandas to show all 60 rows
@@ -523,6 +492,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import warnings
+from bootstrap import bootstrap_bands, key_seed
 
 # 1. Setup
 warnings.filterwarnings('ignore')
@@ -563,9 +533,9 @@ def get_full_60d_forecast_with_graph(city, operator):
     forecast_smooth = forecast_obj.predicted_mean
     conf_int = forecast_obj.conf_int()
 
-    # Apply Residual Bootstrapping for identical fluctuations
-    bootstrapped_noise = np.random.choice(historical_errors, size=days, replace=True)
-    realistic_prediction = forecast_smooth + bootstrapped_noise
+    # Apply Residual Bootstrapping for identical fluctuations (seeded, so reruns match)
+    boot = bootstrap_bands(forecast_smooth.values, historical_errors, seed=key_seed(0, model_key))
+    realistic_prediction = pd.Series(boot['sample'], index=future_dates)
 
     # 6. Visualization
     plt.figure(figsize=(15, 6))
@@ -582,6 +552,10 @@ def get_full_60d_forecast_with_graph(city, operator):
     plt.fill_between(future_dates, conf_int.iloc[:, 0], conf_int.iloc[:, 1],
                      color='#c0392b', alpha=0.1, label='95% Probability Range')
 
+    # Shade the bootstrap band (5th-95th percentile of 1000 resampled paths)
+    plt.fill_between(future_dates, boot['bands'][0], boot['bands'][-1],
+                     color='#2980b9', alpha=0.15, label='Bootstrap 5-95% Band')
+
     plt.title(f'60-Day Infrastructure Analysis: {city} | {operator}', fontsize=15)
     plt.ylabel('Signal Strength (dBm)')
     plt.xlabel('Date')
@@ -0,0 +1,53 @@
+"""Daily incremental refresh of the SARIMAX forecast vault.
+
+Reads only the tower CSV rows newer than each key's last_date, extends the
+stored models with them using the already-fitted parameters, refreshes
+historical_residuals / last_date and rewrites only the changed entries.
+Keys are fully re-fitted only when they drift or their last fit is too old.
+
+    python update_vault.py --csv towers.csv --vault telecom_models_vault
+    python update_vault.py --csv towers.csv --vault telecom_models_dictionary.pkl --refit-after-days 0
+"""
+import os
+import sys
+import time
+import argparse
+
+from forecasting import DRIFT_THRESHOLD, REFIT_AFTER_DAYS, incremental_update
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fold new tower-days into the forecast vault without retraining.')
+    parser.add_argument('--csv', required=True, help='tower CSV (date, city, operator, signal_strength_dbm, is_weekend)')
+    parser.add_argument('--vault', default=os.environ.get("FORECAST_VAULT_PATH",
+                                                          os.path.join(BASE_DIR, 'telecom_models_dictionary.pkl')),
+                        help='sharded vault directory or single .pkl (default: FORECAST_VAULT_PATH)')
+    parser.add_argument('--drift-threshold', type=float, default=DRIFT_THRESHOLD,
+                        help='re-fit a key when new-error RMS / historical sigma exceeds this (0 = never)')
+    parser.add_argument('--refit-after-days', type=int, default=REFIT_AFTER_DAYS,
+                        help='re-fit a key whose last full fit is this many days old (0 = never)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.vault):
+        print('Vault not found at', args.vault)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    changed, report = incremental_update(args.csv, args.vault, args.drift_threshold, args.refit_after_days)
+    elapsed = time.perf_counter() - start
+
+    refits = {k: r for k, r in report.items() if r['refit']}
+    errors = {k: r for k, r in report.items() if r['error']}
+    print(f"Updated {len(changed)} key(s) in {elapsed:.2f}s "
+          f"({len(refits)} re-fitted, {len(changed) - len(refits)} extended)")
+    for k, r in sorted(refits.items()):
+        drift = 'n/a' if r['drift'] is None else f"{r['drift']:.2f}"
+        print(f"  re-fit {k}: {r['refit']} (drift {drift}, {r['seconds']:.2f}s)")
+    for k, r in sorted(errors.items()):
+        print(f"  {k}: {r['error']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -143,16 +143,9 @@ function runChurnPrediction() {
     rfResult.innerHTML = '<h4>Random Forest Model</h4><div class="loading"></div>';
     xgbResult.innerHTML = '<h4>XGBoost Model</h4><div class="loading"></div>';
 
-    // Try to fetch from backend
-    Promise.all([
-        fetchPredictionFromBackend(features, 'rf'),
-        fetchPredictionFromBackend(features, 'xgb')
-    ])
-    .then(([rfPred, xgbPred]) => {
-        const predictions = {
-            rf: rfPred,
-            xgb: xgbPred
-        };
+    // Try to fetch from backend (one request scores both models)
+    fetchPredictionFromBackend(features, ['rf', 'xgb'])
+    .then(predictions => {
         displayChurnResults(predictions);
     })
     .catch(error => {
@@ -165,8 +158,8 @@ function runChurnPrediction() {
     });
 }
 
-// Fetch prediction from backend API
-function fetchPredictionFromBackend(features, modelKey) {
+// Fetch predictions for several models (plus their averaged ensemble) in one call
+function fetchPredictionFromBackend(features, modelKeys) {
     const backendURL = 'http://localhost:5000/predict';
     
     // Build feature vector array (25 features as per test_predictions.py)
@@ -195,8 +188,9 @@ function fetchPredictionFromBackend(features, modelKey) {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-            model: modelKey,
-            features: featureArray
+            models: modelKeys,
+            features: featureArray,
+            ensemble: true
         })
     })
     .then(response => {
@@ -209,17 +203,28 @@ function fetchPredictionFromBackend(features, modelKey) {
         if (data.error) {
             throw new Error(data.error);
         }
-        const result = data.results[0];
-        const churnProb = result.proba ? result.proba[1] : (result.prediction === 1 ? 0.7 : 0.3);
-        
-        return {
-            prediction: result.label_telugu === 'ha' ? 'CHURN RISK' : 'SAFE',
-            confidence: `Stay: ${((1 - churnProb) * 100).toFixed(1)}% | Churn: ${(churnProb * 100).toFixed(1)}%`,
-            prob: churnProb
-        };
+        const predictions = {};
+        modelKeys.forEach(key => {
+            predictions[key] = toChurnPrediction(data.models[key].results[0]);
+        });
+        if (data.ensemble && data.ensemble.results) {
+            predictions.ensemble = toChurnPrediction(data.ensemble.results[0]);
+        }
+        return predictions;
     });
 }
 
+// Convert one backend result into the display format
+function toChurnPrediction(result) {
+    const churnProb = result.proba ? result.proba[1] : (result.prediction === 1 ? 0.7 : 0.3);
+
+    return {
+        prediction: result.label_telugu === 'ha' ? 'CHURN RISK' : 'SAFE',
+        confidence: `Stay: ${((1 - churnProb) * 100).toFixed(1)}% | Churn: ${(churnProb * 100).toFixed(1)}%`,
+        prob: churnProb
+    };
+}
+
 // Build feature vector from input values
 function buildChurnFeatureVector() {
     const mobileAge = parseFloat(document.getElementById('mobileAge').value);
@@ -328,7 +333,9 @@ function displayChurnResults(predictions) {
     `;
 
     // Display summary
-    const avgRisk = (predictions.rf.prob + predictions.xgb.prob) / 2;
+    const avgRisk = predictions.ensemble
+        ? predictions.ensemble.prob
+        : (predictions.rf.prob + predictions.xgb.prob) / 2;
     const summaryClass = avgRisk > 0.5 ? 'risk' : '';
     const summaryText = avgRisk > 0.5
         ? `⚠️ HIGH RISK: This customer profile shows a ${(avgRisk * 100).toFixed(1)}% probability of churn. Recommended actions: Personalized retention offer, Priority support tier, Network quality improvement check.`
@@ -10,6 +10,7 @@ class LocationService {
         this.cachedLocation = null;
         this.cacheTimestamp = null;
         this.CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
+        this.NEAREST_URL = 'http://localhost:5000/nearest';
     }
 
     /**
@@ -293,16 +294,13 @@ class LocationService {
             const stateForCity = dataProcessor.getStateForCity(matchedCity);
 
             // Step 6: Try to match Area and Pincode (OPTIONAL)
-            // Get all records for this city
-            const cityRecords = dataProcessor.rawData.filter(r => r.city === matchedCity);
-
-            // Try to match area and pincode from detected location
             let matchedArea = 'All';
             let matchedPincode = null;
 
             // If we have a pincode from geocoding, try to find exact match
-            if (locationInfo.pincode && cityRecords.length > 0) {
-                const pincodeMatch = cityRecords.find(r =>
+            if (locationInfo.pincode) {
+                const pincodeMatch = dataProcessor.rawData.find(r =>
+                    r.city === matchedCity &&
                     r.pincode && r.pincode.toString() === locationInfo.pincode.toString()
                 );
 
@@ -313,10 +311,14 @@ class LocationService {
                 }
             }
 
-            // If no pincode match, try to find closest area based on coordinates
-            if (matchedArea === 'All' && cityRecords.length > 0) {
-                // Find the closest area by calculating distance
-                const closest = this.findClosestArea(coords, cityRecords);
+            // If no pincode match, find the closest area based on coordinates.
+            // The backend spatial index answers on its own; the local scan over
+            // every record of the city only runs when the service is unreachable.
+            if (matchedArea === 'All') {
+                const remote = await this.findClosestAreaRemote(coords, matchedCity);
+                const closest = remote.available
+                    ? remote.match
+                    : this.findClosestArea(coords, dataProcessor.rawData.filter(r => r.city === matchedCity));
 
                 if (closest) {
                     matchedArea = closest.area;
@@ -357,9 +359,32 @@ class LocationService {
     }
 
     /**
-     * Find closest area based on GPS coordinates
-     * Uses Haversine formula to calculate distance
+     * Find closest area via the backend /nearest endpoint
+     * Only the coordinate is sent. Returns { available: true, match } where
+     * match is null when nothing is within 5 km, or { available: false } if
+     * the server cannot be reached
      */
+    async findClosestAreaRemote(coords, city) {
+        try {
+            const params = new URLSearchParams({
+                lat: coords.latitude,
+                lon: coords.longitude,
+                k: 1,
+                radius_km: 5,
+                city: city
+            });
+            const response = await fetch(`${this.NEAREST_URL}?${params}`);
+            if (!response.ok) return { available: false };
+
+            const data = await response.json();
+            const match = data.results && data.results.length > 0 ? data.results[0] : null;
+            return { available: true, match };
+        } catch (error) {
+            console.warn('[Location] Nearest-area service unavailable, using local search:', error);
+            return { available: false };
+        }
+    }
+
     findClosestArea(coords, cityRecords) {
         if (!cityRecords || cityRecords.length === 0) return null;
 